@@ -1,11 +1,29 @@
+import sys
+
+# --startup-report times every import, so its hook goes in before anything else loads
+if __name__ == "__main__" and any(arg.startswith("--startup-report") for arg in sys.argv):
+    import startup_report
+    startup_report.start()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import argparse
 import datetime
+import bisect
 import os
-import sys
+import time
 import csv
+import json
+import concurrent.futures
 from tkcalendar import DateEntry
 import schedule_generator_chirp as sgc
+import schedule_store
+import memory_planner
+
+# Roster generation: pairs per worker task (small, so progress moves smoothly)
+# and how often the main loop polls the workers
+ROSTER_CHUNK_SIZE = 4
+ROSTER_POLL_MS = 100
 
 class PMRSSchedulerApp:
     def __init__(self, root):
@@ -32,6 +50,21 @@ class PMRSSchedulerApp:
         self.schedule_meta = None
         self.start_date = None
         
+        # Daily windows for new schedules (None uses the default morning/afternoon/evening)
+        self.window_config = None
+        
+        # Pending root.after job of the live "now" panel
+        self.ticker_job = None
+        
+        # Roster pairs and the running bulk generation (see start_roster)
+        self.roster_records = []
+        self.roster_run = None
+        
+        # Schedule table rows in day order (including rows hidden by the filter)
+        # and the inverted indexes the filter bar queries
+        self.schedule_rows = []
+        self.filter_index = None
+        
         # Create the UI
         self.create_ui()
     
@@ -39,7 +72,7 @@ class PMRSSchedulerApp:
         try:
             # Ask user to select a CSV file
             file_path = filedialog.askopenfilename(
-                filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+                filetypes=[("CSV Files", "*.csv"), ("Compressed CSV Files", "*.csv.gz *.csv.xz *.csv.zst"), ("All Files", "*.*")],
                 title="Open Schedule CSV File"
             )
             
@@ -47,13 +80,16 @@ class PMRSSchedulerApp:
                 return  # User canceled
                 
             # Clear existing treeview data
-            for item in self.schedule_tree.get_children():
-                self.schedule_tree.delete(item)
+            self.clear_schedule_tree()
             
             # Read the CSV file
-            with open(file_path, "r", newline='') as csvfile:
+            with sgc.open_input(file_path, newline='') as csvfile:
                 reader = csv.DictReader(csvfile)
                 
+                # Every "<Window> Time" column starts a window's group of columns
+                labels = [name[:-len(" Time")] for name in reader.fieldnames or [] if name.endswith(" Time")]
+                self.set_schedule_columns([sgc.period_key(label) for label in labels])
+                
                 # Create a new schedule data structure to store loaded data
                 self.schedule = {}
                 
@@ -65,75 +101,47 @@ class PMRSSchedulerApp:
                     # Parse the day number
                     day = int(row['Day'])
                     
-                    # Create the schedule structure
-                    if day not in self.schedule:
-                        self.schedule[day] = {
-                            'morning': {},
-                            'afternoon': {},
-                            'evening': {}
-                        }
-                    
                     # Parse the date from the CSV
                     date_str = row['Date']
                     date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+                    if day == 1:
+                        self.start_date = date_obj
                     
                     # Fill in the schedule data
-                    self.schedule[day]['morning'] = {
-                        'time': row['Morning Time'],
-                        'channel': int(row['Morning Channel']),
-                        'frequency': row['Morning Frequency'],
-                        'ctcss': float(row['Morning CTCSS'])
-                    }
-                    
-                    self.schedule[day]['afternoon'] = {
-                        'time': row['Afternoon Time'],
-                        'channel': int(row['Afternoon Channel']),
-                        'frequency': row['Afternoon Frequency'],
-                        'ctcss': float(row['Afternoon CTCSS'])
-                    }
-                    
-                    self.schedule[day]['evening'] = {
-                        'time': row['Evening Time'],
-                        'channel': int(row['Evening Channel']),
-                        'frequency': row['Evening Frequency'],
-                        'ctcss': float(row['Evening CTCSS'])
-                    }
+                    self.schedule[day] = {}
+                    values = [day, date_str, row['Day of Week']]
+                    for label in labels:
+                        self.schedule[day][sgc.period_key(label)] = {
+                            'time': row[f'{label} Time'],
+                            'channel': int(row[f'{label} Channel']),
+                            'frequency': row[f'{label} Frequency'],
+                            **sgc.parse_tone(row[f'{label} CTCSS'])
+                        }
+                        values += [row[f'{label} Time'], row[f'{label} Channel'],
+                                   row[f'{label} Frequency'], row[f'{label} CTCSS']]
                     
                     # Insert into treeview
-                    row_id = self.schedule_tree.insert("", tk.END,
-                        values=(
-                            day,
-                            date_str,
-                            row['Day of Week'],
-                            row['Morning Time'],
-                            row['Morning Channel'],
-                            row['Morning Frequency'],
-                            row['Morning CTCSS'],
-                            row['Afternoon Time'],
-                            row['Afternoon Channel'],
-                            row['Afternoon Frequency'],
-                            row['Afternoon CTCSS'],
-                            row['Evening Time'],
-                            row['Evening Channel'],
-                            row['Evening Frequency'],
-                            row['Evening CTCSS']
-                        )
-                    )
+                    row_id = self.schedule_tree.insert("", tk.END, values=values)
+                    self.schedule_rows.append(row_id)
                     
                     # Apply highlighting for today's date
                     if date_obj == today:
                         self.schedule_tree.item(row_id, tags=("current_day",))
                         self.schedule_tree.see(row_id)
+                
+                self.build_filter_index()
+                self.timeline.set_schedule(self.schedule, start_date=self.start_date)
                         
                 # Try to load emergency CSV if it exists
-                emergency_file_path = os.path.splitext(file_path)[0] + "_emergency.csv"
+                base, compression = sgc.split_compression(file_path)
+                emergency_file_path = os.path.splitext(base)[0] + "_emergency.csv" + compression
                 if os.path.exists(emergency_file_path):
                     # Clear existing emergency treeview data
                     for item in self.emergency_tree.get_children():
                         self.emergency_tree.delete(item)
                         
                     # Read the emergency CSV file
-                    with open(emergency_file_path, "r", newline='') as emergency_csvfile:
+                    with sgc.open_input(emergency_file_path, newline='') as emergency_csvfile:
                         emergency_reader = csv.DictReader(emergency_csvfile)
                         
                         # Create schedule_meta if it doesn't exist
@@ -169,13 +177,10 @@ class PMRSSchedulerApp:
                                     'time': row['Time'],
                                     'channel': int(row['Channel']),
                                     'frequency': row['Frequency'],
-                                    'ctcss': float(row['CTCSS'])
+                                    **sgc.parse_tone(row['CTCSS'])
                                 }
                 
-                # Set start date based on first row
-                first_date_str = next(iter(self.schedule.values()))['morning'].get('date', None)
-                if first_date_str:
-                    self.start_date = datetime.datetime.strptime(first_date_str, "%Y-%m-%d").date()
+                self.update_now_panel()
                 
                 self.status_var.set(f"Schedule loaded from {file_path}")
                 messagebox.showinfo("Success", f"Schedule loaded from {file_path}")
@@ -214,6 +219,13 @@ class PMRSSchedulerApp:
         freq_band_combo['values'] = ("PMRS", "VLF", "VHF", "UHF", "2m Amateur", "70cm Amateur")
         freq_band_combo.grid(row=1, column=5, sticky=tk.W, padx=5, pady=5)
         
+        # Add tone mode selection
+        ttk.Label(input_grid, text="Tone Mode:").grid(row=1, column=6, sticky=tk.W, padx=5, pady=5)
+        self.tone_mode_var = tk.StringVar(value="ctcss")  # Default to CTCSS
+        tone_mode_combo = ttk.Combobox(input_grid, textvariable=self.tone_mode_var, width=8, state="readonly")
+        tone_mode_combo['values'] = sgc.TONE_MODES
+        tone_mode_combo.grid(row=1, column=7, sticky=tk.W, padx=5, pady=5)
+        
         # Input Fields
         input_grid = ttk.Frame(input_frame)
         input_grid.pack(fill=tk.X, padx=5, pady=5)
@@ -253,12 +265,27 @@ class PMRSSchedulerApp:
         
         # Export Buttons
         ttk.Button(export_frame, text="Export to CHIRP", command=self.export_chirp).pack(side=tk.LEFT, padx=5)
+        ttk.Button(export_frame, text="Export Packed CHIRP", command=self.export_packed_chirp).pack(side=tk.LEFT, padx=5)
         ttk.Button(export_frame, text="Export to CSV", command=self.export_csv).pack(side=tk.LEFT, padx=5)
         ttk.Button(export_frame, text="Export to TXT", command=self.export_txt).pack(side=tk.LEFT, padx=5)
+        ttk.Button(export_frame, text="Export to ICS", command=self.export_ics).pack(side=tk.LEFT, padx=5)
         
         # Add Load CSV button
         ttk.Button(export_frame, text="Load CSV", command=self.load_csv).pack(side=tk.LEFT, padx=5)
         
+        # Window configuration for new schedules
+        ttk.Button(export_frame, text="Load Windows", command=self.load_windows).pack(side=tk.LEFT, padx=5)
+        
+        # Schedule store buttons
+        ttk.Button(export_frame, text="Save to Store", command=self.save_to_store).pack(side=tk.LEFT, padx=5)
+        ttk.Button(export_frame, text="Query Store", command=self.query_store).pack(side=tk.LEFT, padx=5)
+        
+        # Side-by-side comparison with other settings
+        ttk.Button(export_frame, text="Compare...", command=self.compare_schedule).pack(side=tk.LEFT, padx=5)
+        
+        # Live "now" panel
+        self.create_now_panel(main_frame)
+        
         # Results Notebook
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=10)
@@ -277,6 +304,16 @@ class PMRSSchedulerApp:
         # Create treeview for emergency schedule
         self.create_emergency_treeview()
         
+        # Timeline Tab
+        self.create_timeline_tab()
+        
+        # Roster Tab
+        self.roster_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.roster_tab, text="Roster")
+        
+        # Create roster controls and pair list
+        self.create_roster_tab()
+        
         # Info Tab
         self.info_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.info_tab, text="Information")
@@ -290,7 +327,108 @@ class PMRSSchedulerApp:
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(fill=tk.X, padx=5, pady=5)
     
+    def create_now_panel(self, parent):
+        now_frame = ttk.LabelFrame(parent, text="Now", padding=10)
+        now_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.now_status_var = tk.StringVar(value="No schedule loaded")
+        self.now_window_var = tk.StringVar()
+        self.now_radio_var = tk.StringVar()
+        self.now_quick_connect_var = tk.StringVar()
+        
+        ttk.Label(now_frame, textvariable=self.now_status_var, style="Header.TLabel").grid(row=0, column=0, sticky=tk.W, padx=5)
+        ttk.Label(now_frame, textvariable=self.now_window_var).grid(row=0, column=1, sticky=tk.W, padx=20)
+        ttk.Label(now_frame, textvariable=self.now_radio_var).grid(row=0, column=2, sticky=tk.W, padx=20)
+        ttk.Label(now_frame, textvariable=self.now_quick_connect_var).grid(row=0, column=3, sticky=tk.W, padx=20)
+    
+    def update_now_panel(self):
+        """
+        Refresh the live panel and schedule the next refresh.
+        
+        Only one root.after job is ever pending. It fires at the next moment the
+        panel changes: the start or end of a window, the next quick-connect slot or
+        the next minute of the countdown.
+        """
+        if self.ticker_job is not None:
+            self.root.after_cancel(self.ticker_job)
+            self.ticker_job = None
+        
+        if not self.schedule or not self.start_date:
+            self.now_status_var.set("No schedule loaded")
+            self.now_window_var.set("")
+            self.now_radio_var.set("")
+            self.now_quick_connect_var.set("")
+            return
+        
+        now = datetime.datetime.now()
+        found = sgc.find_next_window(self.schedule, self.start_date, now)
+        boundaries = [now.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)]
+        
+        if found:
+            window = found['window']
+            if found['active']:
+                self.now_status_var.set("ON AIR NOW")
+                remaining = found['end'] - now
+                boundaries.append(found['end'])
+            else:
+                self.now_status_var.set("Next window")
+                remaining = found['start'] - now
+                boundaries.append(found['start'])
+            
+            minutes = int(remaining.total_seconds() // 60)
+            countdown = f"{minutes // 60} h {minutes % 60:02d} min" if minutes >= 60 else f"{minutes} min"
+            self.now_window_var.set(
+                f"{found['date'].strftime('%a %Y-%m-%d')} {sgc.period_label(found['period'])} {window['time']} "
+                f"({'ends' if found['active'] else 'starts'} in {countdown})"
+            )
+            self.now_radio_var.set(f"Ch {window['channel']} | {window['frequency']} | {sgc.tone_label(window)}")
+        
+        # Next quick-connect slot
+        if self.schedule_meta and self.schedule_meta.get('quick_connect_times'):
+            next_slots = []
+            for qc in self.schedule_meta['quick_connect_times']:
+                slot = now.replace(minute=int(qc['time'].split(':')[1]), second=0, microsecond=0)
+                if slot <= now:
+                    slot += datetime.timedelta(hours=1)
+                next_slots.append((slot, qc))
+            slot, qc = min(next_slots, key=lambda item: item[0])
+            boundaries.append(slot)
+            self.now_quick_connect_var.set(f"Quick connect {slot.strftime('%H:%M')} on Ch {qc['channel']}")
+        
+        delay = (min(boundaries) - datetime.datetime.now()).total_seconds()
+        self.ticker_job = self.root.after(max(int(delay * 1000) + 50, 50), self.update_now_panel)
+    
     def create_schedule_treeview(self):
+        # Filter bar
+        filter_frame = ttk.Frame(self.schedule_tab)
+        filter_frame.pack(fill=tk.X, padx=5, pady=(5, 0))
+        
+        self.filter_channel_var = tk.StringVar()
+        self.filter_tone_var = tk.StringVar()
+        self.filter_from_var = tk.StringVar()
+        self.filter_to_var = tk.StringVar()
+        
+        ttk.Label(filter_frame, text="Channel:").pack(side=tk.LEFT, padx=5)
+        self.filter_channel_combo = ttk.Combobox(filter_frame, textvariable=self.filter_channel_var, width=5)
+        self.filter_channel_combo.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="Tone:").pack(side=tk.LEFT, padx=5)
+        self.filter_tone_combo = ttk.Combobox(filter_frame, textvariable=self.filter_tone_var, width=8)
+        self.filter_tone_combo.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="From:").pack(side=tk.LEFT, padx=5)
+        filter_from_entry = ttk.Entry(filter_frame, textvariable=self.filter_from_var, width=11)
+        filter_from_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="To:").pack(side=tk.LEFT, padx=5)
+        filter_to_entry = ttk.Entry(filter_frame, textvariable=self.filter_to_var, width=11)
+        filter_to_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="Filter", command=self.apply_filter).pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="Clear", command=self.clear_filter).pack(side=tk.LEFT, padx=5)
+        
+        # Filter as soon as a value is picked or Return is pressed
+        for widget in (self.filter_channel_combo, self.filter_tone_combo):
+            widget.bind("<<ComboboxSelected>>", lambda event: self.apply_filter())
+        for widget in (self.filter_channel_combo, self.filter_tone_combo, filter_from_entry, filter_to_entry):
+            widget.bind("<Return>", lambda event: self.apply_filter())
+        
         # Frame for the treeview
         frame = ttk.Frame(self.schedule_tab)
         frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -299,16 +437,25 @@ class PMRSSchedulerApp:
         y_scrollbar = ttk.Scrollbar(frame, orient="vertical")
         y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Create treeview with updated columns to include date and day of week
-        columns = (
-            "day", "date", "day_of_week",
-            "morning_time", "morning_channel", "morning_freq", "morning_ctcss",
-            "afternoon_time", "afternoon_channel", "afternoon_freq", "afternoon_ctcss",
-            "evening_time", "evening_channel", "evening_freq", "evening_ctcss"
-        )
-        self.schedule_tree = ttk.Treeview(frame, columns=columns, show="headings", yscrollcommand=y_scrollbar.set)
+        # Create treeview; the window columns are set by set_schedule_columns
+        self.schedule_tree = ttk.Treeview(frame, show="headings", yscrollcommand=y_scrollbar.set)
+        self.set_schedule_columns(list(sgc.WINDOW_BLOCKS))
+        
+        self.schedule_tree.tag_configure("current_day", background="#FFFF99")  # Light yellow highlight
+        
+        # Pack treeview
+        self.schedule_tree.pack(fill=tk.BOTH, expand=True)
+        
+        # Configure scrollbar
+        y_scrollbar.config(command=self.schedule_tree.yview)
+    
+    def set_schedule_columns(self, periods):
+        """Rebuild the schedule columns: day, date and day of week, then four columns per window"""
+        columns = ["day", "date", "day_of_week"]
+        for period in periods:
+            columns += [f"{period}_time", f"{period}_channel", f"{period}_freq", f"{period}_ctcss"]
+        self.schedule_tree["columns"] = columns
         
-        # Configure columns
         self.schedule_tree.heading("day", text="Day")
         self.schedule_tree.column("day", width=40, anchor=tk.CENTER)
         
@@ -318,49 +465,121 @@ class PMRSSchedulerApp:
         self.schedule_tree.heading("day_of_week", text="Day of Week")
         self.schedule_tree.column("day_of_week", width=90, anchor=tk.CENTER)
         
-        self.schedule_tree.heading("morning_time", text="Morning Time")
-        self.schedule_tree.column("morning_time", width=100, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("morning_channel", text="Ch")
-        self.schedule_tree.column("morning_channel", width=40, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("morning_freq", text="Frequency")
-        self.schedule_tree.column("morning_freq", width=80, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("morning_ctcss", text="CTCSS")
-        self.schedule_tree.column("morning_ctcss", width=60, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("afternoon_time", text="Afternoon Time")
-        self.schedule_tree.column("afternoon_time", width=100, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("afternoon_channel", text="Ch")
-        self.schedule_tree.column("afternoon_channel", width=40, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("afternoon_freq", text="Frequency")
-        self.schedule_tree.column("afternoon_freq", width=80, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("afternoon_ctcss", text="CTCSS")
-        self.schedule_tree.column("afternoon_ctcss", width=60, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("evening_time", text="Evening Time")
-        self.schedule_tree.column("evening_time", width=100, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("evening_channel", text="Ch")
-        self.schedule_tree.column("evening_channel", width=40, anchor=tk.CENTER)
-        
-        self.schedule_tree.heading("evening_freq", text="Frequency")
-        self.schedule_tree.column("evening_freq", width=80, anchor=tk.CENTER)
+        for period in periods:
+            self.schedule_tree.heading(f"{period}_time", text=f"{sgc.period_label(period)} Time")
+            self.schedule_tree.column(f"{period}_time", width=100, anchor=tk.CENTER)
+            
+            self.schedule_tree.heading(f"{period}_channel", text="Ch")
+            self.schedule_tree.column(f"{period}_channel", width=40, anchor=tk.CENTER)
+            
+            self.schedule_tree.heading(f"{period}_freq", text="Frequency")
+            self.schedule_tree.column(f"{period}_freq", width=80, anchor=tk.CENTER)
+            
+            self.schedule_tree.heading(f"{period}_ctcss", text="Tone")
+            self.schedule_tree.column(f"{period}_ctcss", width=80, anchor=tk.CENTER)
+    
+    def clear_schedule_tree(self):
+        """Delete every schedule row, including rows the filter has detached"""
+        if self.schedule_rows:
+            self.schedule_tree.delete(*self.schedule_rows)
+        self.schedule_rows = []
+        self.filter_index = None
+    
+    def build_filter_index(self):
+        """
+        Precompute the filter bar's inverted indexes over the schedule rows.
+        
+        'channels' and 'tones' map each channel and displayed tone to the set of
+        windows using it, numbered (day - 1) * windows per day + window; 'dates'
+        holds the row dates as ordinals, in order, for bisecting a date range.
+        """
+        channels = {}
+        tones = {}
+        periods = len(self.schedule[1]) if self.schedule_rows else 1
+        for day in range(1, len(self.schedule_rows) + 1):
+            for i, window in enumerate(self.schedule[day].values()):
+                channels.setdefault(window['channel'], set()).add((day - 1) * periods + i)
+                tones.setdefault(sgc.format_tone(window), set()).add((day - 1) * periods + i)
+        
+        first = self.start_date.toordinal()
+        self.filter_index = {
+            "periods": periods,
+            "channels": channels,
+            "tones": tones,
+            "dates": list(range(first, first + len(self.schedule_rows)))
+        }
+        
+        self.filter_channel_combo['values'] = sorted(channels)
+        self.filter_tone_combo['values'] = sorted(tones, key=lambda tone: (tone.startswith("D"), len(tone.split("/")[0]), tone))
+        for var in (self.filter_channel_var, self.filter_tone_var, self.filter_from_var, self.filter_to_var):
+            var.set("")
+    
+    def filtered_rows(self, channel=None, tone=None, first_date=None, last_date=None):
+        """Row positions (sorted) of the days within the dates that have a window on the channel and tone"""
+        index = self.filter_index
+        first = bisect.bisect_left(index["dates"], first_date.toordinal()) if first_date else 0
+        last = bisect.bisect_right(index["dates"], last_date.toordinal()) if last_date else len(index["dates"])
+        
+        # Intersect the smallest sets first; the date range is a plain position range
+        sets = []
+        if channel is not None:
+            sets.append(index["channels"].get(channel, set()))
+        if tone is not None:
+            sets.append(index["tones"].get(tone, set()))
+        if not sets:
+            return list(range(first, last))
+        sets.sort(key=len)
+        windows = set(sets[0]).intersection(*sets[1:])
+        periods = index["periods"]
+        return sorted({window // periods for window in windows if first * periods <= window < last * periods})
+    
+    def apply_filter(self):
+        if self.filter_index is None:
+            return
         
-        self.schedule_tree.heading("evening_ctcss", text="CTCSS")
-        self.schedule_tree.column("evening_ctcss", width=60, anchor=tk.CENTER)
+        try:
+            channel = int(self.filter_channel_var.get()) if self.filter_channel_var.get().strip() else None
+            # Typed tones are normalized to the displayed form ('100' -> '100.0')
+            tone = sgc.format_tone(sgc.parse_tone(self.filter_tone_var.get())) if self.filter_tone_var.get().strip() else None
+            first_date = (datetime.datetime.strptime(self.filter_from_var.get().strip(), "%Y-%m-%d").date()
+                          if self.filter_from_var.get().strip() else None)
+            last_date = (datetime.datetime.strptime(self.filter_to_var.get().strip(), "%Y-%m-%d").date()
+                         if self.filter_to_var.get().strip() else None)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid filter: {str(e)}")
+            return
         
-        self.schedule_tree.tag_configure("current_day", background="#FFFF99")  # Light yellow highlight
+        started = time.perf_counter()
+        positions = self.filtered_rows(channel, tone, first_date, last_date)
         
-        # Pack treeview
-        self.schedule_tree.pack(fill=tk.BOTH, expand=True)
+        # Reorder the existing items in one call: rows left out are detached, not
+        # deleted, so clearing the filter brings them back without rebuilding
+        self.schedule_tree.set_children("", *[self.schedule_rows[position] for position in positions])
+        elapsed = (time.perf_counter() - started) * 1000
         
-        # Configure scrollbar
-        y_scrollbar.config(command=self.schedule_tree.yview)
+        self.status_var.set(f"{len(positions)} of {len(self.schedule_rows)} days match the filter ({elapsed:.1f} ms)")
+    
+    def clear_filter(self):
+        for var in (self.filter_channel_var, self.filter_tone_var, self.filter_from_var, self.filter_to_var):
+            var.set("")
+        self.apply_filter()
+    
+    def load_windows(self):
+        try:
+            file_path = filedialog.askopenfilename(
+                filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
+                title="Open Window Configuration"
+            )
+            
+            if not file_path:
+                return  # User canceled
+            
+            self.window_config = sgc.load_window_config(file_path)
+            names = ", ".join(sgc.period_label(window['name']) for window in self.window_config)
+            self.status_var.set(f"{len(self.window_config)} daily windows loaded ({names}); generate to apply")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load window configuration: {str(e)}")
+            self.status_var.set("Error loading window configuration.")
     
     def create_emergency_treeview(self):
         # Frame for the treeview
@@ -388,7 +607,7 @@ class PMRSSchedulerApp:
         self.emergency_tree.heading("frequency", text="Frequency")
         self.emergency_tree.column("frequency", width=100, anchor=tk.CENTER)
         
-        self.emergency_tree.heading("ctcss", text="CTCSS")
+        self.emergency_tree.heading("ctcss", text="Tone")
         self.emergency_tree.column("ctcss", width=80, anchor=tk.CENTER)
         
         self.emergency_tree.heading("notes", text="Notes")
@@ -400,6 +619,198 @@ class PMRSSchedulerApp:
         # Configure scrollbar
         y_scrollbar.config(command=self.emergency_tree.yview)
     
+    def create_timeline_tab(self):
+        # Imported here rather than at the top so it does not add to the GUI's start time
+        import timeline_canvas
+        
+        self.timeline = timeline_canvas.ScheduleTimeline(self.notebook)
+        self.notebook.add(self.timeline, text="Timeline")
+    
+    def create_roster_tab(self):
+        controls = ttk.Frame(self.roster_tab)
+        controls.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.roster_dir_var = tk.StringVar()
+        
+        ttk.Button(controls, text="Load Pairs CSV", command=self.load_roster).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Output Folder", command=self.choose_roster_dir).pack(side=tk.LEFT, padx=5)
+        ttk.Label(controls, textvariable=self.roster_dir_var).pack(side=tk.LEFT, padx=5)
+        self.roster_cancel_btn = ttk.Button(controls, text="Cancel", command=self.cancel_roster, state=tk.DISABLED)
+        self.roster_cancel_btn.pack(side=tk.RIGHT, padx=5)
+        self.roster_start_btn = ttk.Button(controls, text="Generate All", command=self.start_roster)
+        self.roster_start_btn.pack(side=tk.RIGHT, padx=5)
+        
+        progress_frame = ttk.Frame(self.roster_tab)
+        progress_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.roster_progress = ttk.Progressbar(progress_frame, mode="determinate")
+        self.roster_progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.roster_progress_var = tk.StringVar(value="No pairs loaded")
+        ttk.Label(progress_frame, textvariable=self.roster_progress_var, width=45).pack(side=tk.LEFT, padx=5)
+        
+        frame = ttk.Frame(self.roster_tab)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        y_scrollbar = ttk.Scrollbar(frame, orient="vertical")
+        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        columns = ("pair_id", "user1_dob", "user2_dob", "status")
+        self.roster_tree = ttk.Treeview(frame, columns=columns, show="headings", yscrollcommand=y_scrollbar.set)
+        for column, text, width in (
+            ("pair_id", "Pair", 200), ("user1_dob", "User 1 DOB", 100), ("user2_dob", "User 2 DOB", 100), ("status", "Status", 500)
+        ):
+            self.roster_tree.heading(column, text=text)
+            self.roster_tree.column(column, width=width, anchor=tk.W if column == "status" else tk.CENTER)
+        self.roster_tree.tag_configure("error", background="#FFCDD2")
+        self.roster_tree.pack(fill=tk.BOTH, expand=True)
+        y_scrollbar.config(command=self.roster_tree.yview)
+    
+    def load_roster(self):
+        if self.roster_run:
+            return
+        
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Pairs CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("All Files", "*.*")],
+            title="Open Pairs File"
+        )
+        
+        if not file_path:
+            return  # User canceled
+        
+        try:
+            with sgc.open_input(file_path, newline='') as f:
+                self.roster_records = list(sgc.read_pair_records(f))
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Error", f"Failed to load pairs: {str(e)}")
+            return
+        
+        self.roster_tree.delete(*self.roster_tree.get_children())
+        for i, record in enumerate(self.roster_records):
+            self.roster_tree.insert("", tk.END, iid=str(i), values=(
+                record['pair_id'], record.get('user1_dob', ""), record.get('user2_dob', ""), record.get('error', "Pending")
+            ), tags=("error",) if 'error' in record else ())
+        
+        self.roster_progress["value"] = 0
+        self.roster_progress_var.set(f"{len(self.roster_records)} pairs loaded")
+        self.status_var.set(f"{len(self.roster_records)} pairs loaded from {file_path}")
+    
+    def choose_roster_dir(self):
+        directory = filedialog.askdirectory(title="Choose Output Folder")
+        if directory:
+            self.roster_dir_var.set(directory)
+    
+    def start_roster(self):
+        if self.roster_run:
+            return
+        if not self.roster_records:
+            messagebox.showwarning("Warning", "Load a pairs CSV first.")
+            return
+        if not self.roster_dir_var.get():
+            self.choose_roster_dir()
+            if not self.roster_dir_var.get():
+                return
+        
+        # Pairs without their own settings use the main tab's
+        options = {
+            "days": self.days_var.get(),
+            "start_date": self.start_date_entry.get_date().isoformat(),
+            "frequency_band": self.freq_band_var.get(),
+            "tone_mode": self.tone_mode_var.get(),
+            "windows": self.window_config,
+            "output_dir": self.roster_dir_var.get(),
+            "output": "all",
+            "tz": None
+        }
+        
+        try:
+            os.makedirs(options["output_dir"], exist_ok=True)
+        except OSError as e:
+            messagebox.showerror("Error", f"Cannot use output folder: {str(e)}")
+            return
+        
+        # The workers write the TXT, CSV and CHIRP files themselves; the main loop
+        # only polls the futures, so the window stays responsive
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        futures = {}
+        for first in range(0, len(self.roster_records), ROSTER_CHUNK_SIZE):
+            chunk = self.roster_records[first:first + ROSTER_CHUNK_SIZE]
+            futures[pool.submit(sgc._bulk_chunk, chunk, options)] = first
+        
+        for i in range(len(self.roster_records)):
+            self.roster_tree.set(str(i), "status", "Queued")
+            self.roster_tree.item(str(i), tags=())
+        
+        self.roster_run = {
+            "pool": pool,
+            "futures": futures,
+            "started": time.perf_counter(),
+            "done": 0,
+            "failed": 0
+        }
+        self.roster_progress["maximum"] = len(self.roster_records)
+        self.roster_progress["value"] = 0
+        self.roster_start_btn.config(state=tk.DISABLED)
+        self.roster_cancel_btn.config(state=tk.NORMAL)
+        self.roster_run["job"] = self.root.after(ROSTER_POLL_MS, self.poll_roster)
+    
+    def poll_roster(self):
+        run = self.roster_run
+        for future in [future for future in run["futures"] if future.done()]:
+            first = run["futures"].pop(future)
+            try:
+                lines = future.result()
+            except Exception as e:
+                count = min(ROSTER_CHUNK_SIZE, len(self.roster_records) - first)
+                lines = [(False, json.dumps({"error": str(e)}))] * count
+            
+            for i, (ok, line) in enumerate(lines, first):
+                result = json.loads(line)
+                if ok:
+                    status = "Done: " + ", ".join(os.path.basename(path) for path in result["files"])
+                else:
+                    status = f"Error: {result['error']}"
+                    run["failed"] += 1
+                    self.roster_tree.item(str(i), tags=("error",))
+                self.roster_tree.set(str(i), "status", status)
+            run["done"] += len(lines)
+        
+        total = len(self.roster_records)
+        elapsed = time.perf_counter() - run["started"]
+        self.roster_progress["value"] = run["done"]
+        if run["done"]:
+            eta = elapsed / run["done"] * (total - run["done"])
+            self.roster_progress_var.set(f"{run['done']} of {total} pairs, {run['failed']} failed - "
+                                         f"ETA {int(eta) // 60}:{int(eta) % 60:02d}")
+        else:
+            self.roster_progress_var.set(f"0 of {total} pairs - estimating time left")
+        
+        if run["futures"]:
+            run["job"] = self.root.after(ROSTER_POLL_MS, self.poll_roster)
+        else:
+            self.finish_roster(f"{run['done'] - run['failed']} of {total} pairs exported to "
+                               f"{self.roster_dir_var.get()} in {elapsed:.1f} s")
+    
+    def cancel_roster(self):
+        run = self.roster_run
+        if not run:
+            return
+        
+        # Queued chunks are dropped; chunks already running finish their files
+        self.root.after_cancel(run["job"])
+        for future, first in run["futures"].items():
+            status = "Cancelled" if future.cancel() else "Cancelled while running - files may be incomplete"
+            for i in range(first, min(first + ROSTER_CHUNK_SIZE, len(self.roster_records))):
+                self.roster_tree.set(str(i), "status", status)
+        self.finish_roster(f"Cancelled after {run['done']} of {len(self.roster_records)} pairs")
+    
+    def finish_roster(self, message):
+        self.roster_run["pool"].shutdown(wait=False, cancel_futures=True)
+        self.roster_run = None
+        self.roster_start_btn.config(state=tk.NORMAL)
+        self.roster_cancel_btn.config(state=tk.DISABLED)
+        self.roster_progress_var.set(message)
+        self.status_var.set(message)
+    
     def create_info_content(self):
         # Create a text widget for the info
         info_text = tk.Text(self.info_tab, wrap=tk.WORD, padx=10, pady=10)
@@ -426,7 +837,7 @@ class PMRSSchedulerApp:
         info_text.insert(tk.END, "5. Export the schedule to CHIRP format for direct radio programming, or CSV/TXT for record keeping\n\n")
         
         info_text.insert(tk.END, "Schedule Features:\n\n", "header")
-        info_text.insert(tk.END, "• Three communication windows per day (morning, afternoon, evening)\n")
+        info_text.insert(tk.END, "• Three communication windows per day (morning, afternoon, evening) by default; use 'Load Windows' to load your own from a JSON file\n")
         info_text.insert(tk.END, "• Each window has a specific channel, frequency, and CTCSS tone\n")
         info_text.insert(tk.END, "• Emergency quick-connect times for urgent communications\n")
         info_text.insert(tk.END, "• Backup protocol if regular schedule fails\n\n")
@@ -435,7 +846,7 @@ class PMRSSchedulerApp:
         info_text.insert(tk.END, "• Keep transmissions brief (30-60 seconds)\n")
         info_text.insert(tk.END, "• Listen before transmitting\n")
         info_text.insert(tk.END, "• If a channel is busy, try the next channel up\n")
-        info_text.insert(tk.END, "• Each transmission window is 5 minutes long\n")
+        info_text.insert(tk.END, "• Each transmission window is 5 minutes long unless the window configuration says otherwise\n")
         info_text.insert(tk.END, "• Use CTCSS tones to reduce interference\n")
         
         # Configure text tags
@@ -453,10 +864,10 @@ class PMRSSchedulerApp:
             days = self.days_var.get()
             self.start_date = self.start_date_entry.get_date()
             frequency_band = self.freq_band_var.get()  # Get selected frequency band
+            tone_mode = self.tone_mode_var.get()  # Get selected tone mode
             
             # Clear existing treeview data
-            for item in self.schedule_tree.get_children():
-                self.schedule_tree.delete(item)
+            self.clear_schedule_tree()
             
             for item in self.emergency_tree.get_children():
                 self.emergency_tree.delete(item)
@@ -468,8 +879,12 @@ class PMRSSchedulerApp:
                 days, 
                 start_date=self.start_date,
                 output_format=None,
-                frequency_band=frequency_band  # Pass the selected band
+                frequency_band=frequency_band,  # Pass the selected band
+                tone_mode=tone_mode,
+                windows=self.window_config
             )
+            periods = list(self.schedule[1])
+            self.set_schedule_columns(periods)
             
             # Update status
             self.status_var.set(f"Schedule generated with {days} days in rotation.")
@@ -489,25 +904,12 @@ class PMRSSchedulerApp:
                 is_today = (current_date == today)
                 
                 # Insert the row
-                row_id = self.schedule_tree.insert("", tk.END,
-                    values=(
-                        day,
-                        date_str,
-                        day_of_week,
-                        self.schedule[day]['morning']['time'],
-                        self.schedule[day]['morning']['channel'],
-                        self.schedule[day]['morning']['frequency'],
-                        f"{self.schedule[day]['morning']['ctcss']:.1f}",
-                        self.schedule[day]['afternoon']['time'],
-                        self.schedule[day]['afternoon']['channel'],
-                        self.schedule[day]['afternoon']['frequency'],
-                        f"{self.schedule[day]['afternoon']['ctcss']:.1f}",
-                        self.schedule[day]['evening']['time'],
-                        self.schedule[day]['evening']['channel'],
-                        self.schedule[day]['evening']['frequency'],
-                        f"{self.schedule[day]['evening']['ctcss']:.1f}"
-                    )
-                )
+                values = [day, date_str, day_of_week]
+                for period in periods:
+                    window = self.schedule[day][period]
+                    values += [window['time'], window['channel'], window['frequency'], sgc.format_tone(window)]
+                row_id = self.schedule_tree.insert("", tk.END, values=values)
+                self.schedule_rows.append(row_id)
                 
                 # Apply the "current_day" tag if this is today
                 if is_today:
@@ -515,6 +917,9 @@ class PMRSSchedulerApp:
                     # Optionally scroll to make the current day visible
                     self.schedule_tree.see(row_id)
             
+            self.build_filter_index()
+            self.timeline.set_schedule(self.schedule, self.schedule_meta, self.start_date)
+            
             # Populate the emergency treeview
             self.emergency_tree.insert("", tk.END,
                 values=(
@@ -522,7 +927,7 @@ class PMRSSchedulerApp:
                     self.schedule_meta['quick_connect_times'][0]['time'],
                     self.schedule_meta['quick_connect_times'][0]['channel'],
                     self.schedule_meta['quick_connect_times'][0]['frequency'],
-                    f"{self.schedule_meta['quick_connect_times'][0]['ctcss']:.1f}",
+                    sgc.format_tone(self.schedule_meta['quick_connect_times'][0]),
                     "Check at minutes past any hour"
                 )
             )
@@ -533,7 +938,7 @@ class PMRSSchedulerApp:
                     self.schedule_meta['quick_connect_times'][1]['time'],
                     self.schedule_meta['quick_connect_times'][1]['channel'],
                     self.schedule_meta['quick_connect_times'][1]['frequency'],
-                    f"{self.schedule_meta['quick_connect_times'][1]['ctcss']:.1f}",
+                    sgc.format_tone(self.schedule_meta['quick_connect_times'][1]),
                     "Check at minutes past any hour"
                 )
             )
@@ -552,6 +957,8 @@ class PMRSSchedulerApp:
             # Switch to the schedule tab
             self.notebook.select(0)
             
+            self.update_now_panel()
+            
             messagebox.showinfo("Success", f"Schedule successfully generated with {days} days in rotation starting from {self.start_date.strftime('%Y-%m-%d')}.")
             
         except ValueError as e:
@@ -574,7 +981,7 @@ class PMRSSchedulerApp:
         try:
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".chirp",
-                filetypes=[("CHIRP Files", "*.chirp"), ("All Files", "*.*")],
+                filetypes=[("CHIRP Files", "*.chirp"), ("Compressed CHIRP Files", "*.chirp.gz *.chirp.xz *.chirp.zst"), ("All Files", "*.*")],
                 title="Save CHIRP File"
             )
             
@@ -595,7 +1002,7 @@ class PMRSSchedulerApp:
         try:
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+                filetypes=[("CSV Files", "*.csv"), ("Compressed CSV Files", "*.csv.gz *.csv.xz *.csv.zst"), ("All Files", "*.*")],
                 title="Save CSV File"
             )
             
@@ -603,13 +1010,12 @@ class PMRSSchedulerApp:
                 # Add date information to CSV export
                 days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
                 
-                with open(file_path, "w", newline='') as csvfile:
-                    fieldnames = [
-                        'Day', 'Date', 'Day of Week',
-                        'Morning Time', 'Morning Channel', 'Morning Frequency', 'Morning CTCSS',
-                        'Afternoon Time', 'Afternoon Channel', 'Afternoon Frequency', 'Afternoon CTCSS',
-                        'Evening Time', 'Evening Channel', 'Evening Frequency', 'Evening CTCSS'
-                    ]
+                periods = list(self.schedule[1])
+                with sgc.open_output(file_path, newline='') as csvfile:
+                    fieldnames = ['Day', 'Date', 'Day of Week']
+                    for period in periods:
+                        label = sgc.period_label(period)
+                        fieldnames += [f'{label} Time', f'{label} Channel', f'{label} Frequency', f'{label} CTCSS']
                     writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                     
                     writer.writeheader()
@@ -618,27 +1024,20 @@ class PMRSSchedulerApp:
                         date_str = current_date.strftime("%Y-%m-%d")
                         day_of_week = days_of_week[current_date.weekday()]
                         
-                        writer.writerow({
-                            'Day': day,
-                            'Date': date_str,
-                            'Day of Week': day_of_week,
-                            'Morning Time': self.schedule[day]['morning']['time'],
-                            'Morning Channel': self.schedule[day]['morning']['channel'],
-                            'Morning Frequency': self.schedule[day]['morning']['frequency'],
-                            'Morning CTCSS': f"{self.schedule[day]['morning']['ctcss']:.1f}",
-                            'Afternoon Time': self.schedule[day]['afternoon']['time'],
-                            'Afternoon Channel': self.schedule[day]['afternoon']['channel'],
-                            'Afternoon Frequency': self.schedule[day]['afternoon']['frequency'],
-                            'Afternoon CTCSS': f"{self.schedule[day]['afternoon']['ctcss']:.1f}",
-                            'Evening Time': self.schedule[day]['evening']['time'],
-                            'Evening Channel': self.schedule[day]['evening']['channel'],
-                            'Evening Frequency': self.schedule[day]['evening']['frequency'],
-                            'Evening CTCSS': f"{self.schedule[day]['evening']['ctcss']:.1f}"
-                        })
+                        row = {'Day': day, 'Date': date_str, 'Day of Week': day_of_week}
+                        for period in periods:
+                            label = sgc.period_label(period)
+                            window = self.schedule[day][period]
+                            row[f'{label} Time'] = window['time']
+                            row[f'{label} Channel'] = window['channel']
+                            row[f'{label} Frequency'] = window['frequency']
+                            row[f'{label} CTCSS'] = sgc.format_tone(window)
+                        writer.writerow(row)
                 
                 # Write emergency info to a separate CSV
-                emergency_file_path = os.path.splitext(file_path)[0] + "_emergency.csv"
-                with open(emergency_file_path, "w", newline='') as csvfile:
+                base, compression = sgc.split_compression(file_path)
+                emergency_file_path = os.path.splitext(base)[0] + "_emergency.csv" + compression
+                with sgc.open_output(emergency_file_path, newline='') as csvfile:
                     fieldnames = ['Type', 'Time', 'Channel', 'Frequency', 'CTCSS', 'Notes']
                     writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                     
@@ -648,7 +1047,7 @@ class PMRSSchedulerApp:
                         'Time': self.schedule_meta['quick_connect_times'][0]['time'],
                         'Channel': self.schedule_meta['quick_connect_times'][0]['channel'],
                         'Frequency': self.schedule_meta['quick_connect_times'][0]['frequency'],
-                        'CTCSS': f"{self.schedule_meta['quick_connect_times'][0]['ctcss']:.1f}",
+                        'CTCSS': sgc.format_tone(self.schedule_meta['quick_connect_times'][0]),
                         'Notes': 'Check at minutes past any hour'
                     })
                     writer.writerow({
@@ -656,7 +1055,7 @@ class PMRSSchedulerApp:
                         'Time': self.schedule_meta['quick_connect_times'][1]['time'],
                         'Channel': self.schedule_meta['quick_connect_times'][1]['channel'],
                         'Frequency': self.schedule_meta['quick_connect_times'][1]['frequency'],
-                        'CTCSS': f"{self.schedule_meta['quick_connect_times'][1]['ctcss']:.1f}",
+                        'CTCSS': sgc.format_tone(self.schedule_meta['quick_connect_times'][1]),
                         'Notes': 'Check at minutes past any hour'
                     })
                     writer.writerow({
@@ -683,7 +1082,7 @@ class PMRSSchedulerApp:
         try:
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
-                filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
+                filetypes=[("Text Files", "*.txt"), ("Compressed Text Files", "*.txt.gz *.txt.xz *.txt.zst"), ("All Files", "*.*")],
                 title="Save Text File"
             )
             
@@ -691,31 +1090,30 @@ class PMRSSchedulerApp:
                 # Generate custom text file with dates
                 days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
                 
-                with open(file_path, "w") as f:
+                with sgc.open_output(file_path) as f:
                     f.write("###### EMERGENCY TRANSMISSION SCHEDULE ######\n")
                     f.write(f"Generated from personal information - {self.schedule_meta['cycle_days']}-Day Rotation\n")
                     f.write(f"Starting Date: {self.start_date.strftime('%Y-%m-%d')}\n\n")
                     
-                    f.write("DAY | DATE       | DAY OF WEEK | MORNING WINDOW | CHANNEL | FREQUENCY | CTCSS | AFTERNOON WINDOW | CHANNEL | FREQUENCY | CTCSS | EVENING WINDOW | CHANNEL | FREQUENCY | CTCSS\n")
-                    f.write("-" * 170 + "\n")
+                    periods = list(self.schedule[1])
+                    header = "DAY | DATE       | DAY OF WEEK | " + " | ".join(
+                        f"{sgc.period_label(period).upper()} WINDOW | CHANNEL | FREQUENCY | CTCSS" for period in periods)
+                    f.write(header + "\n")
+                    f.write("-" * max(170, len(header)) + "\n")
                     
                     for day in range(1, len(self.schedule) + 1):
                         current_date = self.start_date + datetime.timedelta(days=day-1)
                         date_str = current_date.strftime("%Y-%m-%d")
                         day_of_week = days_of_week[current_date.weekday()]
                         
-                        morning = self.schedule[day]['morning']
-                        afternoon = self.schedule[day]['afternoon']
-                        evening = self.schedule[day]['evening']
-                        
                         f.write(f"{day:2d} | {date_str} | {day_of_week:9s} | ")
-                        f.write(f"{morning['time']:13s} | Ch {morning['channel']:2d} | {morning['frequency']:8s} | {morning['ctcss']:5.1f} | ")
-                        f.write(f"{afternoon['time']:13s} | Ch {afternoon['channel']:2d} | {afternoon['frequency']:8s} | {afternoon['ctcss']:5.1f} | ")
-                        f.write(f"{evening['time']:13s} | Ch {evening['channel']:2d} | {evening['frequency']:8s} | {evening['ctcss']:5.1f}\n")
+                        f.write(" | ".join(
+                            f"{window['time']:13s} | Ch {window['channel']:2d} | {window['frequency']:8s} | {sgc.format_tone(window):>5s}"
+                            for window in (self.schedule[day][period] for period in periods)) + "\n")
                     
                     f.write("\n## Emergency Quick-Connect Times ##\n")
                     for i, qc in enumerate(self.schedule_meta['quick_connect_times'], 1):
-                        f.write(f"Quick Connect {i}: {qc['time']} on Channel {qc['channel']} ({qc['frequency']} MHz) with CTCSS {qc['ctcss']} Hz\n")
+                        f.write(f"Quick Connect {i}: {qc['time']} on Channel {qc['channel']} ({qc['frequency']} MHz) with {sgc.tone_label(qc)}\n")
                     
                     f.write("\n## Backup Protocol ##\n")
                     f.write(f"If no contact after three complete cycles ({self.schedule_meta['cycle_days'] * 3} days):\n")
@@ -727,7 +1125,7 @@ class PMRSSchedulerApp:
                     f.write("- Keep transmissions brief (30-60 seconds)\n")
                     f.write("- Listen before transmitting\n")
                     f.write("- If a channel is busy, try the next channel up\n")
-                    f.write("- Each transmission window is 5 minutes long\n")
+                    f.write(f"- {sgc._duration_note(self.schedule)}\n")
                     f.write("- Use CTCSS tones to reduce interference and ensure privacy\n")
                     f.write("- CHIRP file included for direct radio programming\n")
                 
@@ -737,7 +1135,294 @@ class PMRSSchedulerApp:
             messagebox.showerror("Error", f"Failed to export text file: {str(e)}")
             self.status_var.set("Error exporting text file.")
 
-if __name__ == "__main__":
+    def export_ics(self):
+        if not self.schedule or not self.schedule_meta:
+            messagebox.showwarning("Warning", "No schedule has been generated yet.")
+            return
+        
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".ics",
+                filetypes=[("iCalendar Files", "*.ics"), ("All Files", "*.*")],
+                title="Save iCalendar File"
+            )
+            
+            if file_path:
+                sgc.output_ics_file(self.schedule, self.schedule_meta, file_path, start_date=self.start_date)
+                self.status_var.set(f"iCalendar file saved to {file_path}")
+                messagebox.showinfo("Success", f"iCalendar file saved to {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export iCalendar file: {str(e)}")
+            self.status_var.set("Error exporting iCalendar file.")
+    
+    def export_packed_chirp(self):
+        if not self.schedule or not self.schedule_meta:
+            messagebox.showwarning("Warning", "No schedule has been generated yet.")
+            return
+        
+        try:
+            # Keying memories on the tone as well programs the tones into the radio,
+            # but needs several times as many memories as a long plan can spare
+            counts = {group_by: len(memory_planner.plan_memories(self.schedule, self.schedule_meta, group_by)['memories'])
+                      for group_by in ("frequency", "tone")}
+            by_frequency = messagebox.askyesnocancel(
+                "Packed CHIRP Grouping",
+                f"One memory per frequency: {counts['frequency']} memories; set each window's tone "
+                f"by hand from the slot table.\n"
+                f"One memory per frequency and tone: {counts['tone']} memories with the tones programmed in.\n\n"
+                "Use one memory per frequency?"
+            )
+            if by_frequency is None:
+                return
+            
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".chirp",
+                filetypes=[("CHIRP Files", "*.chirp"), ("Compressed CHIRP Files", "*.chirp.gz *.chirp.xz *.chirp.zst"), ("All Files", "*.*")],
+                title="Save Packed CHIRP File"
+            )
+            
+            if file_path:
+                plan = memory_planner.output_packed_files(self.schedule, self.schedule_meta, file_path,
+                                                          group_by="frequency" if by_frequency else "tone",
+                                                          start_date=self.start_date)
+                base, compression = sgc.split_compression(file_path)
+                table_path = base.rsplit(".", 1)[0] + "_slots.txt" + compression
+                self.status_var.set(f"Packed CHIRP file ({len(plan['memories'])} memories) saved to {file_path}")
+                messagebox.showinfo("Success", f"Packed CHIRP file with {len(plan['memories'])} memories saved to {file_path}\n"
+                                               f"Print the slot table in {table_path} to find each day's memory")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export packed CHIRP file: {str(e)}")
+            self.status_var.set("Error exporting packed CHIRP file.")
+    
+    def save_to_store(self):
+        if not self.schedule or not self.schedule_meta or not self.start_date:
+            messagebox.showwarning("Warning", "No schedule has been generated yet.")
+            return
+        
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".db",
+                filetypes=[("Schedule Store", "*.db"), ("All Files", "*.*")],
+                title="Save to Schedule Store",
+                confirmoverwrite=False
+            )
+            
+            if file_path:
+                pair_id = f"{self.user1_dob_entry.get()}_{self.user2_dob_entry.get()}"
+                
+                # Schedules loaded from CSV only know their start date through the GUI
+                meta = dict(self.schedule_meta)
+                meta['start_date'] = self.start_date.strftime("%Y-%m-%d")
+                meta['cycle_days'] = len(self.schedule)
+                
+                conn = schedule_store.open_store(file_path)
+                schedule_store.store_schedules(conn, [(pair_id, self.schedule, meta)])
+                conn.close()
+                
+                self.status_var.set(f"Schedule stored as '{pair_id}' in {file_path}")
+                messagebox.showinfo("Success", f"Schedule stored as '{pair_id}' in {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save to schedule store: {str(e)}")
+            self.status_var.set("Error saving to schedule store.")
+    
+    def query_store(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Schedule Store", "*.db"), ("All Files", "*.*")],
+            title="Open Schedule Store"
+        )
+        
+        if not file_path:
+            return  # User canceled
+        
+        try:
+            conn = schedule_store.open_store(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open schedule store: {str(e)}")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"Query Store - {os.path.basename(file_path)}")
+        window.geometry("800x400")
+        window.protocol("WM_DELETE_WINDOW", lambda: (conn.close(), window.destroy()))
+        
+        query_frame = ttk.Frame(window, padding=10)
+        query_frame.pack(fill=tk.X)
+        
+        when_var = tk.StringVar(value=datetime.datetime.now().strftime("%Y-%m-%d %H:%M"))
+        channel_var = tk.StringVar()
+        
+        ttk.Label(query_frame, text="Date/Time (YYYY-MM-DD HH:MM):").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(query_frame, textvariable=when_var, width=18).pack(side=tk.LEFT, padx=5)
+        ttk.Label(query_frame, text="Channel (optional):").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(query_frame, textvariable=channel_var, width=5).pack(side=tk.LEFT, padx=5)
+        
+        columns = ("pair_id", "window", "day", "period", "channel", "frequency", "ctcss")
+        results_tree = ttk.Treeview(window, columns=columns, show="headings")
+        for column, text, width in (
+            ("pair_id", "Pair", 200), ("window", "Window", 180), ("day", "Day", 40), ("period", "Period", 80),
+            ("channel", "Ch", 40), ("frequency", "Frequency", 100), ("ctcss", "Tone", 80)
+        ):
+            results_tree.heading(column, text=text)
+            results_tree.column(column, width=width, anchor=tk.CENTER)
+        results_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        def run_query():
+            try:
+                when = datetime.datetime.strptime(when_var.get().strip(), "%Y-%m-%d %H:%M")
+                channel = int(channel_var.get()) if channel_var.get().strip() else None
+                rows = schedule_store.windows_at(conn, when, channel)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid input: {str(e)}", parent=window)
+                return
+            
+            for item in results_tree.get_children():
+                results_tree.delete(item)
+            for row in rows:
+                results_tree.insert("", tk.END, values=(
+                    row['pair_id'],
+                    f"{row['datetime']} - {row['end_datetime'][11:]}",
+                    row['day'],
+                    row['period'],
+                    row['channel'],
+                    row['frequency'],
+                    sgc.format_tone(dict(row))
+                ))
+            self.status_var.set(f"{len(rows)} window(s) on the air at {when.strftime('%Y-%m-%d %H:%M')}")
+        
+        ttk.Button(query_frame, text="Search", command=run_query).pack(side=tk.LEFT, padx=5)
+        run_query()
+    
+    def compare_schedule(self):
+        if not self.schedule or not self.schedule_meta or not self.start_date:
+            messagebox.showwarning("Warning", "No schedule has been generated yet.")
+            return
+        
+        # The diff needs NumPy; import it only when a comparison is opened
+        import schedule_diff
+        
+        # Schedules loaded from CSV only know their start date through the GUI
+        meta_a = dict(self.schedule_meta)
+        meta_a['start_date'] = self.start_date.strftime("%Y-%m-%d")
+        schedule_a = self.schedule
+        
+        window = tk.Toplevel(self.root)
+        window.title("Compare Schedules")
+        window.geometry("1100x500")
+        
+        compare_frame = ttk.Frame(window, padding=10)
+        compare_frame.pack(fill=tk.X)
+        
+        band_var = tk.StringVar(value=meta_a.get('frequency_band', "PMRS"))
+        days_var = tk.IntVar(value=len(schedule_a))
+        start_var = tk.StringVar(value=meta_a['start_date'])
+        tone_mode_var = tk.StringVar(value=meta_a.get('tone_mode', "ctcss"))
+        changed_only_var = tk.BooleanVar(value=True)
+        
+        ttk.Label(compare_frame, text="Compare with  Band:").pack(side=tk.LEFT, padx=5)
+        ttk.Combobox(compare_frame, textvariable=band_var, values=list(sgc.FREQUENCY_BANDS),
+                     width=12, state="readonly").pack(side=tk.LEFT, padx=5)
+        ttk.Label(compare_frame, text="Days:").pack(side=tk.LEFT, padx=5)
+        ttk.Spinbox(compare_frame, from_=1, to=30, textvariable=days_var, width=5).pack(side=tk.LEFT, padx=5)
+        ttk.Label(compare_frame, text="Start (YYYY-MM-DD):").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(compare_frame, textvariable=start_var, width=11).pack(side=tk.LEFT, padx=5)
+        ttk.Label(compare_frame, text="Tone Mode:").pack(side=tk.LEFT, padx=5)
+        ttk.Combobox(compare_frame, textvariable=tone_mode_var, values=sgc.TONE_MODES,
+                     width=8, state="readonly").pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(compare_frame, text="Only changed", variable=changed_only_var).pack(side=tk.LEFT, padx=5)
+        
+        columns = ("date", "period", "time_a", "time_b", "channel_a", "channel_b",
+                   "frequency_a", "frequency_b", "tone_a", "tone_b")
+        diff_tree = ttk.Treeview(window, columns=columns, show="headings")
+        for column, text, width in (
+            ("date", "Date", 90), ("period", "Window", 100),
+            ("time_a", "Time (current)", 110), ("time_b", "Time (other)", 110),
+            ("channel_a", "Ch", 40), ("channel_b", "Ch", 40),
+            ("frequency_a", "Frequency (current)", 120), ("frequency_b", "Frequency (other)", 120),
+            ("tone_a", "Tone", 70), ("tone_b", "Tone", 70)
+        ):
+            diff_tree.heading(column, text=text)
+            diff_tree.column(column, width=width, anchor=tk.CENTER)
+        diff_tree.tag_configure("changed", background="#ffe0b2")
+        diff_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        summary_var = tk.StringVar()
+        ttk.Label(window, textvariable=summary_var, anchor=tk.W).pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        def run_compare():
+            try:
+                start_date = datetime.datetime.strptime(start_var.get().strip(), "%Y-%m-%d").date()
+                schedule_b, meta_b = sgc.generate_schedule(
+                    self.user1_dob_entry.get(), self.user2_dob_entry.get(), days_var.get(),
+                    start_date=start_date, frequency_band=band_var.get(), tone_mode=tone_mode_var.get(),
+                    windows=self.window_config)
+                result = schedule_diff.diff_schedules(schedule_a, meta_a, schedule_b, meta_b)
+            except (ValueError, tk.TclError) as e:
+                messagebox.showerror("Error", f"Invalid input: {str(e)}", parent=window)
+                return
+            
+            for item in diff_tree.get_children():
+                diff_tree.delete(item)
+            for row in schedule_diff.diff_rows(result, changed_only=changed_only_var.get()):
+                values = [row['date'].strftime("%Y-%m-%d"), sgc.period_label(row['period'])]
+                for field in schedule_diff.FIELDS:
+                    values += [row['a'][field], row['b'][field]]
+                diff_tree.insert("", tk.END, values=values, tags=("changed",) if row['changes'] else ())
+            
+            stats = schedule_diff.summarize(result)
+            fields = ", ".join(f"{field} {count}" for field, count in stats["fields"].items())
+            summary_var.set(f"{stats['changed']} of {stats['compared']} windows changed ({fields}); "
+                            f"{stats['only_a']} only in the current schedule, {stats['only_b']} only in the other")
+            self.status_var.set(f"Compared with {band_var.get()}, {days_var.get()} days from {start_date.strftime('%Y-%m-%d')}")
+        
+        ttk.Button(compare_frame, text="Compare", command=run_compare).pack(side=tk.LEFT, padx=5)
+        run_compare()
+
+def startup_report_main(report_path=None):
+    """Build the window, draw it once and write the startup_report JSON (to report_path if given) instead of running"""
+    import startup_report
+    startup_report.mark("imports_done")
+    
+    started = time.perf_counter()
     root = tk.Tk()
-    app = PMRSSchedulerApp(root)
-    root.mainloop()
+    tk_ms = (time.perf_counter() - started) * 1000
+    
+    started = time.perf_counter()
+    PMRSSchedulerApp(root)
+    build_ms = (time.perf_counter() - started) * 1000
+    
+    # The first window is on screen once the pending geometry and redraws are done
+    started = time.perf_counter()
+    root.update()
+    draw_ms = (time.perf_counter() - started) * 1000
+    startup_report.mark("first_window")
+    
+    phases = {
+        "band_table_ms": round(sgc._band_table_seconds * 1000, 3),
+        "tk_root_ms": round(tk_ms, 3),
+        "build_ui_ms": round(build_ms, 3),
+        "first_draw_ms": round(draw_ms, 3)
+    }
+    root.destroy()
+    
+    # Windowed builds have no console, so the report can go to a file
+    if not report_path:
+        startup_report.print_report("app_gui", phases)
+    else:
+        with open(report_path, "w") as f:
+            startup_report.print_report("app_gui", phases, f=f)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Emergency Scheduler')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='Open and draw the window once, then print import times and time to the first window '
+                        'as JSON and exit')
+    parser.add_argument('--startup-report-file', metavar='FILE',
+                        help='Write the --startup-report JSON to FILE instead (implies --startup-report)')
+    args = parser.parse_args()
+    
+    if args.startup_report or args.startup_report_file:
+        startup_report_main(args.startup_report_file)
+    else:
+        root = tk.Tk()
+        app = PMRSSchedulerApp(root)
+        root.mainloop()
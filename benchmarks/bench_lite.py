@@ -0,0 +1,71 @@
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each profile runs in a fresh interpreter so import time and peak RSS are real
+# cold-start numbers. ru_maxrss is in KiB on Linux.
+PROFILES = {
+    "lite": """
+import time, resource
+t0 = time.perf_counter()
+import schedule_lite
+t1 = time.perf_counter()
+schedule = schedule_lite.generate_lite("1990-01-01", "1985-05-05", {days})
+schedule.next_window()
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "numpy" in __import__("sys").modules)
+""",
+    "full": """
+import time, resource, datetime
+t0 = time.perf_counter()
+import schedule_generator_chirp
+t1 = time.perf_counter()
+schedule, meta = schedule_generator_chirp.generate_schedule("1990-01-01", "1985-05-05", {days})
+schedule_generator_chirp.find_next_window(schedule, datetime.date.fromisoformat(meta["start_date"]))
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "numpy" in __import__("sys").modules)
+"""
+}
+
+
+def run_profile(name, days, runs):
+    """Run one profile several times and keep the best (least disturbed) run"""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROFILES[name].format(days=days)],
+            cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.split()
+        samples.append((float(output[0]), float(output[1]), int(output[2]), output[3] == "True"))
+
+    return {
+        "import_ms": round(min(s[0] for s in samples) * 1000, 2),
+        "generate_ms": round(min(s[1] for s in samples) * 1000, 2),
+        "max_rss_kib": min(s[2] for s in samples),
+        "imports_numpy": samples[0][3]
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark import time and resident memory of the lite and full profiles')
+    parser.add_argument('--days', type=int, default=365, help='Days to generate (default: 365)')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per profile (default: 5)')
+    parser.add_argument('--history', help='Append the result as a JSON line to this file')
+
+    args = parser.parse_args()
+
+    result = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "days": args.days,
+        "profiles": {name: run_profile(name, args.days, args.runs) for name in PROFILES}
+    }
+
+    print(json.dumps(result, indent=2))
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(result) + "\n")
@@ -0,0 +1,99 @@
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startup numbers compared against the previous history entry; a regression
+# beyond --threshold percent in any of them makes the benchmark exit with 1
+TRACKED = ["wall_ms", "import_ms", "first_window_ms"]
+
+
+def run_program(command, runs):
+    """
+    Start a program with --startup-report several times and keep the best run.
+
+    Parameters:
+    - command: Command line without the --startup-report flag
+    - runs: Number of cold starts
+
+    Returns:
+    - Dictionary with the best wall, import and first-window times, the slowest
+      packages of the best run, or 'skipped' with the reason when it cannot start
+    """
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(command + ["--startup-report"], cwd=REPO_DIR, capture_output=True, text=True)
+        wall_ms = (time.perf_counter() - started) * 1000
+        if completed.returncode != 0:
+            # The GUI needs a display; report that instead of failing the whole run
+            lines = completed.stderr.strip().splitlines()
+            return {"skipped": lines[-1] if lines else f"exit code {completed.returncode}"}
+
+        report = json.loads(completed.stdout)
+        if best is None or wall_ms < best["wall_ms"]:
+            best = {
+                "wall_ms": round(wall_ms, 2),
+                "import_ms": report["import_ms"],
+                "first_window_ms": report["marks"].get("first_window"),
+                "frozen": report["frozen"],
+                "phases": report["phases"],
+                "packages": dict(list(report["packages"].items())[:5])
+            }
+    return best
+
+def last_result(path):
+    """The last entry of a history file, or None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+def regressions(previous, current, threshold):
+    """List the tracked numbers that grew by more than threshold percent since previous"""
+    found = []
+    for name, program in current["programs"].items():
+        before = previous.get("programs", {}).get(name, {})
+        for key in TRACKED:
+            if program.get(key) and before.get(key) and program[key] > before[key] * (1 + threshold / 100):
+                found.append(f"{name} {key}: {before[key]} -> {program[key]} ms")
+    return found
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark cold-start time of the command line generator and the GUI')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per program (default: 5)')
+    parser.add_argument('--cli-binary', help='Measure this built executable instead of schedule_generator_chirp.py')
+    parser.add_argument('--gui-binary', help='Measure this built executable instead of app_gui.py')
+    parser.add_argument('--history', help='Append the result as a JSON line to this file and compare with the previous one')
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help='Percent slowdown against the previous history entry that counts as a regression (default: 20)')
+
+    args = parser.parse_args()
+
+    commands = {
+        "cli": [args.cli_binary] if args.cli_binary else [sys.executable, "schedule_generator_chirp.py"],
+        "gui": [args.gui_binary] if args.gui_binary else [sys.executable, "app_gui.py"]
+    }
+    result = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "programs": {name: run_program(command, args.runs) for name, command in commands.items()}
+    }
+
+    print(json.dumps(result, indent=2))
+    if args.history:
+        previous = last_result(args.history)
+        with open(args.history, "a") as f:
+            f.write(json.dumps(result) + "\n")
+        if previous:
+            found = regressions(previous, result, args.threshold)
+            for line in found:
+                print(f"Regression: {line}")
+            if found:
+                sys.exit(1)
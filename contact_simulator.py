@@ -0,0 +1,307 @@
+import argparse
+import concurrent.futures
+import datetime
+import os
+import numpy as np
+import schedule_generator_chirp as sgc
+
+# Trials per worker task; results do not depend on the number of workers
+TRIALS_PER_TASK = 250000
+
+# Mechanism that made contact, in the order reported
+MECHANISMS = ("window", "quick_connect", "backup", "none")
+
+# "If no contact after three complete cycles", then 24 hourly attempts
+BACKUP_AFTER_CYCLES = 3
+BACKUP_ATTEMPTS = 24
+
+DAY_MINUTES = 1440
+
+
+def _busy_probability(busy, channel):
+    """Busy probability of a channel; busy is a float for all channels or a {channel: probability} dict"""
+    if isinstance(busy, dict):
+        return float(busy.get(channel, 0.0))
+    return float(busy)
+
+def _attempt_probability(busy, channel, channels, hops):
+    """
+    Probability that a channel, or one of the next 'hops' channels up, is free.
+
+    "If a channel is busy, try the next channel up": both parties move up one
+    channel (wrapping to the lowest) until one is free or the hops run out.
+    """
+    position = channels.index(channel) if channel in channels else 0
+    all_busy = 1.0
+    for hop in range(hops + 1):
+        all_busy *= _busy_probability(busy, channels[(position + hop) % len(channels)])
+    return 1.0 - all_busy
+
+def build_model(schedule, meta, busy=0.1, miss=0.1, quick_connect_check=0.25, hops=1, cycles=6):
+    """
+    Turn a schedule into the contact opportunities of a simulation horizon.
+
+    Every opportunity is an attempt both parties may make at a fixed minute: a
+    scheduled window, a quick-connect slot or a backup slot. Each succeeds
+    independently when both parties show up and a channel is free.
+
+    Parameters:
+    - schedule: Dictionary containing the schedule
+    - meta: Dictionary containing metadata
+    - busy: Probability that a channel is busy, as a float or a {channel: probability} dict
+    - miss: Probability that a party misses an attempt
+    - quick_connect_check: Probability that a party listens on a given quick-connect slot
+    - hops: Channels up a pair tries when its channel is busy
+    - cycles: Rotations covered by the horizon; contact must happen within cycles - 1
+      rotations of the trial start to count
+
+    Returns:
+    - Dictionary of minute offsets from the start of day 1 and success probabilities
+      per mechanism, plus 'cycle_minutes' and 'horizon_minutes'
+    """
+    busy_values = busy.values() if isinstance(busy, dict) else [busy]
+    if not all(0 <= value <= 1 for value in [miss, quick_connect_check, *busy_values]):
+        raise ValueError("Probabilities must be between 0 and 1")
+    if hops < 0:
+        raise ValueError("hops must not be negative")
+    if cycles < BACKUP_AFTER_CYCLES + 2:
+        raise ValueError(f"cycles must be at least {BACKUP_AFTER_CYCLES + 2} to cover the backup protocol")
+
+    channels = list(sgc.FREQUENCY_BANDS[meta['frequency_band']]["channels"])
+    cycle_days = len(schedule)
+    cycle_minutes = cycle_days * DAY_MINUTES
+    horizon_minutes = cycles * cycle_minutes
+    attend = (1.0 - miss) ** 2
+
+    # Scheduled windows of one rotation, repeated for every rotation of the horizon
+    window_times = []
+    window_probs = []
+    for day in range(1, cycle_days + 1):
+        for window in schedule[day].values():
+            start, _ = sgc.window_minutes(window['time'])
+            window_times.append((day - 1) * DAY_MINUTES + start)
+            window_probs.append(attend * _attempt_probability(busy, window['channel'], channels, hops))
+    order = np.argsort(window_times, kind='stable')
+    offsets = np.repeat(np.arange(cycles, dtype=np.int64) * cycle_minutes, len(order))
+    window_times = np.tile(np.array(window_times, dtype=np.int64)[order], cycles) + offsets
+    window_probs = np.tile(np.array(window_probs)[order], cycles)
+
+    # Quick-connect slots repeat every hour at their XX:MM minute
+    hours = np.arange(horizon_minutes // 60, dtype=np.int64) * 60
+    qc_times = []
+    qc_probs = []
+    for qc in meta['quick_connect_times']:
+        qc_times.append(hours + int(qc['time'].split(':')[1]))
+        qc_probs.append(np.full(len(hours), (quick_connect_check ** 2) * attend
+                                * _attempt_probability(busy, qc['channel'], channels, hops)))
+    qc_times = np.concatenate(qc_times)
+    order = np.argsort(qc_times, kind='stable')
+
+    # Backup slots are the top of every hour on channel 1
+    backup_prob = attend * _attempt_probability(busy, channels[0], channels, hops)
+
+    return {
+        "window": (window_times, window_probs),
+        "quick_connect": (qc_times[order], np.concatenate(qc_probs)[order]),
+        "backup": (hours, np.full(len(hours), backup_prob)),
+        "cycle_minutes": cycle_minutes,
+        "horizon_minutes": horizon_minutes
+    }
+
+def _log_survival(probs):
+    # Cumulative log probability that every attempt so far failed; clipping keeps
+    # certain attempts finite so the running sum stays searchable
+    return np.cumsum(np.log1p(-np.clip(probs, 0.0, 1.0 - 1e-12)))
+
+def _first_success(rng, times, log_survival, earliest, limit=None):
+    """
+    Time of the first successful attempt at or after 'earliest', per trial.
+
+    Instead of drawing every attempt, one uniform per trial is compared with the
+    running survival probability: the first success is the first attempt whose
+    survival from 'earliest' drops below it (inverse transform sampling of the
+    first-success index), found with a binary search.
+
+    Parameters:
+    - rng: numpy Generator
+    - times: Sorted attempt minutes
+    - log_survival: _log_survival of the attempt probabilities
+    - earliest: Array of the earliest minute per trial
+    - limit: Maximum number of attempts per trial, or None for all remaining
+
+    Returns:
+    - int64 array of contact minutes, -1 where no attempt succeeded
+    """
+    first = np.searchsorted(times, earliest, side='left')
+    before = np.where(first > 0, log_survival[np.maximum(first - 1, 0)], 0.0)
+    target = before + np.log1p(-rng.random(len(earliest)))
+
+    # log_survival is non-increasing, so its negation can be binary searched
+    index = np.searchsorted(-log_survival, -target, side='right')
+    found = index < len(times)
+    if limit is not None:
+        found &= index < first + limit
+    return np.where(found, times[np.minimum(index, len(times) - 1)], -1)
+
+def _simulate_task(model, trials, seed_sequence):
+    """
+    Run one batch of trials (in a worker process).
+
+    Each trial starts at a uniformly random minute of the first rotation: the
+    moment the pair loses contact. Quick-connect slots are tried from then on,
+    the backup protocol after BACKUP_AFTER_CYCLES rotations without contact.
+
+    Returns:
+    - int64 array of counts, indexed by mechanism * delay_limit + delay in minutes,
+      where the 'none' row only counts trials in its first cell
+    """
+    rng = np.random.default_rng(seed_sequence)
+    cycle_minutes = model["cycle_minutes"]
+    delay_limit = model["horizon_minutes"] - cycle_minutes
+    start = rng.integers(0, cycle_minutes, size=trials, dtype=np.int64)
+
+    contact = np.empty((3, trials), dtype=np.int64)
+    for row, (mechanism, earliest, limit) in enumerate((
+        ("window", start, None),
+        ("quick_connect", start, None),
+        ("backup", start + BACKUP_AFTER_CYCLES * cycle_minutes, BACKUP_ATTEMPTS)
+    )):
+        times, probs = model[mechanism]
+        contact[row] = _first_success(rng, times, _log_survival(probs), earliest, limit)
+
+    delay = np.where(contact >= 0, contact - start, delay_limit)
+    delay[delay > delay_limit] = delay_limit
+    mechanism = np.argmin(delay, axis=0)
+    best = delay[mechanism, np.arange(trials)]
+    mechanism[best >= delay_limit] = MECHANISMS.index("none")
+    best[best >= delay_limit] = 0
+
+    return np.bincount(mechanism * delay_limit + best, minlength=len(MECHANISMS) * delay_limit)
+
+def simulate(schedule, meta, trials=1000000, busy=0.1, miss=0.1, quick_connect_check=0.25, hops=1, cycles=6,
+             seed=None, jobs=None):
+    """
+    Estimate the time to contact of a schedule with a Monte Carlo simulation.
+
+    Trials run in batches of TRIALS_PER_TASK, each with its own stream spawned
+    from one SeedSequence, so a given seed gives the same result for any number
+    of workers.
+
+    Parameters:
+    - schedule: Dictionary containing the schedule
+    - meta: Dictionary containing metadata
+    - trials: Number of simulated losses of contact
+    - busy, miss, quick_connect_check, hops, cycles: See build_model
+    - seed: Seed for reproducible results, or None
+    - jobs: Number of worker processes (default: number of CPUs)
+
+    Returns:
+    - Dictionary with 'trials', 'counts' (mechanism -> per-minute delay histogram
+      as an int64 array; 'none' holds one cell) and 'delay_limit' in minutes
+    """
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+    model = build_model(schedule, meta, busy, miss, quick_connect_check, hops, cycles)
+    delay_limit = model["horizon_minutes"] - model["cycle_minutes"]
+
+    batches = [TRIALS_PER_TASK] * (trials // TRIALS_PER_TASK)
+    if trials % TRIALS_PER_TASK:
+        batches.append(trials % TRIALS_PER_TASK)
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+
+    jobs = min(jobs or os.cpu_count() or 1, len(batches))
+    if jobs == 1:
+        parts = [_simulate_task(model, n, s) for n, s in zip(batches, seeds)]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(_simulate_task, [model] * len(batches), batches, seeds))
+
+    total = np.sum(parts, axis=0).reshape(len(MECHANISMS), delay_limit)
+    counts = {mechanism: total[i] for i, mechanism in enumerate(MECHANISMS[:-1])}
+    counts["none"] = total[-1][:1]
+    return {"trials": trials, "counts": counts, "delay_limit": delay_limit}
+
+def summarize(result, cycle_days):
+    """
+    Summary statistics of a simulation result.
+
+    Returns:
+    - Dictionary with the share of trials reaching contact within a day, within a
+      rotation and within the horizon, the mean, median, 90th and 99th percentile
+      time to contact in hours (over trials that made contact, None without any)
+      and the share of trials per mechanism
+    """
+    counts = result["counts"]
+    trials = result["trials"]
+    delays = sum(counts[mechanism] for mechanism in MECHANISMS[:-1])
+    cumulative = np.cumsum(delays)
+    contacted = int(cumulative[-1])
+
+    def within(minutes):
+        return float(cumulative[min(minutes, len(cumulative)) - 1]) / trials
+
+    def percentile(q):
+        if not contacted:
+            return None
+        return float(np.searchsorted(cumulative, q * contacted, side='left')) / 60
+
+    mean = float(np.dot(np.arange(len(delays)), delays)) / contacted / 60 if contacted else None
+    return {
+        "within_day": within(DAY_MINUTES),
+        "within_cycle": within(cycle_days * DAY_MINUTES),
+        "within_horizon": contacted / trials,
+        "mean_hours": mean,
+        "median_hours": percentile(0.5),
+        "p90_hours": percentile(0.9),
+        "p99_hours": percentile(0.99),
+        "mechanisms": {mechanism: float(counts[mechanism].sum()) / trials for mechanism in MECHANISMS}
+    }
+
+def _hours(value):
+    return "    -" if value is None else f"{value:6.1f}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Estimate time to contact of schedules with a Monte Carlo simulation')
+    parser.add_argument('user1_dob', help='First user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('user2_dob', help='Second user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('--days', type=int, nargs='+', default=[14], help='Rotation lengths to compare (default: 14)')
+    parser.add_argument('--band', nargs='+', default=['PMRS'], choices=list(sgc.FREQUENCY_BANDS),
+                        help='Frequency bands to compare (default: PMRS)')
+    parser.add_argument('--tone-mode', choices=list(sgc.TONE_MODES), default='ctcss', help='Squelch tones (default: ctcss)')
+    parser.add_argument('--windows', metavar='JSON', help='JSON file with the daily windows (name, start, end, granularity, duration)')
+    parser.add_argument('--trials', type=int, default=1000000, help='Simulated losses of contact per schedule (default: 1000000)')
+    parser.add_argument('--busy', type=float, default=0.1, help='Probability that a channel is busy (default: 0.1)')
+    parser.add_argument('--miss', type=float, default=0.1, help='Probability that a party misses an attempt (default: 0.1)')
+    parser.add_argument('--qc-check', type=float, default=0.25,
+                        help='Probability that a party listens on a given quick-connect slot (default: 0.25)')
+    parser.add_argument('--hops', type=int, default=1, help='Channels up to try when a channel is busy (default: 1)')
+    parser.add_argument('--cycles', type=int, default=6, help='Rotations simulated per trial (default: 6)')
+    parser.add_argument('--seed', type=int, help='Seed for reproducible results')
+    parser.add_argument('--jobs', type=int, help='Number of worker processes (default: number of CPUs)')
+
+    args = parser.parse_args()
+
+    try:
+        windows = sgc.load_window_config(args.windows) if args.windows else None
+        start_date = datetime.date.today()
+
+        header = f"{'BAND':12s} | DAYS | <24H   | <CYCLE | CONTACT | MEAN H | MEDIAN | P90 H  | P99 H  | WINDOW | QC     | BACKUP"
+        for band in args.band:
+            for days in args.days:
+                schedule, meta = sgc.generate_schedule(args.user1_dob, args.user2_dob, days, start_date=start_date,
+                                                       frequency_band=band, tone_mode=args.tone_mode, windows=windows)
+                result = simulate(schedule, meta, args.trials, args.busy, args.miss, args.qc_check, args.hops,
+                                  args.cycles, args.seed, args.jobs)
+                stats = summarize(result, days)
+                if header:
+                    print(header)
+                    header = None
+                shares = stats["mechanisms"]
+                print(f"{band:12s} | {days:4d} | {stats['within_day']:6.1%} | {stats['within_cycle']:6.1%} | "
+                      f"{stats['within_horizon']:7.2%} | {_hours(stats['mean_hours'])} | {_hours(stats['median_hours'])} | "
+                      f"{_hours(stats['p90_hours'])} | {_hours(stats['p99_hours'])} | {shares['window']:6.1%} | "
+                      f"{shares['quick_connect']:6.1%} | {shares['backup']:6.1%}")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
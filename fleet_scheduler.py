@@ -0,0 +1,243 @@
+import argparse
+import bisect
+import datetime
+import json
+import schedule_generator_chirp as sgc
+
+
+def window_minutes(window):
+    """Return the (start, end) minutes after midnight of a window's 'HH:MM - HH:MM' time string"""
+    start, end = (int(text[0:2]) * 60 + int(text[3:5]) for text in window['time'].split(' - '))
+    # A window running past midnight ends on the next day's clock
+    return start, end if end > start else end + 1440
+
+def window_tone(window, tone_mode="ctcss"):
+    """The tone value of a window, as listed by sgc.tone_space for the tone mode"""
+    if tone_mode == "ctcss":
+        return window['ctcss']
+    if tone_mode == "dcs":
+        return window['dcs']
+    return (window['ctcss'], window['dcs'])
+
+class OccupancyIndex:
+    """
+    Who is on the air: the occupied minute intervals of every (day, frequency),
+    kept sorted by start time with the tone each interval uses.
+
+    Two windows collide when they share a day, frequency and tone and their
+    intervals overlap, so windows of different lengths or starts still clash.
+    Frequencies rather than channel numbers are compared, since every pair maps
+    its channel numbers to frequencies in its own order.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+
+    def add(self, day, frequency, start, end, tone):
+        """Mark [start, end) on a day and frequency as used with a tone"""
+        bucket = self.buckets.setdefault((day, frequency), {"starts": [], "intervals": [], "longest": 0})
+        position = bisect.bisect_right(bucket["starts"], start)
+        bucket["starts"].insert(position, start)
+        bucket["intervals"].insert(position, (start, end, tone))
+        bucket["longest"] = max(bucket["longest"], end - start)
+
+    def conflicts(self, day, frequency, start, end, tone):
+        """True if [start, end) overlaps an interval with the same tone on that day and frequency"""
+        bucket = self.buckets.get((day, frequency))
+        if bucket is None:
+            return False
+        # Only intervals starting less than the longest interval before 'start' can reach it
+        first = bisect.bisect_right(bucket["starts"], start - bucket["longest"])
+        last = bisect.bisect_left(bucket["starts"], end)
+        return any(other_end > start and other_tone == tone
+                   for _, other_end, other_tone in bucket["intervals"][first:last])
+
+def collision_report(schedules):
+    """
+    Count collisions across a set of schedules that share a start date.
+
+    Parameters:
+    - schedules: Dictionary mapping pair_id to a (schedule, meta) tuple; each
+      schedule's tones are read according to its meta's 'tone_mode'
+
+    Returns:
+    - Dictionary with the number of windows, the number of windows that overlap an
+      earlier window on the same day, frequency and tone, and the resulting rate
+    """
+    occupancy = OccupancyIndex()
+    windows = 0
+    colliding = 0
+    for schedule, meta in schedules.values():
+        tone_mode = meta.get('tone_mode', "ctcss")
+        for day, periods in schedule.items():
+            for window in periods.values():
+                start, end = window_minutes(window)
+                tone = window_tone(window, tone_mode)
+                if occupancy.conflicts(day, window['frequency'], start, end, tone):
+                    colliding += 1
+                occupancy.add(day, window['frequency'], start, end, tone)
+                windows += 1
+
+    return {
+        "pairs": len(schedules),
+        "windows": windows,
+        "colliding_windows": colliding,
+        "collision_rate": colliding / windows if windows else 0.0
+    }
+
+def plan_fleet(pairs, days, start_date=None, frequency_band="PMRS", tone_mode="ctcss", windows=None):
+    """
+    Generate schedules for a fleet of pairs and move windows off occupied slots.
+
+    Pairs are processed in pair_id order so the plan is deterministic regardless of
+    the order they are given in. Every window claims its minutes on its day,
+    frequency and tone in an interval index; a window that overlaps one already
+    placed first moves to the next free frequency of the band (tuned on whichever
+    channel the pair maps to it), and only when every frequency is taken at that
+    time does it move on to the next tone. A moved window keeps the generator's
+    rules: no channel of the 3 windows and no tone of the 5 windows on either side.
+
+    Parameters:
+    - pairs: Iterable of dictionaries with 'pair_id', 'user1_dob' and 'user2_dob'
+    - days: Number of days in the rotation cycle
+    - start_date: Starting date shared by every schedule (datetime.date object)
+    - frequency_band: Frequency band to use for every pair
+    - tone_mode: "ctcss", "dcs" or "split" tones for every pair
+    - windows: Daily window definitions for every pair (default: DEFAULT_WINDOWS)
+
+    Returns:
+    - schedules: Dictionary mapping pair_id to the adjusted (schedule, meta) tuple;
+      each meta's checkpoint is updated so extend_schedule continues from the
+      planned channels and tones
+    - report: Dictionary with collision metrics before and after planning
+
+    Raises ValueError when two pairs share a pair_id.
+    """
+    if start_date is None:
+        start_date = datetime.date.today()
+
+    band_frequencies = sgc.FREQUENCY_BANDS[frequency_band]["frequencies"]
+    tones, tone_index = sgc.tone_space(frequency_band, tone_mode)
+
+    schedules = {}
+    for pair in sorted(pairs, key=lambda p: p['pair_id']):
+        if pair['pair_id'] in schedules:
+            raise ValueError(f"Duplicate pair_id: {pair['pair_id']}")
+        schedules[pair['pair_id']] = sgc.generate_schedule(
+            pair['user1_dob'],
+            pair['user2_dob'],
+            days,
+            start_date=start_date,
+            frequency_band=frequency_band,
+            tone_mode=tone_mode,
+            windows=windows
+        )
+
+    before = collision_report(schedules)
+
+    occupancy = OccupancyIndex()
+    reassigned = 0
+    unresolved = 0
+
+    for pair_id, (schedule, meta) in schedules.items():
+        # The pair's own channel for each frequency it can tune
+        freq_to_channel = {}
+        for channel, frequency in meta['channel_frequencies'].items():
+            freq_to_channel.setdefault(frequency, channel)
+        frequencies = [frequency for frequency in band_frequencies if frequency in freq_to_channel]
+        frequency_index = {frequency: i for i, frequency in enumerate(frequencies)}
+
+        # Windows in the order they were generated, for the recent channel and tone rules
+        sequence = [(day, window) for day, periods in schedule.items() for window in periods.values()]
+
+        for position, (day, window) in enumerate(sequence):
+            start, end = window_minutes(window)
+            own_tone = window_tone(window, tone_mode)
+            if not occupancy.conflicts(day, window['frequency'], start, end, own_tone):
+                occupancy.add(day, window['frequency'], start, end, own_tone)
+                continue
+
+            nearby_channels = {
+                other['channel'] for _, other in
+                sequence[max(position - sgc.RECENT_CHANNELS_EXCLUDED, 0):position] +
+                sequence[position + 1:position + 1 + sgc.RECENT_CHANNELS_EXCLUDED]
+            }
+            nearby_tones = {
+                window_tone(other, tone_mode) for _, other in
+                sequence[max(position - sgc.RECENT_TONES_EXCLUDED, 0):position] +
+                sequence[position + 1:position + 1 + sgc.RECENT_TONES_EXCLUDED]
+            }
+
+            # Walk frequencies first, then tones, starting from the window's own pick
+            first_frequency = frequency_index[window['frequency']]
+            first_tone = tone_index[own_tone]
+            placed = False
+
+            for tone_offset in range(len(tones)):
+                tone = tones[(first_tone + tone_offset) % len(tones)]
+                if tone in nearby_tones:
+                    continue
+                for frequency_offset in range(len(frequencies)):
+                    frequency = frequencies[(first_frequency + frequency_offset) % len(frequencies)]
+                    channel = freq_to_channel[frequency]
+                    if channel in nearby_channels or occupancy.conflicts(day, frequency, start, end, tone):
+                        continue
+                    occupancy.add(day, frequency, start, end, tone)
+                    window['channel'] = channel
+                    window['frequency'] = frequency
+                    window.update(sgc.tone_fields(tone, tone_mode))
+                    placed = True
+                    break
+                if placed:
+                    break
+
+            if placed:
+                reassigned += 1
+            else:
+                # Left where it was; later windows still have to keep clear of it
+                occupancy.add(day, window['frequency'], start, end, own_tone)
+                unresolved += 1
+
+        # The recent channels and tones extend_schedule resumes from are the planned ones
+        recent = [window for _, window in sequence[-sgc.RECENT_HISTORY:]]
+        meta['checkpoint'] = {
+            **meta['checkpoint'],
+            "recent_channels": [window['channel'] for window in recent],
+            "recent_tones": [window_tone(window, tone_mode) for window in recent]
+        }
+
+    report = {
+        "before": before,
+        "after": collision_report(schedules),
+        "reassigned_windows": reassigned,
+        "unresolved_windows": unresolved
+    }
+
+    return schedules, report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Plan schedules for a fleet of pairs while avoiding channel collisions')
+    parser.add_argument('pairs_csv', help='CSV file with user1_dob, user2_dob and optional pair_id columns')
+    parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+    parser.add_argument('--tone-mode', choices=list(sgc.TONE_MODES), default='ctcss',
+                        help='Squelch tones: CTCSS, DCS or split CTCSS transmit / DCS receive (default: ctcss)')
+    parser.add_argument('--windows', metavar='JSON', help='JSON file with the daily windows (name, start, end, granularity, duration)')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+
+        with open(args.pairs_csv, "r", newline='') as f:
+            pairs = list(sgc.read_pairs(f))
+
+        windows = sgc.load_window_config(args.windows) if args.windows else None
+        schedules, report = plan_fleet(pairs, args.days, start_date=start_date, frequency_band=args.band,
+                                       tone_mode=args.tone_mode, windows=windows)
+        print(json.dumps(report, indent=2))
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
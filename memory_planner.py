@@ -0,0 +1,184 @@
+import argparse
+import datetime
+import schedule_generator_chirp as sgc
+
+BACKUP_FREQUENCY = "462.5625"
+BACKUP_CTCSS = 67.0
+
+
+def plan_memories(schedule, meta, group_by="frequency"):
+    """
+    Pack a schedule into as few radio memories as possible.
+
+    Windows that share a frequency share one memory slot, found with a
+    dictionary lookup per window, and the tone of each window is set by hand
+    from the slot table. With group_by="tone" the key is the (frequency, tone)
+    combination instead, which programs the tones into the radio but needs
+    several times as many memories.
+
+    Parameters:
+    - schedule: Dictionary containing the schedule
+    - meta: Dictionary containing metadata
+    - group_by: "frequency" for one memory per frequency, "tone" to key memories on (frequency, tone)
+
+    Returns:
+    - Dictionary with the 'memories' list (number, name, frequency, ctcss, dcs, uses),
+      'day_slots' mapping day -> period -> slot number, 'quick_connect_slots' and
+      'backup_slot'
+    """
+    if group_by not in ("tone", "frequency"):
+        raise ValueError(f"Unsupported memory grouping: {group_by}")
+
+    slots = {}
+    memories = []
+
+    def slot_for(frequency, ctcss, dcs=None, name=None):
+        key = (frequency, ctcss, dcs) if group_by == "tone" else frequency
+        if key not in slots:
+            number = len(memories) + 1
+            slots[key] = number
+            memories.append({
+                "number": number,
+                "name": name or f"M{number:03d}",
+                "frequency": frequency,
+                "ctcss": ctcss if group_by == "tone" else None,
+                "dcs": dcs if group_by == "tone" else None,
+                "uses": 0
+            })
+        memory = memories[slots[key] - 1]
+        memory["uses"] += 1
+        return memory["number"]
+
+    day_slots = {}
+    for day in range(1, len(schedule) + 1):
+        day_slots[day] = {
+            period: slot_for(window['frequency'], window['ctcss'], window.get('dcs'))
+            for period, window in schedule[day].items()
+        }
+
+    quick_connect_slots = [
+        slot_for(qc['frequency'], qc['ctcss'], qc.get('dcs'), f"QC{i}")
+        for i, qc in enumerate(meta['quick_connect_times'], 1)
+    ]
+    backup_slot = slot_for(BACKUP_FREQUENCY, BACKUP_CTCSS, name="BACKUP")
+
+    return {
+        "group_by": group_by,
+        "memories": memories,
+        "day_slots": day_slots,
+        "quick_connect_slots": quick_connect_slots,
+        "backup_slot": backup_slot
+    }
+
+def write_packed_chirp(f, plan):
+    """Write the planned memories as CHIRP compatible XML to an open text file"""
+    import xml.etree.ElementTree as ET
+    import xml.dom.minidom as minidom
+
+    root = ET.Element("memories", version="1.0")
+    for memory in plan['memories']:
+        if memory['ctcss'] is None and memory['dcs'] is None:
+            entry = ET.SubElement(root, "memory")
+            ET.SubElement(entry, "number").text = str(memory['number'])
+            ET.SubElement(entry, "name").text = memory['name']
+            ET.SubElement(entry, "frequency").text = memory['frequency']
+            ET.SubElement(entry, "tmode").text = ""
+            ET.SubElement(entry, "comment").text = f"Used {memory['uses']} times - set tone from slot table"
+        else:
+            sgc._add_chirp_memory(root, memory['number'], memory['name'], memory['frequency'],
+                                  memory['ctcss'], f"Used {memory['uses']} times", memory['dcs'])
+
+    xml_string = ET.tostring(root, encoding='unicode')
+    f.write(minidom.parseString(xml_string).toprettyxml(indent="  "))
+
+def write_slot_table(f, schedule, meta, plan, start_date=None):
+    """Write the printable day-to-slot lookup table to an open text file"""
+    periods = list(schedule[1])
+    show_tone = plan['group_by'] == "frequency"
+
+    f.write("###### RADIO MEMORY SLOT TABLE ######\n")
+    f.write(f"{len(plan['memories'])} memories for a {len(schedule)}-Day Rotation\n\n")
+
+    header = "DAY | " + ("DATE       | " if start_date else "")
+    header += " | ".join(f"{sgc.period_label(period).upper()} WINDOW | SLOT" + (" | TONE " if show_tone else "") for period in periods)
+    f.write(header + "\n")
+    f.write("-" * len(header) + "\n")
+
+    for day in range(1, len(schedule) + 1):
+        line = f"{day:3d} | "
+        if start_date:
+            line += f"{(start_date + datetime.timedelta(days=day - 1)).strftime('%Y-%m-%d')} | "
+        cells = []
+        for period in periods:
+            window = schedule[day][period]
+            width = len(sgc.period_label(period)) + 7
+            cell = f"{window['time']:{width}s} | {plan['day_slots'][day][period]:4d}"
+            if show_tone:
+                cell += f" | {sgc.format_tone(window):>5s}"
+            cells.append(cell)
+        f.write(line + " | ".join(cells) + "\n")
+
+    f.write("\n## Emergency Slots ##\n")
+    for i, (qc, slot) in enumerate(zip(meta['quick_connect_times'], plan['quick_connect_slots']), 1):
+        f.write(f"Quick Connect {i}: {qc['time']} on slot {slot} ({sgc.tone_label(qc)})\n")
+    f.write(f"Backup: XX:00 on slot {plan['backup_slot']} (CTCSS {BACKUP_CTCSS} Hz)\n")
+
+    f.write("\n## Memory Map ##\n")
+    group_by_tone = plan['group_by'] == "tone"
+    for memory in plan['memories']:
+        tone = sgc.tone_label(memory) if group_by_tone else "tone per window"
+        f.write(f"{memory['number']:4d} | {memory['name']:7s} | {memory['frequency']:13s} | {tone} | used {memory['uses']}x\n")
+
+def output_packed_files(schedule, meta, file_path="emergency_schedule_packed.chirp", group_by="frequency", start_date=None):
+    """
+    Output the packed CHIRP file and its slot table next to it. A .gz, .xz or
+    .zst file_path compresses both.
+
+    Returns:
+    - The memory plan
+    """
+    plan = plan_memories(schedule, meta, group_by)
+    base, compression = sgc.split_compression(file_path)
+    table_path = base.rsplit(".", 1)[0] + "_slots.txt" + compression
+
+    with sgc.open_output(file_path) as f:
+        write_packed_chirp(f, plan)
+    with sgc.open_output(table_path) as f:
+        write_slot_table(f, schedule, meta, plan, start_date)
+
+    print(f"Packed CHIRP file ({len(plan['memories'])} memories) saved to {file_path}, slot table saved to {table_path}")
+    return plan
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Pack a schedule into a minimal set of radio memories')
+    parser.add_argument('user1_dob', help='First user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('user2_dob', help='Second user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+    parser.add_argument('--tone-mode', choices=list(sgc.TONE_MODES), default='ctcss', help='Squelch tones (default: ctcss)')
+    parser.add_argument('--windows', metavar='JSON', help='JSON file with the daily windows (name, start, end, granularity, duration)')
+    parser.add_argument('--by', choices=['frequency', 'tone'], default='frequency',
+                        help='One memory per frequency or per (frequency, tone) (default: frequency, as in the GUI)')
+    parser.add_argument('--capacity', type=int, help='Number of memories the radio holds; warn if the plan needs more')
+    parser.add_argument('--output', default='emergency_schedule_packed.chirp', help='CHIRP file to write')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+        schedule, meta = sgc.generate_schedule(args.user1_dob, args.user2_dob, args.days,
+                                               start_date=start_date, frequency_band=args.band, tone_mode=args.tone_mode,
+                                               windows=sgc.load_window_config(args.windows) if args.windows else None)
+        plan = output_packed_files(schedule, meta, args.output, group_by=args.by,
+                                   start_date=datetime.date.fromisoformat(meta['start_date']))
+
+        unpacked = args.days * len(schedule[1]) + 3
+        print(f"Memories needed: {len(plan['memories'])} (unpacked: {unpacked})")
+        if args.capacity and len(plan['memories']) > args.capacity:
+            print(f"Warning: the plan needs {len(plan['memories'])} memories but the radio holds {args.capacity}; "
+                  + ("try --by frequency or fewer days" if args.by == "tone" else "try fewer days"))
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
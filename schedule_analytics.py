@@ -0,0 +1,246 @@
+import argparse
+import csv
+import datetime
+import json
+import sys
+import numpy as np
+import schedule_diff
+import schedule_generator_chirp as sgc
+
+
+def window_arrays(schedules):
+    """
+    Flatten one or more schedules into parallel NumPy arrays, one entry per window.
+
+    Built on schedule_diff.schedule_arrays, so analytics and diffs read windows
+    the same way.
+
+    Parameters:
+    - schedules: List of schedule dictionaries as returned by generate_schedule
+
+    Returns:
+    - Dictionary of equal-length arrays: 'schedule' (index into schedules), 'day',
+      'period' (index into 'periods'), 'start' and 'end' (minutes after midnight;
+      a window running past midnight ends after 1440), 'channel', 'frequency'
+      (index into 'frequencies') and 'tone' (index into 'tones'), plus the list of
+      period names under 'periods', the frequencies under 'frequencies' and the
+      format_tone text of every tone under 'tones'
+    """
+    arrays = schedule_diff.schedule_arrays(schedules)
+    counts = [len(names) for names in arrays["periods"]]
+    sched, row = schedule_diff.group_index([len(schedule) * count for schedule, count in zip(schedules, counts)])
+    counts = np.array(counts, dtype=np.int64)
+
+    # Window names in order of first appearance, and each schedule's names as indexes into them
+    periods = list(dict.fromkeys(name for names in arrays["periods"] for name in names))
+    lookup = np.array([periods.index(name) for names in arrays["periods"] for name in names], dtype=np.int64)
+    first_name = np.cumsum(counts) - counts
+
+    # A tone is its (CTCSS, DCS) pair; -1 stands for none
+    tone_pairs = np.column_stack((np.nan_to_num(arrays["ctcss"], nan=-1.0), arrays["dcs"].astype(np.float64)))
+    tone_keys, tone = np.unique(tone_pairs.reshape(-1, 2), axis=0, return_inverse=True)
+    tones = [sgc.format_tone({"ctcss": None if ctcss < 0 else float(ctcss), "dcs": None if dcs < 0 else int(dcs)})
+             for ctcss, dcs in tone_keys]
+    frequencies, frequency = np.unique(arrays["frequency"], return_inverse=True)
+
+    start = arrays["start"].astype(np.int64)
+    end = arrays["end"].astype(np.int64)
+
+    return {
+        "schedule": sched,
+        "day": row // counts[sched] + 1 if len(sched) else sched,
+        "period": lookup[first_name[sched] + row % counts[sched]] if len(sched) else sched,
+        "start": start,
+        "end": np.where(end > start, end, end + 1440),
+        "channel": arrays["channel"].astype(np.int64),
+        "frequency": frequency.reshape(-1).astype(np.int64),
+        "tone": tone.reshape(-1).astype(np.int64),
+        "periods": periods,
+        "frequencies": frequencies.tolist(),
+        "tones": tones
+    }
+
+def _max_run(values, groups):
+    """Length of the longest run of equal consecutive values within each group"""
+    if len(values) == 0:
+        return 0
+    same = (values[1:] == values[:-1]) & (groups[1:] == groups[:-1])
+    # Positions where a new run starts; run lengths are the gaps between them
+    starts = np.flatnonzero(np.concatenate(([True], ~same)))
+    lengths = np.diff(np.concatenate((starts, [len(values)])))
+    return int(lengths.max())
+
+def _overlapping_pairs(group, start, end):
+    """
+    Every pair of windows in the same group whose [start, end) intervals overlap.
+
+    Windows are sorted by group and start; only windows of the same group that
+    start less than the longest window before a window can overlap it, so the
+    candidates are found with one searchsorted and filtered on their end.
+
+    Returns:
+    - (earlier, later): arrays of row indexes of each overlapping pair, earlier < later
+    """
+    if len(start) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    order = np.lexsort((np.arange(len(start)), start, group))
+    start, end = start[order], end[order]
+    longest = int((end - start).max())
+
+    # One sort key per window; groups are spaced further apart than any window reaches
+    key = group[order] * (int(start.max()) + longest + 1) + start
+    first = np.searchsorted(key, key - longest, side='right')
+    later, offset = schedule_diff.group_index(np.arange(len(key)) - first)
+    earlier = first[later] + offset
+    overlap = end[earlier] > start[later]
+
+    rows_a, rows_b = order[earlier[overlap]], order[later[overlap]]
+    return np.minimum(rows_a, rows_b), np.maximum(rows_a, rows_b)
+
+def _histogram(values):
+    keys, counts = np.unique(values, return_counts=True)
+    return keys, counts
+
+def _format_minute(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+def analyze_schedules(schedules):
+    """
+    Compute usage and collision statistics over one schedule or a batch.
+
+    Collisions compare windows by day number, so the schedules in a batch are
+    expected to share a start date, as they do within one deployment. Windows
+    collide when their minutes overlap on the same frequency with the same tone;
+    channel numbers are not compared, since every pair maps them to frequencies
+    in its own order. 'colliding_windows' counts the windows that overlap an
+    earlier one (in batch, day and window order), like fleet_scheduler;
+    'co_frequency_windows' does the same ignoring tones. 'pair_collision_events'
+    counts overlapping windows of two different schedules, and
+    'pairwise_collision_rate' is the share of schedule pairs with at least one.
+
+    Parameters:
+    - schedules: A schedule dictionary, or a list of schedule dictionaries
+
+    Returns:
+    - Dictionary of statistics, ready to be written as JSON
+    """
+    if isinstance(schedules, dict):
+        schedules = [schedules]
+
+    arrays = window_arrays(schedules)
+    sched = arrays["schedule"]
+    channel = arrays["channel"]
+    tone_ids = arrays["tone"]
+    start = arrays["start"]
+    period = arrays["period"]
+    windows = len(channel)
+
+    # Channel, frequency and tone usage
+    channel_keys, channel_counts = _histogram(channel)
+    frequency_keys, frequency_counts = _histogram(arrays["frequency"])
+    tone_keys, tone_counts = _histogram(tone_ids)
+
+    # Time slot distribution per block
+    time_slots = {}
+    for index, name in enumerate(arrays["periods"]):
+        slot_keys, slot_counts = _histogram(start[period == index])
+        time_slots[name] = {_format_minute(int(k)): int(c) for k, c in zip(slot_keys, slot_counts)}
+
+    # Fleet collisions: overlapping windows on the same day and frequency, with the
+    # same tone (a collision, as fleet_scheduler counts them) or any tone
+    frequency = arrays["frequency"]
+    end = arrays["end"]
+    day_frequency = arrays["day"] * len(arrays["frequencies"]) + frequency
+    earlier, later = _overlapping_pairs(day_frequency * len(arrays["tones"]) + tone_ids, start, end)
+    colliding = int(len(np.unique(later)))
+    co_frequency_windows = int(len(np.unique(_overlapping_pairs(day_frequency, start, end)[1])))
+
+    # Pairwise: collisions between windows of two different schedules
+    between = sched[earlier] != sched[later]
+    pair_events = int(between.sum())
+    colliding_pairs = int(len(np.unique(sched[earlier][between] * len(schedules) + sched[later][between])))
+    schedule_pairs = len(schedules) * (len(schedules) - 1) // 2
+
+    return {
+        "schedules": len(schedules),
+        "windows": windows,
+        "channels_used": int(len(channel_keys)),
+        "frequencies_used": int(len(frequency_keys)),
+        "tones_used": int(len(tone_keys)),
+        "channel_histogram": {int(k): int(c) for k, c in zip(channel_keys, channel_counts)},
+        "frequency_histogram": {arrays["frequencies"][k]: int(c) for k, c in zip(frequency_keys, frequency_counts)},
+        "tone_histogram": {arrays["tones"][k]: int(c) for k, c in zip(tone_keys, tone_counts)},
+        "max_consecutive_channel_reuse": _max_run(channel, sched),
+        "max_consecutive_tone_reuse": _max_run(tone_ids, sched),
+        "time_slots": time_slots,
+        "collisions": {
+            "colliding_windows": colliding,
+            "collision_rate": colliding / windows if windows else 0.0,
+            "co_frequency_windows": co_frequency_windows,
+            "co_frequency_rate": co_frequency_windows / windows if windows else 0.0,
+            "pair_collision_events": pair_events,
+            "colliding_schedule_pairs": colliding_pairs,
+            "pairwise_collision_rate": colliding_pairs / schedule_pairs if schedule_pairs else 0.0
+        }
+    }
+
+def write_report_json(report, f):
+    """Write an analytics report as JSON"""
+    json.dump(report, f, indent=2)
+    f.write("\n")
+
+def write_report_csv(report, f):
+    """Write an analytics report as CSV rows of section, key and value"""
+    writer = csv.writer(f)
+    writer.writerow(['Section', 'Key', 'Value'])
+
+    for key, value in report.items():
+        if not isinstance(value, dict):
+            writer.writerow(['summary', key, value])
+    for key in ('channel_histogram', 'frequency_histogram', 'tone_histogram', 'collisions'):
+        for name, value in report[key].items():
+            writer.writerow([key, name, value])
+    for period, slots in report['time_slots'].items():
+        for name, value in slots.items():
+            writer.writerow([f"time_slots.{period}", name, value])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Report channel, tone and collision statistics for generated schedules')
+    parser.add_argument('pairs_csv', help='CSV file with user1_dob, user2_dob and optional pair_id columns')
+    parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+    parser.add_argument('--tone-mode', choices=list(sgc.TONE_MODES), default='ctcss',
+                        help='Squelch tones: CTCSS, DCS or split CTCSS transmit / DCS receive (default: ctcss)')
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help='Report format (default: json)')
+    parser.add_argument('--plan', action='store_true', help='Run the fleet planner before analysing')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+
+        with open(args.pairs_csv, "r", newline='') as f:
+            pairs = list(sgc.read_pairs(f))
+
+        if args.plan:
+            import fleet_scheduler
+            planned, _ = fleet_scheduler.plan_fleet(pairs, args.days, start_date=start_date, frequency_band=args.band,
+                                                  tone_mode=args.tone_mode)
+            schedules = [schedule for schedule, _ in planned.values()]
+        else:
+            schedules = [
+                sgc.generate_schedule(pair['user1_dob'], pair['user2_dob'], args.days,
+                                      start_date=start_date, frequency_band=args.band, tone_mode=args.tone_mode)[0]
+                for pair in pairs
+            ]
+
+        report = analyze_schedules(schedules)
+        if args.format == 'csv':
+            write_report_csv(report, sys.stdout)
+        else:
+            write_report_json(report, sys.stdout)
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
@@ -0,0 +1,289 @@
+import argparse
+import datetime
+import json
+import os
+import struct
+import sys
+import zlib
+import schedule_generator_chirp as sgc
+
+# File layout:
+#   header   64 bytes: magic, version, index offset, index capacity, pair count
+#   records  one zlib-compressed JSON document per pair, back to back
+#   index    open-addressing hash table of (pair key, record offset, record length)
+# The header is written last, so an interrupted append leaves the previous
+# index in charge and the archive readable.
+MAGIC = b"PMRSARC1"
+ARCHIVE_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQ")
+HEADER_SIZE = 64
+SLOT = struct.Struct("<QQI4x")
+
+# The index is kept at most half full so lookups probe one or two slots
+MIN_CAPACITY = 64
+MAX_LOAD = 0.5
+
+KEY_MASK = 2**64 - 1
+
+
+def pair_key(user1_dob, user2_dob):
+    """64-bit archive key of a pair: the low bits of its sgc.pair_hash"""
+    return sgc.pair_hash(user1_dob, user2_dob) & KEY_MASK
+
+def _capacity_for(count):
+    capacity = MIN_CAPACITY
+    while count > capacity * MAX_LOAD:
+        capacity *= 2
+    return capacity
+
+def _encode_record(pair_id, user1_dob, user2_dob, schedule, meta):
+    record = {"pair_id": pair_id, "user1_dob": user1_dob, "user2_dob": user2_dob, **sgc.schedule_to_json(schedule, meta)}
+    return zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+
+def _decode_record(data):
+    return json.loads(zlib.decompress(data))
+
+def _build_index(entries, capacity):
+    """Pack (key, offset, length) entries into a linear-probing table of 'capacity' slots"""
+    table = [None] * capacity
+    for key, offset, length in entries:
+        slot = key % capacity
+        while table[slot] is not None:
+            slot = (slot + 1) % capacity
+        table[slot] = (key, offset, length)
+    return b"".join(SLOT.pack(*(entry or (0, 0, 0))) for entry in table)
+
+def _write_tail(f, entries):
+    """Write the index at the end of the file, then point the header at it"""
+    capacity = _capacity_for(len(entries))
+    f.seek(0, os.SEEK_END)
+    index_offset = f.tell()
+    f.write(_build_index(entries, capacity))
+    f.flush()
+    os.fsync(f.fileno())
+
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, ARCHIVE_VERSION, 0, index_offset, capacity, len(entries)).ljust(HEADER_SIZE, b"\0"))
+    f.flush()
+    os.fsync(f.fileno())
+
+def _add_records(f, items, entries, archived_dobs=None):
+    """
+    Append records at the end of the file and merge them into the entries.
+
+    A record for a pair that is already in entries replaces the old entry; the
+    old record stays in the file as dead space. archived_dobs(entry) returns the
+    DOBs of an entry that was in the archive before this call.
+    """
+    added_dobs = {}
+    positions = {}
+    for i, (key, _, _) in enumerate(entries):
+        positions.setdefault(key, []).append(i)
+
+    f.seek(0, os.SEEK_END)
+    for pair_id, user1_dob, user2_dob, schedule, meta in items:
+        key = pair_key(user1_dob, user2_dob)
+        data = _encode_record(pair_id, user1_dob, user2_dob, schedule, meta)
+        entry = (key, f.tell(), len(data))
+        f.write(data)
+
+        # Swapped DOBs share a key, so a key match alone does not mean the same pair
+        for i in positions.get(key, []):
+            old = entries[i]
+            dobs = added_dobs[old[1]] if old[1] in added_dobs else archived_dobs(old)
+            if dobs == (user1_dob, user2_dob):
+                entries[i] = entry
+                break
+        else:
+            positions.setdefault(key, []).append(len(entries))
+            entries.append(entry)
+        added_dobs[entry[1]] = (user1_dob, user2_dob)
+
+def write_archive(path, items):
+    """
+    Write a new archive, replacing any file at path.
+
+    Parameters:
+    - path: Archive file path
+    - items: Iterable of (pair_id, user1_dob, user2_dob, schedule, meta) tuples;
+      records are written as they come, so a generator keeps memory use flat
+
+    Returns:
+    - Number of pairs in the archive
+    """
+    with open(path, "w+b") as f:
+        f.write(b"\0" * HEADER_SIZE)
+        entries = []
+        _add_records(f, items, entries)
+        _write_tail(f, entries)
+    return len(entries)
+
+def append_archive(path, items):
+    """
+    Add pairs to an existing archive (created if missing).
+
+    New records and a new index are written after the current end of the file
+    and the header is switched over last. A pair that is already archived is
+    replaced.
+
+    Returns:
+    - Number of pairs in the archive
+    """
+    if not os.path.exists(path):
+        return write_archive(path, items)
+
+    with ScheduleArchive(path) as archive:
+        entries = [entry for entry in archive._slots() if entry[2]]
+
+        def archived_dobs(entry):
+            record = archive._read_record(entry[1], entry[2])
+            return (record["user1_dob"], record["user2_dob"])
+
+        with open(path, "r+b") as f:
+            _add_records(f, items, entries, archived_dobs)
+            _write_tail(f, entries)
+    return len(entries)
+
+class ScheduleArchive:
+    """
+    Read-only view of a schedule archive.
+
+    Only the header is read on open. A lookup hashes the DOBs, reads one or two
+    index slots and then the pair's record, so its cost does not depend on the
+    number of archived pairs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, "rb")
+        try:
+            magic, version, _, self.index_offset, self.capacity, self.count = HEADER.unpack(self.f.read(HEADER.size))
+        except struct.error:
+            self.f.close()
+            raise ValueError(f"Not a schedule archive: {path}")
+        if magic != MAGIC:
+            self.f.close()
+            raise ValueError(f"Not a schedule archive: {path}")
+        if version != ARCHIVE_VERSION:
+            self.f.close()
+            raise ValueError(f"Unsupported archive version: {version}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.f.close()
+
+    def _slot(self, slot):
+        self.f.seek(self.index_offset + slot * SLOT.size)
+        return SLOT.unpack(self.f.read(SLOT.size))
+
+    def _slots(self):
+        self.f.seek(self.index_offset)
+        data = self.f.read(self.capacity * SLOT.size)
+        return [SLOT.unpack_from(data, i * SLOT.size) for i in range(self.capacity)]
+
+    def _read_record(self, offset, length):
+        self.f.seek(offset)
+        return _decode_record(self.f.read(length))
+
+    def get_record(self, user1_dob, user2_dob):
+        """Return the stored record (pair_id, DOBs, meta and days) of a pair, or None"""
+        key = pair_key(user1_dob, user2_dob)
+        slot = key % self.capacity
+        while True:
+            slot_key, offset, length = self._slot(slot)
+            if length == 0:
+                return None
+            if slot_key == key:
+                record = self._read_record(offset, length)
+                if (record["user1_dob"], record["user2_dob"]) == (user1_dob, user2_dob):
+                    return record
+            slot = (slot + 1) % self.capacity
+
+    def get(self, user1_dob, user2_dob):
+        """Return (pair_id, schedule, meta) of a pair, or None if it is not archived"""
+        record = self.get_record(user1_dob, user2_dob)
+        if record is None:
+            return None
+        return (record["pair_id"],) + sgc.schedule_from_json(record)
+
+    def __contains__(self, pair):
+        return self.get_record(*pair) is not None
+
+    def records(self):
+        """Yield every archived record in file order"""
+        for offset, length in sorted((offset, length) for _, offset, length in self._slots() if length):
+            yield self._read_record(offset, length)
+
+def _generated_items(pairs, days, start_date, band):
+    for pair in pairs:
+        yield (pair['pair_id'], pair['user1_dob'], pair['user2_dob']) + sgc.generate_schedule(
+            pair['user1_dob'], pair['user2_dob'], days, start_date=start_date, frequency_band=band)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Keep many pairs\' schedules in one indexed archive file')
+    parser.add_argument('archive', help='Archive file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for command, help_text in (('create', 'Generate schedules for a pairs CSV into a new archive'),
+                               ('append', 'Generate schedules for a pairs CSV and add them to the archive')):
+        build_parser = subparsers.add_parser(command, help=help_text)
+        build_parser.add_argument('pairs_csv', help='CSV with user1_dob, user2_dob and optional pair_id columns')
+        build_parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+        build_parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+        build_parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+
+    get_parser = subparsers.add_parser('get', help='Print one pair\'s schedule')
+    get_parser.add_argument('user1_dob', help='First user\'s date of birth in format YYYY-MM-DD')
+    get_parser.add_argument('user2_dob', help='Second user\'s date of birth in format YYYY-MM-DD')
+    get_parser.add_argument('--format', choices=['text', 'csv', 'chirp', 'ics', 'json'], default='text',
+                            help='Output format (default: text)')
+
+    subparsers.add_parser('list', help='List the archived pairs')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command in ('create', 'append'):
+            start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+            with open(args.pairs_csv, "r", newline='') as f:
+                items = _generated_items(sgc.read_pairs(f), args.days, start_date, args.band)
+                if args.command == 'create':
+                    count = write_archive(args.archive, items)
+                else:
+                    count = append_archive(args.archive, items)
+            print(f"{count} pairs in {args.archive}")
+        elif args.command == 'get':
+            with ScheduleArchive(args.archive) as archive:
+                found = archive.get(args.user1_dob, args.user2_dob)
+            if found is None:
+                raise ValueError(f"Pair {args.user1_dob} / {args.user2_dob} is not in {args.archive}")
+            pair_id, schedule, meta = found
+            if args.format == 'json':
+                json.dump({"pair_id": pair_id, **sgc.schedule_to_json(schedule, meta)}, sys.stdout, indent=2)
+                print()
+            elif args.format == 'csv':
+                sgc.write_csv_schedule(sys.stdout, schedule, meta)
+            elif args.format == 'chirp':
+                sgc.write_chirp_schedule(sys.stdout, schedule, meta)
+            elif args.format == 'ics':
+                sgc.write_ics_schedule(sys.stdout, schedule, meta)
+            else:
+                sgc.write_text_schedule(sys.stdout, schedule, meta)
+        else:
+            with ScheduleArchive(args.archive) as archive:
+                for record in archive.records():
+                    meta = record["meta"]
+                    print(f"{record['pair_id']:20s} {record['user1_dob']} {record['user2_dob']} "
+                          f"{meta['frequency_band']:12s} {meta['cycle_days']:3d} days from {meta['start_date']}")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
@@ -0,0 +1,345 @@
+import io
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import time
+
+# Only the standard library modules above are imported by the client side, so a
+# forwarded call never pays for NumPy, XML or the band tables.
+
+DEFAULT_IDLE_TIMEOUT = 600
+SPAWN_TIMEOUT = 10.0
+
+# Seconds a connected client has to send its request before the daemon moves on
+REQUEST_TIMEOUT = 10.0
+
+# Output is sent to the client in messages of about this many characters, so a
+# --bulk run through the daemon streams instead of being held in memory
+REPLY_CHUNK = 65536
+
+
+def _private_dir(path):
+    """Create a 0700 directory, or check that an existing one is ours and closed to others"""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory owned by this user")
+    return path
+
+def default_socket_path():
+    """Socket path in a private per-user runtime directory, overridable with PMRS_DAEMON_SOCKET"""
+    if os.environ.get("PMRS_DAEMON_SOCKET"):
+        return os.environ["PMRS_DAEMON_SOCKET"]
+    base_dir = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    runtime_dir = _private_dir(os.path.join(base_dir, f"pmrs-scheduler-{os.getuid()}"))
+    return os.path.join(runtime_dir, "daemon.sock")
+
+def _peer_uid(sock):
+    """User id of the process at the other end of a Unix socket, or None where the OS does not say"""
+    if hasattr(socket, "SO_PEERCRED"):
+        # Linux: struct ucred {pid, uid, gid}
+        _, uid, _ = struct.unpack("3i", sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")))
+        return uid
+    if sys.platform == "darwin" or "bsd" in sys.platform:
+        # getpeereid(): LOCAL_PEERCRED (SOL_LOCAL 0, option 1) returns struct xucred {version, uid, ...}
+        _, uid = struct.unpack("2I", sock.getsockopt(0, 1, 76)[:8])
+        return uid
+    return None
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode('utf-8') + b"\n")
+
+def _receive(sock):
+    """Read one message; the peer sends nothing after it until it gets an answer"""
+    chunks = []
+    while not chunks or not chunks[-1].endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+class _Reply:
+    """
+    Output of a forwarded command, sent to the client as it is printed.
+
+    Consecutive writes to the same stream are joined into messages of up to
+    REPLY_CHUNK characters; a write to the other stream sends what is pending
+    first, so the client sees stdout and stderr in the order they were written.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.stream = None
+        self.parts = []
+        self.size = 0
+
+    def write(self, stream, text):
+        if stream != self.stream:
+            self.flush()
+            self.stream = stream
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= REPLY_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            _send(self.conn, {self.stream: "".join(self.parts)})
+            self.parts = []
+            self.size = 0
+
+class _ReplyStream(io.TextIOBase):
+    """sys.stdout or sys.stderr of a forwarded command"""
+
+    def __init__(self, reply, stream):
+        self.reply = reply
+        self.stream = stream
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self.reply.write(self.stream, text)
+        return len(text)
+
+    def flush(self):
+        self.reply.flush()
+
+def _connect(socket_path, check_peer=True):
+    """
+    Connect to a daemon socket. The command line carries the DOBs, so unless
+    check_peer is False the daemon must run as the same user as this process;
+    PermissionError is raised otherwise.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        if check_peer:
+            uid = _peer_uid(sock)
+            if uid is not None and uid != os.getuid():
+                raise PermissionError(f"{socket_path} is served by another user (uid {uid})")
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def forward_requested(argv):
+    """True if a schedule_generator_chirp command line asks for the daemon (--daemon or PMRS_DAEMON set)"""
+    return "--daemon" in argv or bool(os.environ.get("PMRS_DAEMON"))
+
+def forward(argv):
+    """
+    Run a schedule_generator_chirp command line in the daemon, as --daemon does.
+
+    Returns the command's exit code; a daemon that cannot be reached or belongs to
+    another user is reported on standard error with exit code 1.
+    """
+    try:
+        return run_client([arg for arg in argv if arg != "--daemon"])
+    except (PermissionError, ConnectionError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+def _reads_stdin(argv):
+    """True for a command line that reads its input from standard input (--bulk -)"""
+    return any(arg == "--bulk" and value == "-" for arg, value in zip(argv, argv[1:])) or "--bulk=-" in argv
+
+def _spawn_daemon(socket_path, idle_timeout):
+    """Start a detached daemon and wait until it accepts connections"""
+    import subprocess
+
+    # A frozen build is its own interpreter; a source checkout runs this file
+    if getattr(sys, "frozen", False) or "__compiled__" in globals():
+        command = [sys.argv[0]]
+    else:
+        command = [sys.executable, os.path.abspath(__file__)]
+    command += ["--serve", "--socket", socket_path, "--idle-timeout", str(idle_timeout)]
+
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return _connect(socket_path)
+        except PermissionError:
+            raise
+        except OSError:
+            time.sleep(0.02)
+    raise ConnectionError(f"Schedule daemon did not start on {socket_path}")
+
+def run_client(argv, socket_path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Forward a schedule_generator_chirp command line to the warm daemon.
+
+    The daemon is started on first use. Where Unix domain sockets are not
+    available, and for --bulk - (the daemon cannot read this process's standard
+    input), the command runs in this process instead.
+
+    Parameters:
+    - argv: Command line arguments for schedule_generator_chirp
+    - socket_path: Path of the daemon socket (defaults to default_socket_path())
+    - idle_timeout: Seconds a newly started daemon stays up without requests
+
+    Returns:
+    - The command's exit code
+
+    Raises PermissionError when the socket belongs to another user.
+    """
+    if not hasattr(socket, "AF_UNIX") or _reads_stdin(argv):
+        import schedule_generator_chirp as sgc
+        return sgc.main(argv, forward=False)
+
+    socket_path = socket_path or default_socket_path()
+    try:
+        sock = _connect(socket_path)
+    except PermissionError:
+        raise
+    except OSError:
+        sock = _spawn_daemon(socket_path, idle_timeout)
+
+    # The reply is a series of messages: output chunks, then the exit code
+    with sock, sock.makefile("rb") as replies:
+        _send(sock, {"argv": argv, "cwd": os.getcwd()})
+        for line in replies:
+            message = json.loads(line)
+            if "exit_code" in message:
+                return message["exit_code"]
+            for stream, text in message.items():
+                (sys.stdout if stream == "stdout" else sys.stderr).write(text)
+    raise ConnectionError("Schedule daemon closed the connection before the command finished")
+
+def stop_daemon(socket_path=None):
+    """Ask a running daemon to exit; returns False if none was running"""
+    try:
+        sock = _connect(socket_path or default_socket_path())
+    except OSError:
+        return False
+    with sock:
+        try:
+            _send(sock, {"command": "stop"})
+            _receive(sock)
+        except ConnectionError:
+            # Caught the daemon while it was already shutting down
+            return False
+    return True
+
+def serve(socket_path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Run the daemon: keep the generator imported and run forwarded commands.
+
+    Commands run one at a time, since each one changes into the caller's working
+    directory to write its output files. Their output is streamed back as it is
+    printed. A client gets REQUEST_TIMEOUT seconds to send its request. The
+    daemon exits after idle_timeout seconds without a request.
+    """
+    import contextlib
+    import schedule_generator_chirp as sgc
+
+    socket_path = socket_path or default_socket_path()
+
+    # Clear a socket left behind by a daemon that did not shut down cleanly
+    if os.path.exists(socket_path):
+        try:
+            _connect(socket_path, check_peer=False).close()
+            return
+        except OSError:
+            os.unlink(socket_path)
+
+    # The socket is created owner-only; there is no window in which others can connect
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous_umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(previous_umask)
+    server.listen(16)
+    server.settimeout(idle_timeout)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+
+            with conn:
+                uid = _peer_uid(conn)
+                if uid is not None and uid != os.getuid():
+                    continue
+                conn.settimeout(REQUEST_TIMEOUT)
+                try:
+                    request = _receive(conn)
+                except (OSError, ValueError):
+                    continue
+                # Output is streamed at the pace the client reads it
+                conn.settimeout(None)
+
+                if request.get("command") == "stop":
+                    _send(conn, {"stopped": True})
+                    break
+
+                reply = _Reply(conn)
+                previous_cwd = os.getcwd()
+                try:
+                    try:
+                        os.chdir(request["cwd"])
+                        with contextlib.redirect_stdout(_ReplyStream(reply, "stdout")), \
+                                contextlib.redirect_stderr(_ReplyStream(reply, "stderr")):
+                            try:
+                                exit_code = sgc.main(request["argv"], prog="schedule_generator_chirp.py", forward=False)
+                            except SystemExit as e:
+                                # argparse exits on --help and on usage errors
+                                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                    except Exception as e:
+                        reply.write("stderr", f"Error: {e}\n")
+                        exit_code = 1
+                    finally:
+                        os.chdir(previous_cwd)
+                    reply.flush()
+                    _send(conn, {"exit_code": exit_code})
+                except OSError:
+                    # The client went away
+                    pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def _pop_option(name, default):
+        if name in args:
+            index = args.index(name)
+            value = args[index + 1]
+            del args[index:index + 2]
+            return value
+        return default
+
+    socket_path = _pop_option("--socket", None)
+    idle_timeout = float(_pop_option("--idle-timeout", DEFAULT_IDLE_TIMEOUT))
+
+    if "--serve" in args:
+        serve(socket_path, idle_timeout)
+    elif "--stop" in args:
+        print("Schedule daemon stopped." if stop_daemon(socket_path) else "No schedule daemon running.")
+    else:
+        try:
+            exit_code = run_client(args, socket_path, idle_timeout)
+        except (PermissionError, ConnectionError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            exit_code = 1
+        raise SystemExit(exit_code)
@@ -0,0 +1,321 @@
+import argparse
+import datetime
+import json
+import sys
+import numpy as np
+import schedule_generator_chirp as sgc
+
+# Fields compared for every window present in both schedules
+FIELDS = ("time", "channel", "frequency", "tone")
+
+
+def schedule_arrays(schedules):
+    """
+    Flatten rotations into arrays with one row per (schedule, day, window).
+
+    Parameters:
+    - schedules: List of schedule dictionaries
+
+    Returns:
+    - Dictionary with equally long arrays 'start', 'end' (minutes after midnight),
+      'channel', 'frequency', 'ctcss' (NaN for none) and 'dcs' (-1 for none), plus
+      'periods' (window names per schedule) and 'first_row' (row of each schedule's
+      first window); window i of day d of schedule k is row
+      first_row[k] + (d - 1) * len(periods[k]) + i
+    """
+    periods = [sgc._day_periods(schedule) for schedule in schedules]
+    windows = [schedule[day][period] for schedule, names in zip(schedules, periods)
+               for day in range(1, len(schedule) + 1) for period in names]
+    sizes = [len(schedule) * len(names) for schedule, names in zip(schedules, periods)]
+
+    # Parse 'HH:MM - HH:MM' for all windows at once: the UCS-4 code points of the
+    # fixed digit positions minus ord('0')
+    codes = np.array([window['time'] for window in windows], dtype='U13').view(np.uint32).reshape(-1, 13)
+    digits = codes[:, [0, 1, 3, 4, 8, 9, 11, 12]].astype(np.int32) - ord('0')
+
+    return {
+        "start": (digits[:, 0] * 10 + digits[:, 1]) * 60 + digits[:, 2] * 10 + digits[:, 3],
+        "end": (digits[:, 4] * 10 + digits[:, 5]) * 60 + digits[:, 6] * 10 + digits[:, 7],
+        "channel": np.array([window['channel'] for window in windows], dtype=np.int32),
+        "frequency": np.array([window['frequency'] for window in windows], dtype='U16'),
+        "ctcss": np.array([np.nan if window['ctcss'] is None else window['ctcss'] for window in windows], dtype=np.float64),
+        "dcs": np.array([-1 if window.get('dcs') is None else window['dcs'] for window in windows], dtype=np.int32),
+        "periods": periods,
+        "first_row": (np.cumsum(sizes, dtype=np.int64) - np.array(sizes, dtype=np.int64)) if sizes else np.empty(0, dtype=np.int64)
+    }
+
+def group_index(counts):
+    """For groups of the given sizes laid end to end: (group of each element, position within its group)"""
+    counts = np.asarray(counts, dtype=np.int64)
+    group = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return group, np.arange(int(counts.sum()), dtype=np.int64) - starts[group]
+
+def _table(arrays, start_dates, first_dates, spans, period_index):
+    """
+    Lay every rotation out over its pair's compared dates, first_dates[k] .. + spans[k] - 1.
+
+    Rotations repeat every cycle; dates before a rotation's start date have no
+    windows. Returns the window columns gathered per dated window, plus 'date'
+    (ordinal), 'period' (index into the shared period list) and 'pair'.
+    """
+    periods = np.array([len(names) for names in arrays["periods"]], dtype=np.int64)
+    cycle_days = np.diff(np.append(arrays["first_row"], len(arrays["start"]))) // np.maximum(periods, 1)
+    starts = np.array([date.toordinal() for date in start_dates], dtype=np.int64)
+    lead = starts - np.array([date.toordinal() for date in first_dates], dtype=np.int64)
+    days = np.where(cycle_days > 0, np.clip(np.asarray(spans, dtype=np.int64) - lead, 0, None), 0)
+
+    # One element per dated day, then one per window of that day
+    day_pair, day_offset = group_index(days)
+    window_day, window = group_index(periods[day_pair])
+    pair = day_pair[window_day]
+    day_offset = day_offset[window_day]
+
+    rows = arrays["first_row"][pair] + (day_offset % np.maximum(cycle_days, 1)[pair]) * periods[pair] + window
+    period_map = np.array([period_index[name] for names in arrays["periods"] for name in names], dtype=np.int64)
+    period_first = np.cumsum(periods) - periods
+
+    table = {field: arrays[field][rows] for field in ("start", "end", "channel", "frequency", "ctcss", "dcs")}
+    table["date"] = starts[pair] + day_offset
+    table["period"] = period_map[period_first[pair] + window]
+    table["pair"] = pair
+    return table
+
+def diff_tables(a, b, period_count, date_count):
+    """
+    Align two tables by (pair, date, window) and compare their fields.
+
+    Returns:
+    - Dictionary with 'a' and 'b' (the matched rows of each table, aligned),
+      'changed' (field -> boolean array over the matched rows), 'any' (rows with
+      at least one change) and 'only_a' / 'only_b' (rows present on one side)
+    """
+    def keys(table):
+        return (table["pair"] * date_count + table["date"]) * period_count + table["period"]
+
+    key_a = keys(a)
+    key_b = keys(b)
+    _, index_a, index_b = np.intersect1d(key_a, key_b, assume_unique=True, return_indices=True)
+    matched_a = {field: values[index_a] for field, values in a.items()}
+    matched_b = {field: values[index_b] for field, values in b.items()}
+
+    same_ctcss = (matched_a["ctcss"] == matched_b["ctcss"]) | (np.isnan(matched_a["ctcss"]) & np.isnan(matched_b["ctcss"]))
+    changed = {
+        "time": (matched_a["start"] != matched_b["start"]) | (matched_a["end"] != matched_b["end"]),
+        "channel": matched_a["channel"] != matched_b["channel"],
+        "frequency": matched_a["frequency"] != matched_b["frequency"],
+        "tone": ~same_ctcss | (matched_a["dcs"] != matched_b["dcs"])
+    }
+
+    only_a = ~np.isin(key_a, key_b, assume_unique=True)
+    only_b = ~np.isin(key_b, key_a, assume_unique=True)
+    return {
+        "a": matched_a,
+        "b": matched_b,
+        "changed": changed,
+        "any": changed["time"] | changed["channel"] | changed["frequency"] | changed["tone"],
+        "only_a": {field: values[only_a] for field, values in a.items()},
+        "only_b": {field: values[only_b] for field, values in b.items()}
+    }
+
+def _span(meta_a, cycle_a, meta_b, cycle_b):
+    """Start dates and the dates covered by the first rotation of either schedule: (start_a, start_b, first date, days)"""
+    start_a = datetime.date.fromisoformat(meta_a['start_date'])
+    start_b = datetime.date.fromisoformat(meta_b['start_date'])
+    first = min(start_a, start_b)
+    last = max(start_a + datetime.timedelta(days=cycle_a), start_b + datetime.timedelta(days=cycle_b))
+    return start_a, start_b, first, (last - first).days
+
+def diff_schedules(schedule_a, meta_a, schedule_b, meta_b, days=None):
+    """
+    Compare two schedules window by window, aligned by calendar date and window name.
+
+    Parameters:
+    - schedule_a, meta_a: The first schedule and its metadata
+    - schedule_b, meta_b: The second schedule and its metadata
+    - days: Number of dates to compare from the earlier start date (default: until the
+      later of the two first rotations ends); rotations repeat to fill the range
+
+    Returns:
+    - Result of diff_tables plus 'periods' (window names for the 'period' columns)
+    """
+    return diff_fleets({None: (schedule_a, meta_a)}, {None: (schedule_b, meta_b)}, days)
+
+def diff_fleets(fleet_a, fleet_b, days=None):
+    """
+    Compare two sets of schedules pair by pair in one vectorized pass.
+
+    Parameters:
+    - fleet_a, fleet_b: Dictionaries mapping pair_id -> (schedule, meta)
+    - days: See diff_schedules
+
+    Returns:
+    - Result of diff_tables plus 'periods', 'pair_ids' (for the 'pair' columns) and
+      'missing_a' / 'missing_b' (pair ids present in only one fleet)
+    """
+    pair_ids = [pair_id for pair_id in fleet_a if pair_id in fleet_b]
+    arrays_a = schedule_arrays([fleet_a[pair_id][0] for pair_id in pair_ids])
+    arrays_b = schedule_arrays([fleet_b[pair_id][0] for pair_id in pair_ids])
+
+    periods = []
+    period_index = {}
+    for names in arrays_a["periods"] + arrays_b["periods"]:
+        for name in names:
+            if name not in period_index:
+                period_index[name] = len(periods)
+                periods.append(name)
+
+    # Each pair is compared over the dates of both first rotations (or 'days' dates)
+    starts_a, starts_b, first_dates, spans = [], [], [], []
+    for pair_id in pair_ids:
+        (schedule_a, meta_a), (schedule_b, meta_b) = fleet_a[pair_id], fleet_b[pair_id]
+        start_a, start_b, first, span = _span(meta_a, len(schedule_a), meta_b, len(schedule_b))
+        starts_a.append(start_a)
+        starts_b.append(start_b)
+        first_dates.append(first)
+        spans.append(days or span)
+
+    table_a = _table(arrays_a, starts_a, first_dates, spans, period_index)
+    table_b = _table(arrays_b, starts_b, first_dates, spans, period_index)
+    last_date = max((first.toordinal() + span for first, span in zip(first_dates, spans)), default=0)
+
+    result = diff_tables(table_a, table_b, max(len(periods), 1), last_date + 1)
+    result["periods"] = periods
+    result["pair_ids"] = pair_ids
+    result["missing_a"] = [pair_id for pair_id in fleet_b if pair_id not in fleet_a]
+    result["missing_b"] = [pair_id for pair_id in fleet_a if pair_id not in fleet_b]
+    return result
+
+def _tone(table, i):
+    ctcss = table["ctcss"][i]
+    dcs = int(table["dcs"][i])
+    return sgc.format_tone({"ctcss": None if np.isnan(ctcss) else float(ctcss), "dcs": None if dcs < 0 else dcs})
+
+def _time(table, i):
+    start, end = int(table["start"][i]), int(table["end"][i])
+    return f"{start // 60:02d}:{start % 60:02d} - {end // 60:02d}:{end % 60:02d}"
+
+def _field(table, i, field):
+    if field == "time":
+        return _time(table, i)
+    if field == "tone":
+        return _tone(table, i)
+    return str(table[field][i])
+
+def diff_rows(result, changed_only=True):
+    """
+    Yield the compared windows of a diff as dictionaries, in date order.
+
+    Each has 'pair_id', 'date' (datetime.date), 'period', 'a' and 'b' (field ->
+    displayed value on each side) and 'changes', a list of (field, value in a,
+    value in b) tuples. With changed_only=False unchanged windows are included,
+    with an empty 'changes' list.
+    """
+    a, b = result["a"], result["b"]
+    rows = np.nonzero(result["any"])[0] if changed_only else np.arange(len(result["any"]))
+    order = rows[np.lexsort((a["period"][rows], a["date"][rows], a["pair"][rows]))]
+    for i in order.tolist():
+        values_a = {field: _field(a, i, field) for field in FIELDS}
+        values_b = {field: _field(b, i, field) for field in FIELDS}
+        yield {
+            "pair_id": result["pair_ids"][a["pair"][i]],
+            "date": datetime.date.fromordinal(int(a["date"][i])),
+            "period": result["periods"][a["period"][i]],
+            "a": values_a,
+            "b": values_b,
+            "changes": [(field, values_a[field], values_b[field]) for field in FIELDS if result["changed"][field][i]]
+        }
+
+def summarize(result):
+    """Counts of compared, changed and one-sided windows, and of changes per field"""
+    return {
+        "compared": int(len(result["any"])),
+        "changed": int(result["any"].sum()),
+        "fields": {field: int(result["changed"][field].sum()) for field in FIELDS},
+        "only_a": int(len(result["only_a"]["date"])),
+        "only_b": int(len(result["only_b"]["date"]))
+    }
+
+def load_schedules(path):
+    """
+    Read schedules written as JSON (schedule_to_json, archive 'get --format json')
+    or JSONL (bulk mode output), keyed by pair_id (None for a single schedule
+    without one). Files ending in .gz, .xz or .zst are decompressed.
+    """
+    fleet = {}
+    with sgc.open_input(path) as f:
+        text = f.read()
+    try:
+        documents = [json.loads(text)]
+    except json.JSONDecodeError:
+        try:
+            documents = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path} is neither JSON nor JSONL: {e}")
+
+    for document in documents:
+        if "error" in document:
+            continue
+        fleet[document.get("pair_id")] = sgc.schedule_from_json(document)
+    return fleet
+
+def _side(args, prefix):
+    """Generation settings of one side; the 'vs' side falls back to the first side's"""
+    def value(name):
+        vs_value = getattr(args, f"vs_{name}")
+        return vs_value if prefix == "vs" and vs_value is not None else getattr(args, name)
+
+    start_date = value("start_date")
+    windows = value("windows")
+    return sgc.generate_schedule(
+        args.user1_dob, args.user2_dob, value("days"),
+        start_date=datetime.datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None,
+        frequency_band=value("band"), tone_mode=value("tone_mode"),
+        windows=sgc.load_window_config(windows) if windows else None)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show which windows differ between two schedules, aligned by date and window')
+    parser.add_argument('user1_dob', nargs='?', help='First user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('user2_dob', nargs='?', help='Second user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('--days', type=int, default=14, help='Rotation length of the first schedule (default: 14)')
+    parser.add_argument('--start-date', help='Start date of the first schedule in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band of the first schedule (default: PMRS)')
+    parser.add_argument('--tone-mode', choices=list(sgc.TONE_MODES), default='ctcss', help='Squelch tones of the first schedule (default: ctcss)')
+    parser.add_argument('--windows', metavar='JSON', help='Window configuration of the first schedule')
+    parser.add_argument('--vs-days', type=int, help='Rotation length of the second schedule (default: same)')
+    parser.add_argument('--vs-start-date', help='Start date of the second schedule (default: same)')
+    parser.add_argument('--vs-band', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band of the second schedule (default: same)')
+    parser.add_argument('--vs-tone-mode', choices=list(sgc.TONE_MODES), help='Squelch tones of the second schedule (default: same)')
+    parser.add_argument('--vs-windows', metavar='JSON', help='Window configuration of the second schedule (default: same)')
+    parser.add_argument('--files', nargs=2, metavar=('A', 'B'),
+                        help='Compare two JSON or JSONL schedule files (e.g. bulk mode output) pair by pair instead')
+    parser.add_argument('--compare-days', type=int, help='Number of dates to compare (default: the longer first rotation)')
+    parser.add_argument('--summary', action='store_true', help='Only print the counts')
+
+    args = parser.parse_args()
+
+    try:
+        if args.files:
+            fleet_a, fleet_b = load_schedules(args.files[0]), load_schedules(args.files[1])
+        elif args.user1_dob and args.user2_dob:
+            fleet_a, fleet_b = {None: _side(args, "")}, {None: _side(args, "vs")}
+        else:
+            parser.error("give user1_dob and user2_dob, or --files A B")
+
+        result = diff_fleets(fleet_a, fleet_b, args.compare_days)
+        if not args.summary:
+            for row in diff_rows(result):
+                changes = "; ".join(f"{field} {value_a} -> {value_b}" for field, value_a, value_b in row["changes"])
+                pair = f"{row['pair_id']} " if row["pair_id"] is not None else ""
+                sys.stdout.write(f"{pair}{row['date'].isoformat()} {sgc.period_label(row['period']):12s} {changes}\n")
+
+        stats = summarize(result)
+        fields = ", ".join(f"{field} {count}" for field, count in stats["fields"].items())
+        print(f"{stats['changed']} of {stats['compared']} windows changed ({fields}); "
+              f"{stats['only_a']} only in A, {stats['only_b']} only in B")
+        if result["missing_a"] or result["missing_b"]:
+            print(f"Pairs only in A: {len(result['missing_b'])}, only in B: {len(result['missing_a'])}")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
@@ -1,14 +1,33 @@
+import os
+import sys
+
+# --startup-report times every import, so its hook goes in before anything else loads
+if __name__ == "__main__" and any(arg.startswith("--startup-report") for arg in sys.argv):
+    import startup_report
+    startup_report.start()
+
+# --daemon (or PMRS_DAEMON set in the environment) hands the command line to a
+# warm schedule_daemon before the rest of this module is even imported
+if __name__ == "__main__" and ("--daemon" in sys.argv[1:] or os.environ.get("PMRS_DAEMON")):
+    import schedule_daemon
+    raise SystemExit(schedule_daemon.forward(sys.argv[1:]))
+
+import base64
 import datetime
 import random
+import collections
+import functools
+import json
 import argparse
 import hashlib
-import numpy as np
 import csv
-import os
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
+import re
+import itertools
+import struct
+import time
 
 # Define frequency ranges for different bands
+_band_table_started = time.perf_counter()
 FREQUENCY_BANDS = {
     "PMRS": {
         "channels": range(1, 31),  # 1-30 channels
@@ -52,222 +71,489 @@ FREQUENCY_BANDS = {
     }
 }
 
+# Reported by --startup-report
+_band_table_seconds = time.perf_counter() - _band_table_started
+
+# Standard DCS codes (octal digits written as decimal numbers, e.g. 23 is D023N)
+DCS_CODES = [23, 25, 26, 31, 32, 36, 43, 47, 51, 53, 54, 65, 71, 72, 73, 74,
+             114, 115, 116, 122, 125, 131, 132, 134, 143, 145, 152, 155, 156, 162, 165, 172,
+             174, 205, 212, 223, 225, 226, 243, 244, 245, 246, 251, 252, 255, 261, 263, 265,
+             266, 271, 274, 306, 311, 315, 325, 331, 332, 343, 346, 351, 356, 364, 365, 371,
+             411, 412, 413, 423, 431, 432, 445, 446, 452, 454, 455, 462, 464, 465, 466, 503,
+             506, 516, 523, 526, 532, 546, 565, 606, 612, 624, 627, 631, 632, 654, 662, 664,
+             703, 712, 723, 731, 732, 734, 743, 754]
+
+# Tone modes: CTCSS only, DCS only, or split (transmit CTCSS, receive DCS)
+TONE_MODES = ("ctcss", "dcs", "split")
+TONE_NAMES = {"ctcss": "CTCSS tones", "dcs": "DCS codes", "split": "CTCSS/DCS split tones"}
+
+# Hour bounds (start inclusive, end exclusive) of the daily transmission windows
+WINDOW_BLOCKS = {
+    "morning": (7, 10),
+    "afternoon": (12, 15),
+    "evening": (18, 21)
+}
+
+# Start minutes a window can use within its hour
+WINDOW_MINUTES = (0, 15, 30, 45)
+
+# Default daily windows: each starts on a 'granularity' minute step between
+# 'start' (inclusive) and 'end' (exclusive) and lasts 'duration' minutes.
+# Bounds are whole hours or "HH:MM" strings
+DEFAULT_WINDOWS = [
+    {"name": name, "start": block_start, "end": block_end, "granularity": 15, "duration": 5}
+    for name, (block_start, block_end) in WINDOW_BLOCKS.items()
+]
+
+# A new window never reuses the last 3 channels or the last 5 tones; the
+# generator remembers the last 10 of each
+RECENT_CHANNELS_EXCLUDED = 3
+RECENT_TONES_EXCLUDED = 5
+RECENT_HISTORY = 10
+
+# Version of the checkpoint stored in schedule_meta for extend_schedule. It
+# holds the Mersenne Twister state packed as base64 (about 3.3 KB), which is
+# restored in constant time however long the schedule is
+CHECKPOINT_VERSION = 3
+
+# The Mersenne Twister state of random.Random: 624 32-bit words and an index
+MT_STATE = struct.Struct("<625I")
+
+# Bulk mode: pairs sent to a worker per task, and tasks in flight per worker
+BULK_CHUNK_SIZE = 16
+BULK_TASKS_PER_JOB = 4
+
+# Per-pair files written in bulk mode: output format -> (suffix, writer)
+BULK_FILE_FORMATS = {
+    "text": [(".txt", lambda f, schedule, meta, options: write_text_schedule(f, schedule, meta))],
+    "csv": [(".csv", lambda f, schedule, meta, options: write_csv_schedule(f, schedule, meta)),
+            ("_quick_connect.csv", lambda f, schedule, meta, options: write_csv_quick_connect(f, meta))],
+    "chirp": [(".chirp", lambda f, schedule, meta, options: write_chirp_schedule(f, schedule, meta))],
+    "ics": [(".ics", lambda f, schedule, meta, options: write_ics_schedule(f, schedule, meta, tz=options.get('tz')))],
+    "json": [(".json", lambda f, schedule, meta, options: json.dump(schedule_to_json(schedule, meta), f))]
+}
+BULK_FILE_FORMATS["all"] = BULK_FILE_FORMATS["text"] + BULK_FILE_FORMATS["csv"] + BULK_FILE_FORMATS["chirp"]
+
+# Compressed files are recognised by their last suffix; zstd needs the optional
+# zstandard package. The levels favour speed over the last few percent of size
+COMPRESSION_SUFFIXES = (".gz", ".xz", ".zst")
+GZIP_LEVEL = 6
+XZ_PRESET = 6
+ZSTD_LEVEL = 10
+
+# Version of the draw sequence. The same inputs always give the same schedule
+# under the same version; any change to the order or kind of draws bumps it
+GENERATOR_VERSION = 1
+
+
+def _config_minutes(value):
+    """Minutes after midnight of a whole hour or "HH:MM" window bound; 24:00 is the end of the day"""
+    if isinstance(value, int):
+        hour, minute = value, 0
+    else:
+        hour, _, minute = str(value).partition(":")
+        try:
+            hour, minute = int(hour), int(minute or 0)
+        except ValueError:
+            raise ValueError(f"Invalid window time: {value}")
+    if not (0 <= hour < 24 and 0 <= minute < 60) and (hour, minute) != (24, 0):
+        raise ValueError(f"Invalid window time: {value}")
+    return hour * 60 + minute
 
-def generate_schedule(user1_dob, user2_dob, days, start_date=None, output_format=None, frequency_band="PMRS"):
+def window_config(windows=None):
     """
-    Generate a communication schedule based on user inputs.
+    Validate a list of daily window definitions and return it in hashable form.
     
     Parameters:
-    - user1_dob: Date of birth for User 1 in the format YYYY-MM-DD
-    - user2_dob: Date of birth for User 2 in the format YYYY-MM-DD
-    - days: Number of days in the rotation cycle
-    - start_date: Starting date for the schedule (datetime.date object)
-    - output_format: Format for output (None, 'txt', 'csv', or 'chirp')
-    - frequency_band: Frequency band to use ("PMRS", "VLF", "VHF", "UHF", etc.)
+    - windows: List of dictionaries with 'name', 'start', 'end', 'granularity' and
+      'duration' keys (see DEFAULT_WINDOWS), or None for the default windows
     
     Returns:
-    - schedule: Dictionary containing the schedule
-    - meta: Dictionary containing metadata
+    - Tuple of (name, start_minute, end_minute, granularity, duration) tuples
     """
+    if windows is None:
+        windows = DEFAULT_WINDOWS
+    if not windows:
+        raise ValueError("At least one window per day is needed")
     
-    # Get the selected frequency band configuration
-    if frequency_band not in FREQUENCY_BANDS:
-        raise ValueError(f"Unsupported frequency band: {frequency_band}")
+    config = []
+    for window in windows:
+        name = str(window.get("name", "")).strip().lower().replace(" ", "_")
+        start = _config_minutes(window["start"])
+        end = _config_minutes(window["end"])
+        granularity = int(window.get("granularity", 15))
+        duration = int(window.get("duration", 5))
         
-    band_config = FREQUENCY_BANDS[frequency_band]
+        if not name:
+            raise ValueError("Every window needs a name")
+        if granularity < 1 or 60 % granularity:
+            raise ValueError(f"Window '{name}': granularity must divide an hour, got {granularity}")
+        if not 0 <= start < end <= 1440:
+            raise ValueError(f"Window '{name}': start must be before end within one day")
+        if duration < 1 or end - granularity + duration > 1440:
+            raise ValueError(f"Window '{name}': windows must end before midnight")
+        config.append((name, start, end, granularity, duration))
     
-    # Get channels, frequencies, and CTCSS tones from the band configuration
-    channels = list(band_config["channels"])
-    frequencies = band_config["frequencies"]
-    ctcss_tones = band_config["ctcss_tones"]
+    if len({window[0] for window in config}) != len(config):
+        raise ValueError("Window names must be unique")
+    return tuple(config)
+
+@functools.lru_cache(maxsize=64)
+def _slot_table(config):
+    """
+    Precompute the start-time draws of a window configuration.
     
-    # Convert DOBs to datetime objects
+    Each entry is (name, first_hour, last_hour, minutes, slot_count, start, end,
+    duration): the generator draws an hour from first_hour..last_hour and a minute
+    from minutes, and retries starts outside [start, end). For the default
+    windows every draw is a valid start, exactly like the fixed blocks.
+    """
+    table = []
+    for name, start, end, granularity, duration in config:
+        minutes = tuple(range(0, 60, granularity))
+        slot_count = sum(1 for minute in range(start, end) if minute % granularity == 0)
+        if slot_count == 0:
+            raise ValueError(f"Window '{name}' has no start time on its {granularity}-minute grid")
+        table.append((name, start // 60, (end - 1) // 60, minutes, slot_count, start, end, duration))
+    return tuple(table)
+
+def load_window_config(path):
+    """Read a list of window definitions from a JSON file and validate it"""
+    with open(path, "r") as f:
+        try:
+            windows = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid window configuration: {e}")
+    return window_dicts(window_config(windows))
+
+def window_dicts(config):
+    """Turn a window_config tuple back into JSON-friendly window definitions"""
+    return [
+        {"name": name, "start": f"{start // 60:02d}:{start % 60:02d}", "end": f"{end // 60:02d}:{end % 60:02d}",
+         "granularity": granularity, "duration": duration}
+        for name, start, end, granularity, duration in config
+    ]
+
+def period_label(period):
+    """Display name of a window, e.g. 'morning' -> 'Morning', 'night_shift' -> 'Night Shift'"""
+    return period.replace("_", " ").title()
+
+def period_key(label):
+    """Inverse of period_label"""
+    return label.strip().lower().replace(" ", "_")
+
+def _day_periods(schedule):
+    """Window names of a schedule in daily order"""
+    return list(schedule[min(schedule)]) if schedule else []
+
+_tone_space_cache = {}
+
+def tone_space(frequency_band, tone_mode="ctcss"):
+    """
+    Return the tones a schedule draws from and their index lookup.
+    
+    Tones are CTCSS frequencies, DCS codes, or (CTCSS, DCS) pairs in split mode.
+    Both are built once per band and mode and shared between schedules.
+    
+    Returns:
+    - tones: List of tone values
+    - tone_index: Dictionary mapping each tone value to its position in tones
+    """
+    if tone_mode not in TONE_MODES:
+        raise ValueError(f"Unsupported tone mode: {tone_mode}")
+    
+    key = (frequency_band, tone_mode)
+    if key not in _tone_space_cache:
+        ctcss_tones = FREQUENCY_BANDS[frequency_band]["ctcss_tones"]
+        if tone_mode == "ctcss":
+            tones = ctcss_tones
+        elif tone_mode == "dcs":
+            tones = DCS_CODES
+        else:
+            tones = [(ctcss, dcs) for ctcss in ctcss_tones for dcs in DCS_CODES]
+        _tone_space_cache[key] = (tones, {tone: i for i, tone in enumerate(tones)})
+    
+    return _tone_space_cache[key]
+
+def tone_fields(tone, tone_mode="ctcss"):
+    """Turn a tone value into the 'ctcss' (and for DCS modes 'dcs') fields of a window"""
+    if tone_mode == "ctcss":
+        return {"ctcss": tone}
+    if tone_mode == "dcs":
+        return {"ctcss": None, "dcs": tone}
+    return {"ctcss": tone[0], "dcs": tone[1]}
+
+def format_tone(entry):
+    """Short tone text of a window or quick-connect entry: '67.0', 'D023N' or '67.0/D023N'"""
+    dcs = entry.get('dcs')
+    if dcs is None:
+        return f"{entry['ctcss']:.1f}"
+    if entry['ctcss'] is None:
+        return f"D{dcs:03d}N"
+    return f"{entry['ctcss']:.1f}/D{dcs:03d}N"
+
+def tone_label(entry):
+    """Descriptive tone text, e.g. 'CTCSS 67.0 Hz', 'DCS D023N' or 'CTCSS 67.0 Hz TX / DCS D023N RX'"""
+    dcs = entry.get('dcs')
+    if dcs is None:
+        return f"CTCSS {entry['ctcss']:.1f} Hz"
+    if entry['ctcss'] is None:
+        return f"DCS D{dcs:03d}N"
+    return f"CTCSS {entry['ctcss']:.1f} Hz TX / DCS D{dcs:03d}N RX"
+
+def parse_tone(text):
+    """Parse the output of format_tone back into window fields (see tone_fields)"""
+    text = str(text).strip()
+    ctcss_text, _, dcs_text = text.rpartition("/") if "/" in text else ("", "", text)
+    if not dcs_text.upper().startswith("D"):
+        ctcss_text, dcs_text = dcs_text, ""
     try:
-        u1_dob = datetime.datetime.strptime(user1_dob, "%Y-%m-%d")
-        u2_dob = datetime.datetime.strptime(user2_dob, "%Y-%m-%d")
+        ctcss = float(ctcss_text) if ctcss_text else None
+        dcs = int(dcs_text.upper().strip("DNI")) if dcs_text else None
+    except ValueError:
+        raise ValueError(f"Invalid tone: {text}")
+    return {"ctcss": ctcss} if dcs is None else {"ctcss": ctcss, "dcs": dcs}
+
+def _recent_mask(recent, index, count):
+    """Integer bitmask with the positions of the last 'count' values of a recent-history deque set"""
+    mask = 0
+    for back in range(1, min(count, len(recent)) + 1):
+        mask |= 1 << index[recent[-back]]
+    return mask
+
+def _select_allowed(rng, values, mask):
+    """
+    Draw uniformly from the values whose position is not set in mask.
+    
+    Rank/select: the rank k of the pick among the allowed values is drawn first,
+    then k is moved past every excluded position at or below it, lowest bit first.
+    The cost depends on the number of excluded values, not on len(values), and the
+    generator is consumed exactly like rng.choice on the filtered list.
+    """
+    k = rng.randrange(len(values) - bin(mask).count("1"))
+    while mask:
+        lowest = mask & -mask
+        if lowest.bit_length() - 1 > k:
+            break
+        k += 1
+        mask ^= lowest
+    return values[k]
+
+def _new_state(used_times=None, recent_channels=(), recent_tones=(), periods=WINDOW_BLOCKS):
+    """Constraint state for _iter_days; recent channels and tones are fixed-size ring buffers"""
+    return {
+        "used_times": used_times if used_times is not None else {period: set() for period in periods},
+        "recent_channels": collections.deque(recent_channels, maxlen=RECENT_HISTORY),
+        "recent_tones": collections.deque(recent_tones, maxlen=RECENT_HISTORY)
+    }
+
+def _iter_days(rng, state, first_day, last_day, channels, tones, tone_index, slot_table=None):
+    """
+    Draw days first_day..last_day (inclusive) from the generator.
+    
+    All constraint state (used times per block, recent channels and tones) lives in
+    'state', so generation can be resumed later from a checkpoint.
+    
+    Yields (day, slots) where slots holds one (period, hour, minute, channel, tone)
+    tuple per window in slot_table order (default: the WINDOW_BLOCKS windows).
+    """
+    if slot_table is None:
+        slot_table = _slot_table(window_config())
+
+    used_times = state["used_times"]
+    recent_channels = state["recent_channels"]
+    recent_tones = state["recent_tones"]
+    channel_index = {channel: i for i, channel in enumerate(channels)}
+    
+    for day in range(first_day, last_day + 1):
+        times = []
+        
+        for period, first_hour, last_hour, minutes, slot_count, start, end, _ in slot_table:
+            # Reset if we've used all start times in a block
+            if len(used_times[period]) >= slot_count:
+                used_times[period] = set()
+            
+            # Generate times ensuring no repetition
+            while True:
+                hour = rng.randint(first_hour, last_hour)
+                minute = rng.choice(minutes)
+                start_time = f"{hour:02d}:{minute:02d}"
+                if start <= hour * 60 + minute < end and start_time not in used_times[period]:
+                    used_times[period].add(start_time)
+                    break
+            
+            times.append((period, hour, minute))
+        
+        # Generate channels for each time window
+        # Avoid repeating recent channels
+        day_channels = []
+        for _ in slot_table:
+            channel = _select_allowed(rng, channels, _recent_mask(recent_channels, channel_index, RECENT_CHANNELS_EXCLUDED))
+            day_channels.append(channel)
+            recent_channels.append(channel)
+        
+        # Generate tones for each time window
+        # Avoid repeating recent tones
+        day_tones = []
+        for _ in slot_table:
+            tone = _select_allowed(rng, tones, _recent_mask(recent_tones, tone_index, RECENT_TONES_EXCLUDED))
+            day_tones.append(tone)
+            recent_tones.append(tone)
+        
+        yield day, [
+            (period, hour, minute, channel, tone)
+            for (period, hour, minute), channel, tone in zip(times, day_channels, day_tones)
+        ]
+
+def _generate_days(rng, state, schedule, first_day, last_day, channels, tone_mode, channel_to_freq, frequency_band,
+                   slot_table=None):
+    """Generate days first_day..last_day (inclusive) into schedule"""
+    if slot_table is None:
+        slot_table = _slot_table(window_config())
+    tones, tone_index = tone_space(frequency_band, tone_mode)
+    durations = [entry[-1] for entry in slot_table]
+    
+    for day, slots in _iter_days(rng, state, first_day, last_day, channels, tones, tone_index, slot_table):
+        schedule[day] = {}
+        for (period, hour, minute, channel, tone), duration in zip(slots, durations):
+            end = hour * 60 + minute + duration
+            schedule[day][period] = {
+                "time": f"{hour:02d}:{minute:02d} - {end // 60:02d}:{end % 60:02d}",
+                "channel": channel,
+                "frequency": channel_to_freq[channel],
+                **tone_fields(tone, tone_mode)
+            }
+
+def _checkpoint(rng, state):
+    """Serialize the generator state after the last generated day into JSON-friendly data"""
+    _, internal_state, gauss_next = rng.getstate()
+    return {
+        "version": CHECKPOINT_VERSION,
+        "rng_state": base64.b64encode(MT_STATE.pack(*internal_state)).decode("ascii"),
+        "gauss_next": gauss_next,
+        "used_times": {period: sorted(times) for period, times in state["used_times"].items()},
+        "recent_channels": list(state["recent_channels"]),
+        "recent_tones": list(state["recent_tones"])
+    }
+
+def _restore_checkpoint(checkpoint):
+    """Rebuild the random generator and constraint state from a checkpoint"""
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported schedule checkpoint version: {checkpoint.get('version')}")
+    
+    rng = random.Random()
+    version = rng.getstate()[0]
+    rng.setstate((version, MT_STATE.unpack(base64.b64decode(checkpoint["rng_state"])), checkpoint["gauss_next"]))
+    
+    state = _new_state(
+        {period: set(times) for period, times in checkpoint["used_times"].items()},
+        checkpoint["recent_channels"],
+        # Split tones are (CTCSS, DCS) tuples, which JSON turns into lists
+        [tuple(tone) if isinstance(tone, list) else tone for tone in checkpoint["recent_tones"]]
+    )
+    return rng, state
+
+def parse_dob(dob):
+    """Parse a YYYY-MM-DD date of birth, raising ValueError with a readable message"""
+    try:
+        return datetime.datetime.strptime(dob, "%Y-%m-%d")
     except ValueError as e:
         raise ValueError(f"Invalid date format: {str(e)}")
+
+def dob_hash(dob):
+    """SHA-256 of a parsed date of birth as an integer; the two users' hashes seed the schedule"""
+    return int(hashlib.sha256(dob.strftime("%Y%m%d").encode()).hexdigest(), 16)
+
+# One person's share of a schedule seed: the hash of their date of birth (or of
+# a keyed derivation, see seed_registry) plus the date fields the quick-connect
+# slots are drawn from
+PersonSeed = collections.namedtuple("PersonSeed", ["hash", "year", "month", "day"])
+
+@functools.lru_cache(maxsize=65536)
+def person_seed(dob):
+    """Parse and hash a YYYY-MM-DD date of birth once; rosters repeat people across many pairs"""
+    parsed = parse_dob(dob)
+    return PersonSeed(dob_hash(parsed), parsed.year, parsed.month, parsed.day)
+
+def _person(dob):
+    # Anything but a DOB string is taken as pre-derived (duck-typed, since the
+    # module may also be loaded as __main__ with its own PersonSeed class)
+    return person_seed(dob) if isinstance(dob, str) else dob
+
+def _prepare_generator(hash_u1, hash_u2, days, channels, frequencies, tones, slot_table=None):
+    """
+    Seed the generator and run every draw that comes before the first day.
     
-    # Set start_date if not provided
-    if start_date is None:
-        start_date = datetime.date.today()
-    
-    # Calculate hash values from user DOBs
-    hash_u1 = int(hashlib.sha256(u1_dob.strftime("%Y%m%d").encode()).hexdigest(), 16)
-    hash_u2 = int(hashlib.sha256(u2_dob.strftime("%Y%m%d").encode()).hexdigest(), 16)
+    Returns:
+    - rng: random.Random positioned at the first day
+    - seed_value: Seed reported in the schedule metadata
+    - channel_to_freq: Dictionary mapping channels to frequencies
+    - state: Empty constraint state for _iter_days
+    """
+    if slot_table is None:
+        slot_table = _slot_table(window_config())
+    windows_per_day = len(slot_table)
     
     # Use hash values to seed random generators
     seed_value = (hash_u1 + hash_u2) % (2**32 - 1)
-    random.seed(seed_value)
-    np.random.seed(seed_value)
-    
-    schedule = {}
-    
-    # Generate a list of dates starting from start_date
-    dates = [start_date + datetime.timedelta(days=i) for i in range(days)]
+    rng = random.Random(seed_value)
     
     # Determine channel selection for each time period
     # Instead of hardcoding channel ranges like (1, 31), use the range from band_config
-    channel_selection = random.sample(channels, min(len(channels), days * 3))
+    channel_selection = rng.sample(channels, min(len(channels), days * windows_per_day))
     
     # If we need more channels than are available, repeat with different offsets
-    if days * 3 > len(channels):
-        additional_needed = days * 3 - len(channels)
+    if days * windows_per_day > len(channels):
+        additional_needed = days * windows_per_day - len(channels)
         additional_channels = []
         
         for i in range(additional_needed):
             # Pick from available channels again with a different seed
             seed_value = (hash_u1 + hash_u2 + i) % (2**32 - 1)
-            random.seed(seed_value)
-            additional_channels.append(random.choice(channels))
+            rng.seed(seed_value)
+            additional_channels.append(rng.choice(channels))
         
         channel_selection.extend(additional_channels)
     
     # Shuffle to ensure variety
-    random.shuffle(channel_selection)
+    rng.shuffle(channel_selection)
     
     # Reset seed
-    random.seed(hash_u1 + hash_u2)
+    rng.seed(hash_u1 + hash_u2)
     
-    # Determine CTCSS tone selection for each time period
-    # Use the CTCSS tones from band_config instead of hardcoded list
+    # Determine tone selection for each time period
+    # Use the tone space of the band instead of hardcoded list
     ctcss_selection = []
-    for _ in range(days * 3):
-        ctcss_selection.append(random.choice(ctcss_tones))
+    for _ in range(days * windows_per_day):
+        ctcss_selection.append(rng.choice(tones))
     
     # Create a consistent mapping between channels and frequencies based on user hashes
     channel_to_freq = {}
     
     # Use the frequencies from band_config instead of hardcoded list
     freq_pool = frequencies.copy()
-    random.shuffle(freq_pool)
+    rng.shuffle(freq_pool)
     
     for ch in channels:
         if freq_pool:
             channel_to_freq[ch] = freq_pool.pop(0)
         else:
             # If we run out of frequencies, start reusing them with an offset
-            random.seed(hash_u1 + hash_u2 + ch)
-            channel_to_freq[ch] = random.choice(frequencies)
+            rng.seed(hash_u1 + hash_u2 + ch)
+            channel_to_freq[ch] = rng.choice(frequencies)
     
-    morning_start = 7
-    morning_end = 10
-    afternoon_start = 12
-    afternoon_end = 15
-    evening_start = 18
-    evening_end = 21
-
     # Generate initial times
-    morning_time = f"{random.randint(morning_start, morning_end-1)}:{random.choice(['00', '15', '30', '45'])}"
-    afternoon_time = f"{random.randint(afternoon_start, afternoon_end-1)}:{random.choice(['00', '15', '30', '45'])}"
-    evening_time = f"{random.randint(evening_start, evening_end-1)}:{random.choice(['00', '15', '30', '45'])}"
-    
-    # Keep track of used hours to avoid repetition
-    used_morning_hours = set()
-    used_afternoon_hours = set()
-    used_evening_hours = set()
-    
-    # Keep track of recent channels and tones to avoid repetition
-    recent_channels = []
-    recent_tones = []
-    
-    for day in range(1, days + 1):
-        # Reset if we've used all hours in a block
-        if len(used_morning_hours) >= (morning_end - morning_start) * 4:
-            used_morning_hours = set()
-        if len(used_afternoon_hours) >= (afternoon_end - afternoon_start) * 4:
-            used_afternoon_hours = set()
-        if len(used_evening_hours) >= (evening_end - evening_start) * 4:
-            used_evening_hours = set()
-        
-        # Generate times ensuring no repetition
-        while True:
-            morning_hour = random.randint(morning_start, morning_end - 1)
-            morning_minute = random.choice([0, 15, 30, 45])
-            morning_time = f"{morning_hour:02d}:{morning_minute:02d}"
-            if morning_time not in used_morning_hours:
-                used_morning_hours.add(morning_time)
-                break
-        
-        while True:
-            afternoon_hour = random.randint(afternoon_start, afternoon_end - 1)
-            afternoon_minute = random.choice([0, 15, 30, 45])
-            afternoon_time = f"{afternoon_hour:02d}:{afternoon_minute:02d}"
-            if afternoon_time not in used_afternoon_hours:
-                used_afternoon_hours.add(afternoon_time)
-                break
-        
-        while True:
-            evening_hour = random.randint(evening_start, evening_end - 1)
-            evening_minute = random.choice([0, 15, 30, 45])
-            evening_time = f"{evening_hour:02d}:{evening_minute:02d}"
-            if evening_time not in used_evening_hours:
-                used_evening_hours.add(evening_time)
-                break
-        
-        # Generate channels for each time window
-        # Avoid repeating recent channels
-        available_channels = [ch for ch in channels if ch not in recent_channels[-3:]] if recent_channels else list(channels)
-        
-        morning_channel = random.choice(available_channels)
-        recent_channels.append(morning_channel)
-        if len(recent_channels) > 10:
-            recent_channels.pop(0)
-            
-        available_channels = [ch for ch in channels if ch not in recent_channels[-3:]]
-        afternoon_channel = random.choice(available_channels)
-        recent_channels.append(afternoon_channel)
-        if len(recent_channels) > 10:
-            recent_channels.pop(0)
-            
-        available_channels = [ch for ch in channels if ch not in recent_channels[-3:]]
-        evening_channel = random.choice(available_channels)
-        recent_channels.append(evening_channel)
-        if len(recent_channels) > 10:
-            recent_channels.pop(0)
-        
-        # Generate CTCSS tones for each time window
-        # Avoid repeating recent tones
-        available_tones = [tone for tone in ctcss_tones if tone not in recent_tones[-5:]] if recent_tones else ctcss_tones.copy()
-        
-        morning_tone = random.choice(available_tones)
-        recent_tones.append(morning_tone)
-        if len(recent_tones) > 10:
-            recent_tones.pop(0)
-            
-        available_tones = [tone for tone in ctcss_tones if tone not in recent_tones[-5:]]
-        afternoon_tone = random.choice(available_tones)
-        recent_tones.append(afternoon_tone)
-        if len(recent_tones) > 10:
-            recent_tones.pop(0)
-            
-        available_tones = [tone for tone in ctcss_tones if tone not in recent_tones[-5:]]
-        evening_tone = random.choice(available_tones)
-        recent_tones.append(evening_tone)
-        if len(recent_tones) > 10:
-            recent_tones.pop(0)
-        
-        schedule[day] = {
-            "morning": {
-                "time": f"{morning_time} - {morning_hour:02d}:{morning_minute+5:02d}",
-                "channel": morning_channel,
-                "frequency": channel_to_freq[morning_channel],
-                "ctcss": morning_tone
-            },
-            "afternoon": {
-                "time": f"{afternoon_time} - {afternoon_hour:02d}:{afternoon_minute+5:02d}",
-                "channel": afternoon_channel,
-                "frequency": channel_to_freq[afternoon_channel],
-                "ctcss": afternoon_tone
-            },
-            "evening": {
-                "time": f"{evening_time} - {evening_hour:02d}:{evening_minute+5:02d}",
-                "channel": evening_channel,
-                "frequency": channel_to_freq[evening_channel],
-                "ctcss": evening_tone
-            }
-        }
+    for _, first_hour, last_hour, minutes, _, _, _, _ in slot_table:
+        rng.randint(first_hour, last_hour)
+        rng.choice(minutes)
     
+    # Keep track of used times and recent channels and tones to avoid repetition
+    state = _new_state(periods=[entry[0] for entry in slot_table])
+    
+    return rng, seed_value, channel_to_freq, state
+
+def _quick_connect_times(u1_dob, u2_dob, channels, tones, channel_to_freq, tone_mode="ctcss"):
+    """Emergency quick-connect times, channels and tones derived from the two DOBs"""
     # Generate emergency quick-connect times and channels based on the combined DOB
     quick_connect_1 = (u1_dob.day + u2_dob.day) % 60
     quick_connect_2 = (u1_dob.month + u2_dob.month) % 60
@@ -284,28 +570,92 @@ def generate_schedule(user1_dob, user2_dob, days, start_date=None, output_format
     if emergency_channel_1 == emergency_channel_2:
         emergency_channel_2 = emergency_channel_2 % 22 + 1
     
-    # Generate emergency CTCSS tones
-    emergency_tone_1 = ctcss_tones[((u1_dob.day + u2_dob.year) % len(ctcss_tones))]
-    emergency_tone_2 = ctcss_tones[((u1_dob.year + u2_dob.day) % len(ctcss_tones))]
+    # Generate emergency tones
+    emergency_tone_1 = tones[((u1_dob.day + u2_dob.year) % len(tones))]
+    emergency_tone_2 = tones[((u1_dob.year + u2_dob.day) % len(tones))]
+    
+    return [
+        {
+            "time": f"XX:{quick_connect_1:02d}",
+            "channel": emergency_channel_1,
+            "frequency": channel_to_freq[emergency_channel_1],
+            **tone_fields(emergency_tone_1, tone_mode)
+        },
+        {
+            "time": f"XX:{quick_connect_2:02d}",
+            "channel": emergency_channel_2,
+            "frequency": channel_to_freq[emergency_channel_2],
+            **tone_fields(emergency_tone_2, tone_mode)
+        }
+    ]
+
+def generate_schedule(user1_dob, user2_dob, days, start_date=None, output_format=None, frequency_band="PMRS", tone_mode="ctcss",
+                      windows=None):
+    """
+    Generate a communication schedule based on user inputs.
+    
+    Parameters:
+    - user1_dob: Date of birth for User 1 in the format YYYY-MM-DD, or a pre-derived
+      PersonSeed (see person_seed and seed_registry.SeedRegistry)
+    - user2_dob: Date of birth for User 2, likewise
+    - days: Number of days in the rotation cycle
+    - start_date: Starting date for the schedule (datetime.date object)
+    - output_format: Format for output (None, 'text', 'csv', 'chirp', 'ics' or 'all')
+    - frequency_band: Frequency band to use ("PMRS", "VLF", "VHF", "UHF", etc.)
+    - tone_mode: "ctcss", "dcs" or "split" (transmit CTCSS, receive DCS)
+    - windows: List of daily window definitions (see DEFAULT_WINDOWS), default morning/afternoon/evening
+    
+    Returns:
+    - schedule: Dictionary containing the schedule
+    - meta: Dictionary containing metadata
+    """
+    # NumPy is only seeded for callers that draw from it after generating; it is
+    # imported here so that importing this module (e.g. from schedule_lite) stays light
+    import numpy as np
+    
+    # Get the selected frequency band configuration
+    if frequency_band not in FREQUENCY_BANDS:
+        raise ValueError(f"Unsupported frequency band: {frequency_band}")
+        
+    band_config = FREQUENCY_BANDS[frequency_band]
+    
+    # Get channels, frequencies, and tones from the band configuration
+    channels = list(band_config["channels"])
+    frequencies = band_config["frequencies"]
+    tones, _ = tone_space(frequency_band, tone_mode)
+    config = window_config(windows)
+    slot_table = _slot_table(config)
+    
+    # Each person's seed is derived once and cached (or passed in pre-derived)
+    u1_dob = _person(user1_dob)
+    u2_dob = _person(user2_dob)
+    
+    # Set start_date if not provided
+    if start_date is None:
+        start_date = datetime.date.today()
+    
+    hash_u1 = u1_dob.hash
+    hash_u2 = u2_dob.hash
+    
+    rng, seed_value, channel_to_freq, state = _prepare_generator(
+        hash_u1, hash_u2, days, channels, frequencies, tones, slot_table)
+    np.random.seed((hash_u1 + hash_u2) % (2**32 - 1))
+    
+    schedule = {}
+    _generate_days(rng, state, schedule, 1, days, channels, tone_mode, channel_to_freq, frequency_band, slot_table)
     
     # Add schedule metadata
     schedule_meta = {
-        "quick_connect_times": [
-            {
-                "time": f"XX:{quick_connect_1:02d}",
-                "channel": emergency_channel_1,
-                "frequency": channel_to_freq[emergency_channel_1],
-                "ctcss": emergency_tone_1
-            },
-            {
-                "time": f"XX:{quick_connect_2:02d}",
-                "channel": emergency_channel_2,
-                "frequency": channel_to_freq[emergency_channel_2],
-                "ctcss": emergency_tone_2
-            }
-        ],
+        "quick_connect_times": _quick_connect_times(u1_dob, u2_dob, channels, tones, channel_to_freq, tone_mode),
         "seed": seed_value,
-        "cycle_days": days
+        "cycle_days": days,
+        "start_date": start_date.isoformat(),
+        "frequency_band": frequency_band,
+        "tone_mode": tone_mode,
+        "windows": window_dicts(config),
+        "generator_version": GENERATOR_VERSION,
+        "channel_frequencies": channel_to_freq,
+        "checkpoint": _checkpoint(rng, state)
     }
     
     # Generate output files
@@ -317,196 +667,799 @@ def generate_schedule(user1_dob, user2_dob, days, start_date=None, output_format
         
     if output_format in ["chirp", "all"]:
         output_chirp_file(schedule, schedule_meta)
+        
+    if output_format == "ics":
+        output_ics_file(schedule, schedule_meta)
     
     return schedule, schedule_meta
 
-def output_text_file(schedule, meta):
-    """Output the schedule to a text file"""
-    with open("emergency_schedule.txt", "w") as f:
-        f.write("###### EMERGENCY TRANSMISSION SCHEDULE ######\n")
-        f.write(f"Generated from personal information - {meta['cycle_days']}-Day Rotation\n\n")
+def extend_schedule(schedule, meta, extra_days):
+    """
+    Extend a schedule by extra_days without touching the days it already has.
+    
+    Generation continues from the checkpoint stored in meta, so the cost depends
+    only on the number of new days. The schedule and meta are updated in place.
+    
+    Parameters:
+    - schedule: Dictionary containing the schedule
+    - meta: Metadata returned by generate_schedule (or a later extend_schedule)
+    - extra_days: Number of days to add to the rotation
+    
+    Returns:
+    - schedule: The extended schedule
+    - meta: The updated metadata
+    """
+    if "checkpoint" not in meta:
+        raise ValueError("Schedule metadata has no checkpoint to extend from")
+    if meta.get("generator_version", GENERATOR_VERSION) != GENERATOR_VERSION:
+        raise ValueError(f"Schedule was generated by generator version {meta['generator_version']}, "
+                         f"this is version {GENERATOR_VERSION}")
+    
+    band_config = FREQUENCY_BANDS[meta["frequency_band"]]
+    channels = list(band_config["channels"])
+    
+    # Metadata read back from JSON has string keys
+    channel_to_freq = {int(ch): freq for ch, freq in meta["channel_frequencies"].items()}
+    
+    rng, state = _restore_checkpoint(meta["checkpoint"])
+    first_day = len(schedule) + 1
+    _generate_days(rng, state, schedule, first_day, first_day + extra_days - 1, channels,
+                   meta.get("tone_mode", "ctcss"), channel_to_freq, meta["frequency_band"],
+                   _slot_table(window_config(meta.get("windows"))))
+    
+    meta["cycle_days"] = len(schedule)
+    meta["checkpoint"] = _checkpoint(rng, state)
+    
+    return schedule, meta
+
+def window_minutes(time_range):
+    """Return the (start, end) minutes after midnight of an 'HH:MM - HH:MM' window"""
+    start, end = time_range.split(' - ')
+    return int(start[:2]) * 60 + int(start[3:5]), int(end[:2]) * 60 + int(end[3:5])
+
+def find_next_window(schedule, start_date, now=None):
+    """
+    Find the window that is on the air now, or the next one to come.
+    
+    The schedule repeats every len(schedule) days from start_date.
+    
+    Parameters:
+    - schedule: Dictionary containing the schedule
+    - start_date: Date of day 1 of the schedule (datetime.date object)
+    - now: Reference time (datetime.datetime object, defaults to the current time)
+    
+    Returns:
+    - Dictionary with the 'day', 'period', 'date', 'start' and 'end' (datetime.datetime
+      objects) of the window, the 'window' itself and whether it is 'active' now
+    """
+    if now is None:
+        now = datetime.datetime.now()
+    
+    cycle_days = len(schedule)
+    first_date = max(now.date(), start_date)
+    
+    # The next window is at most one full cycle away
+    for offset in range(cycle_days + 1):
+        current_date = first_date + datetime.timedelta(days=offset)
+        day = (current_date - start_date).days % cycle_days + 1
+        midnight = datetime.datetime.combine(current_date, datetime.time())
         
-        f.write("DAY | MORNING WINDOW | CHANNEL | FREQUENCY | CTCSS | AFTERNOON WINDOW | CHANNEL | FREQUENCY | CTCSS | EVENING WINDOW | CHANNEL | FREQUENCY | CTCSS\n")
-        f.write("-" * 150 + "\n")
+        windows = sorted(
+            ((window_minutes(window['time']), period, window) for period, window in schedule[day].items()),
+            key=lambda item: item[0]
+        )
+        for (start_minute, end_minute), period, window in windows:
+            start = midnight + datetime.timedelta(minutes=start_minute)
+            end = midnight + datetime.timedelta(minutes=end_minute)
+            if end > now:
+                return {
+                    "day": day,
+                    "period": period,
+                    "date": current_date,
+                    "start": start,
+                    "end": end,
+                    "window": window,
+                    "active": start <= now
+                }
+    
+    return None
+
+def schedule_to_json(schedule, meta):
+    """Convert a schedule and its metadata into a JSON-serializable dictionary"""
+    start_date = datetime.date.fromisoformat(meta['start_date']) if meta.get('start_date') else None
+    
+    days = []
+    for day in range(1, len(schedule) + 1):
+        entry = {"day": day}
+        if start_date is not None:
+            entry["date"] = (start_date + datetime.timedelta(days=day - 1)).isoformat()
+        entry["windows"] = schedule[day]
+        days.append(entry)
+    
+    return {"meta": meta, "days": days}
+
+def schedule_from_json(data):
+    """Inverse of schedule_to_json: rebuild (schedule, meta) with integer day and channel keys"""
+    schedule = {entry["day"]: entry["windows"] for entry in data["days"]}
+    meta = dict(data["meta"])
+    if "channel_frequencies" in meta:
+        meta["channel_frequencies"] = {int(channel): frequency for channel, frequency in meta["channel_frequencies"].items()}
+    return schedule, meta
+
+def pair_hash(user1_dob, user2_dob):
+    """Combined DOB hash that seeds a pair's schedule (the same for both orders of the DOBs)"""
+    return person_seed(user1_dob).hash + person_seed(user2_dob).hash
+
+def read_pairs(f):
+    """
+    Read pair records from an open CSV file.
+    
+    The file needs 'user1_dob' and 'user2_dob' columns; an optional 'pair_id'
+    column names the pair, otherwise the two DOBs are used as its id.
+    
+    Yields dictionaries with 'pair_id', 'user1_dob' and 'user2_dob' keys.
+    """
+    reader = csv.DictReader(f)
+    for row in reader:
+        user1_dob = row['user1_dob'].strip()
+        user2_dob = row['user2_dob'].strip()
+        pair_id = (row.get('pair_id') or '').strip() or f"{user1_dob}_{user2_dob}"
+        yield {'pair_id': pair_id, 'user1_dob': user1_dob, 'user2_dob': user2_dob}
+
+def read_pair_records(f, input_format=None):
+    """
+    Read pair records from an open CSV or JSONL file, one record at a time.
+    
+    Besides 'user1_dob', 'user2_dob' and the optional 'pair_id' (see read_pairs),
+    a record may set its own 'days', 'start_date', 'frequency_band' and
+    'tone_mode'. Missing or empty fields are left out so the caller's defaults apply.
+    
+    Parameters:
+    - f: Open text file (or sys.stdin)
+    - input_format: "csv", "jsonl" or None to detect it from the first line
+    
+    Yields dictionaries with at least 'pair_id', 'user1_dob' and 'user2_dob' keys,
+    or with an 'error' key for a line that could not be read.
+    """
+    first_line = f.readline()
+    if input_format is None:
+        input_format = "jsonl" if first_line.lstrip().startswith("{") else "csv"
+    if input_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported input format: {input_format}")
+    
+    lines = itertools.chain([first_line], f)
+    if input_format == "csv":
+        rows = csv.DictReader(lines)
+    else:
+        rows = (line for line in lines if line.strip())
+    
+    for number, row in enumerate(rows, 1):
+        if input_format == "jsonl":
+            try:
+                row = json.loads(row)
+            except json.JSONDecodeError as e:
+                yield {'pair_id': f"line {number}", 'error': f"Invalid JSON: {e}"}
+                continue
         
-        for day in range(1, len(schedule) + 1):
-            morning = schedule[day]['morning']
-            afternoon = schedule[day]['afternoon']
-            evening = schedule[day]['evening']
+        record = {key: str(value).strip() for key, value in row.items()
+                  if key in ('pair_id', 'user1_dob', 'user2_dob', 'days', 'start_date', 'frequency_band', 'tone_mode')
+                  and value is not None and str(value).strip()}
+        if 'user1_dob' not in record or 'user2_dob' not in record:
+            yield {'pair_id': record.get('pair_id', f"record {number}"), 'error': "Missing user1_dob or user2_dob"}
+            continue
+        record.setdefault('pair_id', f"{record['user1_dob']}_{record['user2_dob']}")
+        yield record
+
+def _bulk_file_name(pair_id):
+    """File name stem for a pair id; anything but letters, digits, '.', '_' and '-' becomes '_'"""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", pair_id).lstrip(".") or "pair"
+
+def _bulk_chunk(records, options):
+    """
+    Generate the schedules of a chunk of pair records (runs in a worker process).
+    
+    Parameters:
+    - records: List of dictionaries from read_pair_records
+    - options: Dictionary with the defaults 'days', 'start_date', 'frequency_band',
+      'tone_mode' and 'windows', the optional 'seeds' (seed_registry.SeedRegistry),
+      plus 'output_dir', 'output', 'tz' and the optional 'compress' suffix ('.gz',
+      '.xz' or '.zst') for per-pair files
+    
+    Returns:
+    - List of (ok, JSONL line) tuples, one per record and in the same order
+    """
+    lines = []
+    for record in records:
+        pair_id = record['pair_id']
+        try:
+            if 'error' in record:
+                raise ValueError(record['error'])
             
-            f.write(f"{day:2d} | {morning['time']:13s} | Ch {morning['channel']:2d} | {morning['frequency']:8s} | {morning['ctcss']:5.1f} | ")
-            f.write(f"{afternoon['time']:13s} | Ch {afternoon['channel']:2d} | {afternoon['frequency']:8s} | {afternoon['ctcss']:5.1f} | ")
-            f.write(f"{evening['time']:13s} | Ch {evening['channel']:2d} | {evening['frequency']:8s} | {evening['ctcss']:5.1f}\n")
-        
-        f.write("\n## Emergency Quick-Connect Times ##\n")
-        for i, qc in enumerate(meta['quick_connect_times'], 1):
-            f.write(f"Quick Connect {i}: {qc['time']} on Channel {qc['channel']} ({qc['frequency']} MHz) with CTCSS {qc['ctcss']} Hz\n")
-        
-        f.write("\n## Backup Protocol ##\n")
-        f.write(f"If no contact after three complete cycles ({meta['cycle_days'] * 3} days):\n")
-        f.write("1. Try the top of each hour for 5 minutes for 24 hours\n")
-        f.write("2. Use Channel 1 (462.5625 MHz) with CTCSS 67.0 Hz as the backup channel\n")
-        f.write("3. Return to primary schedule after the 24-hour attempt\n")
-        
-        f.write("\n## Notes ##\n")
-        f.write("- Keep transmissions brief (30-60 seconds)\n")
-        f.write("- Listen before transmitting\n")
-        f.write("- If a channel is busy, try the next channel up\n")
-        f.write("- Each transmission window is 5 minutes long\n")
-        f.write("- Use CTCSS tones to reduce interference and ensure privacy\n")
-        f.write("- CHIRP file included for direct radio programming\n")
+            seeds = options.get('seeds')
+            schedule, meta = generate_schedule(
+                seeds.seed(record['user1_dob']) if seeds is not None else record['user1_dob'],
+                seeds.seed(record['user2_dob']) if seeds is not None else record['user2_dob'],
+                int(record.get('days', options['days'])),
+                start_date=datetime.date.fromisoformat(record.get('start_date', options['start_date'])),
+                frequency_band=record.get('frequency_band', options['frequency_band']),
+                tone_mode=record.get('tone_mode', options['tone_mode']),
+                windows=options['windows']
+            )
+            
+            if options['output_dir'] is None:
+                result = {"pair_id": pair_id, **schedule_to_json(schedule, meta)}
+            else:
+                stem = os.path.join(options['output_dir'], _bulk_file_name(pair_id))
+                files = []
+                for suffix, writer in BULK_FILE_FORMATS[options['output']]:
+                    path = stem + suffix + options.get('compress', "")
+                    with open_output(path, newline='') as f:
+                        writer(f, schedule, meta, options)
+                    files.append(path)
+                result = {"pair_id": pair_id, "files": files}
+            lines.append((True, json.dumps(result) + "\n"))
+        except (ValueError, OSError) as e:
+            lines.append((False, json.dumps({"pair_id": pair_id, "error": str(e)}) + "\n"))
+    return lines
+
+def iter_bulk_results(records, options, jobs=1, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Generate schedules for a stream of pair records and yield (ok, JSONL line) tuples in input order.
+    
+    Records are read lazily and sent to the workers in chunks. At most
+    jobs * BULK_TASKS_PER_JOB chunks are in flight at once, so memory use stays
+    bounded however long the input is.
+    
+    Parameters:
+    - records: Iterable of record dictionaries (see read_pair_records)
+    - options: Generation and output options (see _bulk_chunk)
+    - jobs: Number of worker processes; 1 generates in this process
+    - chunk_size: Records per worker task
+    """
+    chunks = iter(lambda: list(itertools.islice(records, chunk_size)), [])
+    
+    if jobs <= 1:
+        for chunk in chunks:
+            yield from _bulk_chunk(chunk, options)
+        return
+    
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        in_flight = collections.deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_bulk_chunk, chunk, options))
+            if len(in_flight) >= jobs * BULK_TASKS_PER_JOB:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def _seed_registry(args):
+    """Keyed seed registry for --seed-passphrase-file/--seed-salt, or None for plain DOB seeds"""
+    if not args.seed_passphrase_file:
+        if args.seed_salt:
+            raise ValueError("--seed-salt needs --seed-passphrase-file")
+        return None
+    import seed_registry
+    return seed_registry.SeedRegistry(seed_registry.read_passphrase(args.seed_passphrase_file), args.seed_salt)
+
+def run_bulk(args):
+    """Run bulk mode for parsed command line arguments and return the process exit code"""
+    if args.days < 1:
+        raise ValueError("--days must be at least 1")
+    if args.jobs < 1:
+        raise ValueError("--jobs must be at least 1")
+    if args.compress == "zst":
+        _zstandard()
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    
+    # Defaults are resolved once here so every worker uses the same start date
+    options = {
+        "days": args.days,
+        "start_date": args.start_date or datetime.date.today().isoformat(),
+        "frequency_band": args.band,
+        "tone_mode": args.tone_mode,
+        "windows": load_window_config(args.windows) if args.windows else None,
+        "seeds": _seed_registry(args),
+        "output_dir": args.output_dir,
+        "output": args.output,
+        "tz": args.tz,
+        "compress": f".{args.compress}" if args.compress else ""
+    }
+    
+    source = sys.stdin if args.bulk == "-" else open_input(args.bulk, newline='')
+    total = failed = 0
+    try:
+        for ok, line in iter_bulk_results(read_pair_records(source, args.input_format), options, args.jobs):
+            total += 1
+            failed += not ok
+            sys.stdout.write(line)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. "| head"); stop quietly like other Unix tools
+        sys.stdout = open(os.devnull, "w")
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    
+    print(f"{total - failed} of {total} schedules generated", file=sys.stderr)
+    return 1 if failed else 0
+
+def split_compression(path):
+    """Split a path into (path without the compression suffix, compression suffix or '')"""
+    for suffix in COMPRESSION_SUFFIXES:
+        if path.lower().endswith(suffix):
+            return path[:-len(suffix)], path[-len(suffix):]
+    return path, ""
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+    return zstandard
+
+def _open_compressed(path, mode, newline):
+    suffix = split_compression(path)[1].lower()
+    if suffix == ".gz":
+        import gzip
+        return gzip.open(path, mode, compresslevel=GZIP_LEVEL, encoding="utf-8", newline=newline)
+    if suffix == ".xz":
+        import lzma
+        return lzma.open(path, mode, preset=XZ_PRESET if "w" in mode else None, encoding="utf-8", newline=newline)
+    if suffix == ".zst":
+        zstandard = _zstandard()
+        return zstandard.open(path, mode, cctx=zstandard.ZstdCompressor(level=ZSTD_LEVEL) if "w" in mode else None,
+                              encoding="utf-8", newline=newline)
+    return open(path, mode, newline=newline)
+
+def open_output(path, newline=None):
+    """
+    Open a text file for writing, compressed when the path ends in .gz, .xz or .zst.
+    
+    Text is streamed through the compressor as it is written, so nothing beyond
+    the compressor's own buffer is held in memory.
+    """
+    return _open_compressed(path, "wt", newline)
+
+def open_input(path, newline=None):
+    """Open a text file for reading, decompressing it when the path ends in .gz, .xz or .zst"""
+    return _open_compressed(path, "rt", newline)
+
+def write_text_schedule(f, schedule, meta):
+    """Write the printable text schedule to an open text file"""
+    f.write("###### EMERGENCY TRANSMISSION SCHEDULE ######\n")
+    f.write(f"Generated from personal information - {meta['cycle_days']}-Day Rotation\n\n")
+    
+    periods = _day_periods(schedule)
+    tone = "CTCSS" if meta.get('tone_mode', 'ctcss') == 'ctcss' else "TONE"
+    header = "DAY | " + " | ".join(f"{period_label(period).upper()} WINDOW | CHANNEL | FREQUENCY | {tone}" for period in periods)
+    f.write(header + "\n")
+    f.write("-" * max(150, len(header)) + "\n")
+    
+    for day in range(1, len(schedule) + 1):
+        f.write(f"{day:2d} | " + " | ".join(
+            f"{window['time']:13s} | Ch {window['channel']:2d} | {window['frequency']:8s} | {format_tone(window):>5s}"
+            for window in (schedule[day][period] for period in periods)
+        ) + "\n")
+    
+    f.write("\n## Emergency Quick-Connect Times ##\n")
+    for i, qc in enumerate(meta['quick_connect_times'], 1):
+        f.write(f"Quick Connect {i}: {qc['time']} on Channel {qc['channel']} ({qc['frequency']} MHz) with {tone_label(qc)}\n")
+    
+    f.write("\n## Backup Protocol ##\n")
+    f.write(f"If no contact after three complete cycles ({meta['cycle_days'] * 3} days):\n")
+    f.write("1. Try the top of each hour for 5 minutes for 24 hours\n")
+    f.write("2. Use Channel 1 (462.5625 MHz) with CTCSS 67.0 Hz as the backup channel\n")
+    f.write("3. Return to primary schedule after the 24-hour attempt\n")
+    
+    f.write("\n## Notes ##\n")
+    f.write("- Keep transmissions brief (30-60 seconds)\n")
+    f.write("- Listen before transmitting\n")
+    f.write("- If a channel is busy, try the next channel up\n")
+    f.write(f"- {_duration_note(schedule)}\n")
+    f.write("- Use CTCSS tones to reduce interference and ensure privacy\n")
+    f.write("- CHIRP file included for direct radio programming\n")
+
+def _duration_note(schedule):
+    durations = sorted({end - start for day in schedule.values() for start, end in
+                        (window_minutes(window['time']) for window in day.values())})
+    if len(durations) == 1:
+        return f"Each transmission window is {durations[0]} minutes long"
+    return f"Transmission windows are {durations[0]} to {durations[-1]} minutes long"
+
+def output_text_file(schedule, meta):
+    """Output the schedule to a text file"""
+    with open("emergency_schedule.txt", "w") as f:
+        write_text_schedule(f, schedule, meta)
     
     print(f"Text schedule saved to emergency_schedule.txt")
 
+# Columns written for every window, prefixed with its label (e.g. 'Morning Time')
+CSV_WINDOW_COLUMNS = ['Time', 'Channel', 'Frequency', 'CTCSS']
+
+def _csv_tone(entry):
+    # CTCSS-only schedules keep the plain number in the CTCSS columns
+    return entry['ctcss'] if entry.get('dcs') is None else format_tone(entry)
+
+def write_csv_schedule(f, schedule, meta):
+    """Write the schedule as CSV to an open text file"""
+    periods = _day_periods(schedule)
+    labels = [period_label(period) for period in periods]
+    
+    writer = csv.writer(f)
+    writer.writerow(['Day'] + [f"{label} {column}" for label in labels for column in CSV_WINDOW_COLUMNS])
+    for day in range(1, len(schedule) + 1):
+        row = [day]
+        for period in periods:
+            window = schedule[day][period]
+            row += [window['time'], window['channel'], window['frequency'], _csv_tone(window)]
+        writer.writerow(row)
+
+def write_csv_quick_connect(f, meta):
+    """Write the quick-connect and backup information as CSV to an open text file"""
+    fieldnames = ['Type', 'Time', 'Channel', 'Frequency', 'CTCSS', 'Notes']
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    
+    writer.writeheader()
+    writer.writerow({
+        'Type': 'Quick Connect 1',
+        'Time': meta['quick_connect_times'][0]['time'],
+        'Channel': meta['quick_connect_times'][0]['channel'],
+        'Frequency': meta['quick_connect_times'][0]['frequency'],
+        'CTCSS': _csv_tone(meta['quick_connect_times'][0]),
+        'Notes': 'Check at minutes past any hour'
+    })
+    writer.writerow({
+        'Type': 'Quick Connect 2',
+        'Time': meta['quick_connect_times'][1]['time'],
+        'Channel': meta['quick_connect_times'][1]['channel'],
+        'Frequency': meta['quick_connect_times'][1]['frequency'],
+        'CTCSS': _csv_tone(meta['quick_connect_times'][1]),
+        'Notes': 'Check at minutes past any hour'
+    })
+    writer.writerow({
+        'Type': 'Backup Protocol',
+        'Time': 'XX:00',
+        'Channel': 1,
+        'Frequency': '462.5625',
+        'CTCSS': 67.0,
+        'Notes': f'If no contact after {meta["cycle_days"] * 3} days'
+    })
+
 def output_csv_file(schedule, meta):
     """Output the schedule to a CSV file"""
     with open("emergency_schedule.csv", "w", newline='') as csvfile:
-        fieldnames = [
-            'Day', 'Morning Time', 'Morning Channel', 'Morning Frequency', 'Morning CTCSS',
-            'Afternoon Time', 'Afternoon Channel', 'Afternoon Frequency', 'Afternoon CTCSS',
-            'Evening Time', 'Evening Channel', 'Evening Frequency', 'Evening CTCSS'
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for day in range(1, len(schedule) + 1):
-            writer.writerow({
-                'Day': day,
-                'Morning Time': schedule[day]['morning']['time'],
-                'Morning Channel': schedule[day]['morning']['channel'],
-                'Morning Frequency': schedule[day]['morning']['frequency'],
-                'Morning CTCSS': schedule[day]['morning']['ctcss'],
-                'Afternoon Time': schedule[day]['afternoon']['time'],
-                'Afternoon Channel': schedule[day]['afternoon']['channel'],
-                'Afternoon Frequency': schedule[day]['afternoon']['frequency'],
-                'Afternoon CTCSS': schedule[day]['afternoon']['ctcss'],
-                'Evening Time': schedule[day]['evening']['time'],
-                'Evening Channel': schedule[day]['evening']['channel'],
-                'Evening Frequency': schedule[day]['evening']['frequency'],
-                'Evening CTCSS': schedule[day]['evening']['ctcss']
-            })
+        write_csv_schedule(csvfile, schedule, meta)
     
     # Write emergency info to a separate CSV
     with open("emergency_quick_connect.csv", "w", newline='') as csvfile:
-        fieldnames = ['Type', 'Time', 'Channel', 'Frequency', 'CTCSS', 'Notes']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        writer.writerow({
-            'Type': 'Quick Connect 1',
-            'Time': meta['quick_connect_times'][0]['time'],
-            'Channel': meta['quick_connect_times'][0]['channel'],
-            'Frequency': meta['quick_connect_times'][0]['frequency'],
-            'CTCSS': meta['quick_connect_times'][0]['ctcss'],
-            'Notes': 'Check at minutes past any hour'
-        })
-        writer.writerow({
-            'Type': 'Quick Connect 2',
-            'Time': meta['quick_connect_times'][1]['time'],
-            'Channel': meta['quick_connect_times'][1]['channel'],
-            'Frequency': meta['quick_connect_times'][1]['frequency'],
-            'CTCSS': meta['quick_connect_times'][1]['ctcss'],
-            'Notes': 'Check at minutes past any hour'
-        })
-        writer.writerow({
-            'Type': 'Backup Protocol',
-            'Time': 'XX:00',
-            'Channel': 1,
-            'Frequency': '462.5625',
-            'CTCSS': 67.0,
-            'Notes': f'If no contact after {meta["cycle_days"] * 3} days'
-        })
+        write_csv_quick_connect(csvfile, meta)
     
     print(f"CSV schedule saved to emergency_schedule.csv and emergency_quick_connect.csv")
 
-def output_chirp_file(schedule, meta, file_path="emergency_schedule.chirp"):
-    """Output the schedule to a CHIRP compatible file"""
+def _add_chirp_memory(root, number, name, frequency, ctcss, comment, dcs=None):
+    import xml.etree.ElementTree as ET
+    memory = ET.SubElement(root, "memory")
+    ET.SubElement(memory, "number").text = str(number)
+    ET.SubElement(memory, "name").text = name
+    ET.SubElement(memory, "frequency").text = frequency
+    if dcs is None:
+        # CTCSS tone squelch on transmit and receive
+        ET.SubElement(memory, "tmode").text = "TSQL"
+        ET.SubElement(memory, "ctone").text = str(ctcss)
+        ET.SubElement(memory, "rtone").text = str(ctcss)
+    elif ctcss is None:
+        # DCS on transmit and receive
+        ET.SubElement(memory, "tmode").text = "DTCS"
+        ET.SubElement(memory, "dtcs").text = f"{dcs:03d}"
+        ET.SubElement(memory, "rx_dtcs").text = f"{dcs:03d}"
+        ET.SubElement(memory, "dtcs_polarity").text = "NN"
+    else:
+        # Split tone: transmit the CTCSS tone, squelch on the DCS code
+        ET.SubElement(memory, "tmode").text = "Cross"
+        ET.SubElement(memory, "cross_mode").text = "Tone->DTCS"
+        ET.SubElement(memory, "rtone").text = str(ctcss)
+        ET.SubElement(memory, "rx_dtcs").text = f"{dcs:03d}"
+        ET.SubElement(memory, "dtcs_polarity").text = "NN"
+    ET.SubElement(memory, "comment").text = comment
+
+def write_chirp_schedule(f, schedule, meta):
+    """Write the schedule as CHIRP compatible XML to an open text file"""
+    # The XML modules are only loaded when a CHIRP file is written, which keeps
+    # the import of this module cheap for the lite profile and the daemon client
+    import xml.etree.ElementTree as ET
+    import xml.dom.minidom as minidom
+    
     # Create the root element
     root = ET.Element("memories", version="1.0")
     
     # Add memory entries for each scheduled transmission
     memory_count = 1
     
+    # Memory names use the window's initial (D1M, D1A, D1E) while those are
+    # unique, and its position (D1W1, D1W2, ...) otherwise
+    periods = _day_periods(schedule)
+    initials = [period_label(period)[0] for period in periods]
+    if len(set(initials)) != len(initials):
+        initials = [f"W{i}" for i in range(1, len(periods) + 1)]
+    
     # Add normal schedule channels
     for day in range(1, len(schedule) + 1):
-        # Morning channel
-        morning = schedule[day]['morning']
-        morning_memory = ET.SubElement(root, "memory")
-        ET.SubElement(morning_memory, "number").text = str(memory_count)
-        ET.SubElement(morning_memory, "name").text = f"D{day}M"
-        ET.SubElement(morning_memory, "frequency").text = morning['frequency']
-        ET.SubElement(morning_memory, "tmode").text = "TSQL"
-        ET.SubElement(morning_memory, "ctone").text = str(morning['ctcss'])
-        ET.SubElement(morning_memory, "rtone").text = str(morning['ctcss'])
-        ET.SubElement(morning_memory, "comment").text = f"Day {day} Morning {morning['time']}"
-        memory_count += 1
-        
-        # Afternoon channel
-        afternoon = schedule[day]['afternoon']
-        afternoon_memory = ET.SubElement(root, "memory")
-        ET.SubElement(afternoon_memory, "number").text = str(memory_count)
-        ET.SubElement(afternoon_memory, "name").text = f"D{day}A"
-        ET.SubElement(afternoon_memory, "frequency").text = afternoon['frequency']
-        ET.SubElement(afternoon_memory, "tmode").text = "TSQL"
-        ET.SubElement(afternoon_memory, "ctone").text = str(afternoon['ctcss'])
-        ET.SubElement(afternoon_memory, "rtone").text = str(afternoon['ctcss'])
-        ET.SubElement(afternoon_memory, "comment").text = f"Day {day} Afternoon {afternoon['time']}"
-        memory_count += 1
-        
-        # Evening channel
-        evening = schedule[day]['evening']
-        evening_memory = ET.SubElement(root, "memory")
-        ET.SubElement(evening_memory, "number").text = str(memory_count)
-        ET.SubElement(evening_memory, "name").text = f"D{day}E"
-        ET.SubElement(evening_memory, "frequency").text = evening['frequency']
-        ET.SubElement(evening_memory, "tmode").text = "TSQL"
-        ET.SubElement(evening_memory, "ctone").text = str(evening['ctcss'])
-        ET.SubElement(evening_memory, "rtone").text = str(evening['ctcss'])
-        ET.SubElement(evening_memory, "comment").text = f"Day {day} Evening {evening['time']}"
-        memory_count += 1
+        for period, initial in zip(periods, initials):
+            window = schedule[day][period]
+            _add_chirp_memory(root, memory_count, f"D{day}{initial}", window['frequency'], window['ctcss'],
+                              f"Day {day} {period_label(period)} {window['time']}", window.get('dcs'))
+            memory_count += 1
     
     # Add emergency quick-connect channels
     for i, qc in enumerate(meta['quick_connect_times'], 1):
-        qc_memory = ET.SubElement(root, "memory")
-        ET.SubElement(qc_memory, "number").text = str(memory_count)
-        ET.SubElement(qc_memory, "name").text = f"QC{i}"
-        ET.SubElement(qc_memory, "frequency").text = qc['frequency']
-        ET.SubElement(qc_memory, "tmode").text = "TSQL"
-        ET.SubElement(qc_memory, "ctone").text = str(qc['ctcss'])
-        ET.SubElement(qc_memory, "rtone").text = str(qc['ctcss'])
-        ET.SubElement(qc_memory, "comment").text = f"Quick Connect {i}: {qc['time']}"
+        _add_chirp_memory(root, memory_count, f"QC{i}", qc['frequency'], qc['ctcss'],
+                          f"Quick Connect {i}: {qc['time']}", qc.get('dcs'))
         memory_count += 1
     
     # Add backup channel
-    backup_memory = ET.SubElement(root, "memory")
-    ET.SubElement(backup_memory, "number").text = str(memory_count)
-    ET.SubElement(backup_memory, "name").text = "BACKUP"
-    ET.SubElement(backup_memory, "frequency").text = "462.5625"
-    ET.SubElement(backup_memory, "tmode").text = "TSQL"
-    ET.SubElement(backup_memory, "ctone").text = "67.0"
-    ET.SubElement(backup_memory, "rtone").text = "67.0"
-    ET.SubElement(backup_memory, "comment").text = "Backup channel - top of hour"
-    
-    # Create XML tree and save to file
-    tree = ET.ElementTree(root)
+    _add_chirp_memory(root, memory_count, "BACKUP", "462.5625", "67.0", "Backup channel - top of hour")
     
     # Pretty print the XML
     xml_string = ET.tostring(root, encoding='unicode')
-    pretty_xml = minidom.parseString(xml_string).toprettyxml(indent="  ")
-    
-    with open(file_path, "w") as f:
-        f.write(pretty_xml)
+    f.write(minidom.parseString(xml_string).toprettyxml(indent="  "))
+
+def output_chirp_file(schedule, meta, file_path="emergency_schedule.chirp"):
+    """Output the schedule to a CHIRP compatible file"""
+    with open_output(file_path) as f:
+        write_chirp_schedule(f, schedule, meta)
     
     print(f"CHIRP file saved to {file_path}")
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Generate an emergency transmission schedule based on dates of birth')
-    parser.add_argument('user1_dob', help='First user\'s date of birth in format YYYY-MM-DD')
-    parser.add_argument('user2_dob', help='Second user\'s date of birth in format YYYY-MM-DD')
+def _ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ics_line(f, line):
+    """Write one content line, folded at 75 octets as RFC 5545 requires"""
+    data = line.encode('utf-8')
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        # Never split a multi-byte character
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        f.write(data[:cut].decode('utf-8') + "\r\n ")
+        data = data[cut:]
+        # Continuation lines start with a space, which counts towards the limit
+        limit = 74
+    f.write(data.decode('utf-8') + "\r\n")
+
+def _ics_event(f, uid, stamp, start, end, summary, description, rrule=None):
+    _ics_line(f, "BEGIN:VEVENT")
+    _ics_line(f, f"UID:{uid}@emergency-scheduler")
+    _ics_line(f, f"DTSTAMP:{stamp}")
+    _ics_line(f, f"DTSTART:{start}")
+    _ics_line(f, f"DTEND:{end}")
+    if rrule:
+        _ics_line(f, f"RRULE:{rrule}")
+    _ics_line(f, "SUMMARY:" + _ics_escape(summary))
+    _ics_line(f, "DESCRIPTION:" + _ics_escape(description))
+    _ics_line(f, "END:VEVENT")
+
+def write_ics_schedule(f, schedule, meta, start_date=None, cycles=1, tz=None):
+    """
+    Write the schedule as an iCalendar file to an open text file.
+    
+    Every window becomes one VEVENT, repeated once per rotation with a DAILY rule
+    when cycles > 1. The hourly quick-connect slots are single events with an
+    HOURLY rule instead of one event per hour. Times are floating local times.
+    
+    With a time zone, every window is written as an absolute UTC time taken from
+    schedule_timezone.materialize_utc, one event per rotation, so windows stay
+    on their local time across DST changes.
+    
+    Parameters:
+    - f: Text file opened with newline='' (lines end in CRLF)
+    - schedule: Dictionary containing the schedule
+    - meta: Dictionary containing metadata
+    - start_date: Date of day 1 (defaults to meta['start_date'])
+    - cycles: Number of rotations the calendar covers
+    - tz: IANA time zone name the schedule times are local to (optional)
+    """
+    if start_date is None:
+        start_date = datetime.date.fromisoformat(meta['start_date'])
+    
+    cycle_days = len(schedule)
+    uid_prefix = f"{meta.get('seed', 0)}-{start_date.strftime('%Y%m%d')}"
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    last_date = start_date + datetime.timedelta(days=cycle_days * cycles - 1)
+    
+    _ics_line(f, "BEGIN:VCALENDAR")
+    _ics_line(f, "VERSION:2.0")
+    _ics_line(f, "PRODID:-//Emergency Transmission Scheduler//EN")
+    _ics_line(f, "CALSCALE:GREGORIAN")
+    _ics_line(f, f"X-WR-CALNAME:Emergency Transmission Schedule ({cycle_days}-Day Rotation)")
+    
+    if tz is None:
+        for day in range(1, cycle_days + 1):
+            current_date = start_date + datetime.timedelta(days=day - 1)
+            midnight = datetime.datetime.combine(current_date, datetime.time())
+            
+            for period, window in schedule[day].items():
+                start_minute, end_minute = window_minutes(window['time'])
+                start = midnight + datetime.timedelta(minutes=start_minute)
+                end = midnight + datetime.timedelta(minutes=end_minute)
+                
+                _ics_event(
+                    f, f"{uid_prefix}-d{day}-{period}", stamp,
+                    start.strftime('%Y%m%dT%H%M%S'), end.strftime('%Y%m%dT%H%M%S'),
+                    f"{period_label(period)} window - Ch {window['channel']}",
+                    f"Day {day} {period_label(period)} {window['time']}\n"
+                    f"Channel {window['channel']}, {window['frequency']} MHz, {tone_label(window)}",
+                    f"FREQ=DAILY;INTERVAL={cycle_days};COUNT={cycles}" if cycles > 1 else None
+                )
+    else:
+        import schedule_timezone
+        timeline = schedule_timezone.materialize_utc(schedule, start_date, tz, cycles)
+        
+        def utc_text(seconds):
+            return datetime.datetime.fromtimestamp(int(seconds), datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        
+        for i in range(len(timeline["start"])):
+            day = int(timeline["day"][i])
+            period = timeline["periods"][timeline["period"][i]]
+            window = schedule[day][period]
+            uid = f"{uid_prefix}-d{day}-{period}"
+            if cycles > 1:
+                uid += f"-c{int(timeline['cycle'][i]) + 1}"
+            
+            _ics_event(
+                f, uid, stamp, utc_text(timeline["start"][i]), utc_text(timeline["end"][i]),
+                f"{period_label(period)} window - Ch {window['channel']}",
+                f"Day {day} {period_label(period)} {window['time']} ({timeline['zone']})\n"
+                f"Channel {window['channel']}, {window['frequency']} MHz, {tone_label(window)}"
+            )
+    
+    # Quick-connect slots recur every hour until the end of the covered rotations
+    until = datetime.datetime.combine(last_date, datetime.time(23, 59, 59))
+    for i, qc in enumerate(meta['quick_connect_times'], 1):
+        minute = int(qc['time'].split(':')[1])
+        start = datetime.datetime.combine(start_date, datetime.time(0, minute))
+        end = start + datetime.timedelta(minutes=5)
+        
+        if tz is None:
+            times = [moment.strftime('%Y%m%dT%H%M%S') for moment in (start, end, until)]
+        else:
+            # The minute past the hour is fixed in UTC too, so an hourly rule stays correct across DST
+            zone = schedule_timezone.resolve_zone(tz)
+            times = [
+                moment.replace(tzinfo=zone).astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+                for moment in (start, end, until)
+            ]
+        
+        _ics_event(
+            f, f"{uid_prefix}-qc{i}", stamp, times[0], times[1],
+            f"Quick Connect {i} - Ch {qc['channel']}",
+            f"Quick Connect {i}: {qc['time']}\n"
+            f"Channel {qc['channel']}, {qc['frequency']} MHz, {tone_label(qc)}",
+            f"FREQ=HOURLY;UNTIL={times[2]}"
+        )
+    
+    _ics_line(f, "END:VCALENDAR")
+
+def output_ics_file(schedule, meta, file_path="emergency_schedule.ics", start_date=None, cycles=1, tz=None):
+    """Output the schedule to an iCalendar file"""
+    with open_output(file_path, newline='') as f:
+        write_ics_schedule(f, schedule, meta, start_date=start_date, cycles=cycles, tz=tz)
+    
+    print(f"iCalendar file saved to {file_path}")
+
+def build_parser(prog=None):
+    """Build the command line parser for a single schedule"""
+    parser = argparse.ArgumentParser(prog=prog, description='Generate an emergency transmission schedule based on dates of birth')
+    parser.add_argument('user1_dob', nargs='?', help='First user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('user2_dob', nargs='?', help='Second user\'s date of birth in format YYYY-MM-DD')
     parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
-    parser.add_argument('--output', choices=['text', 'csv', 'chirp', 'all'], default='all', help='Output format (default: all)')
+    parser.add_argument('--output', choices=['text', 'csv', 'chirp', 'ics', 'json', 'all'], default='all',
+                        help='Output format (default: all); json is only available for --bulk --output-dir')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', choices=list(FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+    parser.add_argument('--tone-mode', choices=list(TONE_MODES), default='ctcss',
+                        help='Squelch tones: CTCSS, DCS or split CTCSS transmit / DCS receive (default: ctcss)')
+    parser.add_argument('--windows', metavar='JSON', help='JSON file with the daily windows (name, start, end, granularity, duration)')
+    parser.add_argument('--tz', help='Time zone the schedule is local to, e.g. Europe/Berlin; the ICS export then uses UTC times')
+    parser.add_argument('--store', metavar='DATABASE', help='Also save the schedule to this SQLite schedule store')
+    parser.add_argument('--pair-id', help='Pair id used in the schedule store (default: USER1_DOB_USER2_DOB)')
+    parser.add_argument('--seed-passphrase-file', metavar='FILE',
+                        help='Derive the seeds from the DOBs with a passphrase (first line of FILE) and --seed-salt; '
+                        'everyone sharing a schedule needs the same passphrase and salt')
+    parser.add_argument('--seed-salt', help='Salt for --seed-passphrase-file')
+    
+    parser.add_argument('--daemon', action='store_true',
+                        help='Run in a warm background daemon, started by the first call that asks for it '
+                        '(also set by the PMRS_DAEMON environment variable); see schedule_daemon.py')
+    
+    parser.add_argument('--startup-report', action='store_true',
+                        help='Generate without writing any files and print import times and time to the first window as JSON')
+    parser.add_argument('--startup-report-file', metavar='FILE',
+                        help='Write the --startup-report JSON to FILE instead (implies --startup-report)')
+    
+    bulk = parser.add_argument_group('bulk mode', 'Generate one schedule per record of a CSV or JSONL file instead of a single pair')
+    bulk.add_argument('--bulk', metavar='FILE', help='Pair records (user1_dob, user2_dob, optional pair_id, days, start_date, '
+                      'frequency_band, tone_mode); - reads standard input')
+    bulk.add_argument('--input-format', choices=['csv', 'jsonl'], help='Format of the bulk input (default: detect from the first line)')
+    bulk.add_argument('--output-dir', metavar='DIR', help='Write per-pair files in --output format here; '
+                      'default is one JSON schedule per line on standard output')
+    bulk.add_argument('--compress', choices=['gz', 'xz', 'zst'],
+                      help='Compress the per-pair files (zst needs the zstandard package); a FILE ending in .gz, .xz '
+                      'or .zst is decompressed automatically')
+    bulk.add_argument('--jobs', type=int, default=1, help='Number of worker processes (default: 1)')
+    return parser
+
+def run_startup_report(args):
+    """
+    Measure a cold start for --startup-report: generate a schedule (sample DOBs if
+    none are given), find the next window and render the CHIRP export in memory,
+    then write the startup_report JSON. Returns the process exit code.
+    """
+    import io
+    import startup_report
+    startup_report.start()  # no-op when the hook went in at the top of this module
+    startup_report.mark("main")
+    
+    started = time.perf_counter()
+    start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else datetime.date.today()
+    schedule, meta = generate_schedule(args.user1_dob or "1990-01-01", args.user2_dob or "1985-05-05", args.days,
+                                       start_date=start_date, frequency_band=args.band, tone_mode=args.tone_mode,
+                                       windows=load_window_config(args.windows) if args.windows else None)
+    generate_ms = (time.perf_counter() - started) * 1000
+    find_next_window(schedule, start_date)
+    startup_report.mark("first_window")
+    
+    started = time.perf_counter()
+    write_chirp_schedule(io.StringIO(), schedule, meta)
+    chirp_ms = (time.perf_counter() - started) * 1000
+    startup_report.mark("chirp_rendered")
     
-    args = parser.parse_args()
+    phases = {
+        "band_table_ms": round(_band_table_seconds * 1000, 3),
+        "generate_ms": round(generate_ms, 3),
+        "chirp_render_ms": round(chirp_ms, 3)
+    }
+    if not args.startup_report_file:
+        startup_report.print_report("schedule_generator_chirp", phases)
+    else:
+        with open(args.startup_report_file, "w") as f:
+            startup_report.print_report("schedule_generator_chirp", phases, f=f)
+    return 0
+
+def main(argv=None, prog=None, forward=True):
+    """
+    Run the command line interface and return the process exit code.
+    
+    With --daemon, or PMRS_DAEMON set in the environment, the command line is
+    forwarded to schedule_daemon and runs there; forward=False (as the daemon
+    itself passes) always runs it in this process.
+    """
+    parser = build_parser(prog)
+    args = parser.parse_args(argv)
+    
+    if forward and (args.daemon or os.environ.get("PMRS_DAEMON")):
+        import schedule_daemon
+        return schedule_daemon.forward(sys.argv[1:] if argv is None else argv)
+    if args.startup_report or args.startup_report_file:
+        try:
+            return run_startup_report(args)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    if args.bulk:
+        try:
+            return run_bulk(args)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    if args.user1_dob is None or args.user2_dob is None:
+        parser.error("user1_dob and user2_dob are required unless --bulk is given")
+    if args.output == 'json':
+        parser.error("--output json is only available in bulk mode with --output-dir")
     
     try:
         user1_dob = args.user1_dob
@@ -514,12 +1467,35 @@ if __name__ == "__main__":
         days = args.days
         output_format = args.output
         
-        schedule, meta = generate_schedule(user1_dob, user2_dob, days, output_format)
+        # A time zone only changes the ICS export, which is written here instead
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+        seeds = _seed_registry(args)
+        schedule, meta = generate_schedule(seeds.seed(user1_dob) if seeds is not None else user1_dob,
+                                           seeds.seed(user2_dob) if seeds is not None else user2_dob, days, start_date=start_date,
+                                           output_format=None if args.tz and output_format == 'ics' else output_format,
+                                           frequency_band=args.band, tone_mode=args.tone_mode,
+                                           windows=load_window_config(args.windows) if args.windows else None)
+        if args.tz and output_format == 'ics':
+            output_ics_file(schedule, meta, tz=args.tz)
         print(f"Emergency schedule successfully generated with {days} days in rotation.")
-        print(f"This schedule uses {len(set(day[period]['channel'] for day in schedule.values() for period in day))} different PMRS channels.")
-        print(f"This schedule uses {len(set(day[period]['ctcss'] for day in schedule.values() for period in day))} different CTCSS tones.")
-        print(f"Total memory channels in CHIRP file: {days * 3 + 3}")
+        print(f"This schedule uses {len(set(day[period]['channel'] for day in schedule.values() for period in day))} different {args.band} channels.")
+        print(f"This schedule uses {len(set(format_tone(day[period]) for day in schedule.values() for period in day))} different {TONE_NAMES[args.tone_mode]}.")
+        print(f"Total memory channels in CHIRP file: {days * len(meta['windows']) + 3}")
+        
+        if args.store:
+            import schedule_store
+            pair_id = args.pair_id or f"{user1_dob}_{user2_dob}"
+            conn = schedule_store.open_store(args.store)
+            schedule_store.store_schedules(conn, [(pair_id, schedule, meta)])
+            conn.close()
+            print(f"Schedule stored as '{pair_id}' in {args.store}")
         
     except ValueError as e:
         print(f"Error: {e}")
         print("Please ensure dates are in the format YYYY-MM-DD")
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
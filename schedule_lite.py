@@ -0,0 +1,174 @@
+import argparse
+import array
+import datetime
+import schedule_generator_chirp as sgc
+
+# The lite profile never imports NumPy and keeps a schedule in a few compact
+# arrays instead of nested dictionaries, for Raspberry Pi Zero class devices.
+
+
+class Window:
+    """A single transmission window on a calendar date"""
+    __slots__ = ("date", "day", "period", "start", "end", "channel", "frequency", "ctcss")
+
+    def __init__(self, date, day, period, start, end, channel, frequency, ctcss):
+        self.date = date
+        self.day = day
+        self.period = period
+        self.start = start
+        self.end = end
+        self.channel = channel
+        self.frequency = frequency
+        self.ctcss = ctcss
+
+    @property
+    def time(self):
+        return f"{self.start.strftime('%H:%M')} - {self.end.strftime('%H:%M')}"
+
+class LiteSchedule:
+    """
+    A schedule stored as flat arrays, one entry per window.
+
+    Window i of day d lives at index (d - 1) * len(periods) + i. Start times are
+    minutes after midnight, tones are indexes into the band's tone list. Window i
+    of every day lasts durations[i] minutes.
+    """
+    __slots__ = ("start_date", "days", "periods", "durations", "starts", "channels", "tone_ids",
+                 "tones", "channel_to_freq", "quick_connect_times")
+
+    def __init__(self, start_date, days, periods, durations, tones, channel_to_freq, quick_connect_times):
+        self.start_date = start_date
+        self.days = days
+        self.periods = periods
+        self.durations = durations
+        self.starts = array.array('H')
+        self.channels = array.array('B')
+        self.tone_ids = array.array('B')
+        self.tones = tones
+        self.channel_to_freq = channel_to_freq
+        self.quick_connect_times = quick_connect_times
+
+    def windows_on(self, date):
+        """Return the windows of a calendar date, following the repeating rotation"""
+        day = (date - self.start_date).days % self.days + 1
+        midnight = datetime.datetime.combine(date, datetime.time())
+        first = (day - 1) * len(self.periods)
+
+        windows = []
+        for i, period in enumerate(self.periods):
+            start = midnight + datetime.timedelta(minutes=self.starts[first + i])
+            channel = self.channels[first + i]
+            windows.append(Window(
+                date, day, period, start, start + datetime.timedelta(minutes=self.durations[i]),
+                channel, self.channel_to_freq[channel], self.tones[self.tone_ids[first + i]]
+            ))
+        windows.sort(key=lambda window: window.start)
+        return windows
+
+    def next_window(self, now=None):
+        """Return (window, active) for the window on the air now or the next one"""
+        if now is None:
+            now = datetime.datetime.now()
+
+        date = max(now.date(), self.start_date)
+        for offset in range(self.days + 1):
+            for window in self.windows_on(date + datetime.timedelta(days=offset)):
+                if window.end > now:
+                    return window, window.start <= now
+        return None, False
+
+def generate_lite(user1_dob, user2_dob, days, start_date=None, frequency_band="PMRS", windows=None):
+    """
+    Generate a schedule without NumPy into a LiteSchedule.
+
+    The windows are identical to those of schedule_generator_chirp.generate_schedule
+    for the same inputs.
+
+    Parameters:
+    - user1_dob: Date of birth for User 1 in the format YYYY-MM-DD, or a sgc.PersonSeed
+    - user2_dob: Date of birth for User 2, likewise
+    - days: Number of days in the rotation cycle
+    - start_date: Starting date for the schedule (datetime.date object)
+    - frequency_band: Frequency band to use ("PMRS", "VLF", "VHF", "UHF", etc.)
+    - windows: List of daily window definitions (see sgc.DEFAULT_WINDOWS)
+
+    Returns:
+    - LiteSchedule
+    """
+    if frequency_band not in sgc.FREQUENCY_BANDS:
+        raise ValueError(f"Unsupported frequency band: {frequency_band}")
+
+    band_config = sgc.FREQUENCY_BANDS[frequency_band]
+    channels = list(band_config["channels"])
+    frequencies = band_config["frequencies"]
+    ctcss_tones = band_config["ctcss_tones"]
+    tone_index = {tone: i for i, tone in enumerate(ctcss_tones)}
+    slot_table = sgc._slot_table(sgc.window_config(windows))
+
+    u1_dob = sgc._person(user1_dob)
+    u2_dob = sgc._person(user2_dob)
+
+    if start_date is None:
+        start_date = datetime.date.today()
+
+    rng, _, channel_to_freq, state = sgc._prepare_generator(
+        u1_dob.hash, u2_dob.hash, days, channels, frequencies, ctcss_tones, slot_table)
+
+    schedule = LiteSchedule(
+        start_date, days, [entry[0] for entry in slot_table], [entry[-1] for entry in slot_table],
+        ctcss_tones, channel_to_freq,
+        sgc._quick_connect_times(u1_dob, u2_dob, channels, ctcss_tones, channel_to_freq)
+    )
+
+    for _, slots in sgc._iter_days(rng, state, 1, days, channels, ctcss_tones, tone_index, slot_table):
+        for _, hour, minute, channel, tone in slots:
+            schedule.starts.append(hour * 60 + minute)
+            schedule.channels.append(channel)
+            schedule.tone_ids.append(tone_index[tone])
+
+    return schedule
+
+def _format_window(window, active=False):
+    marker = " <- ON AIR" if active else ""
+    return (f"  {sgc.period_label(window.period):10s} {window.time}  Ch {window.channel:2d}  "
+            f"{window.frequency:8s}  CTCSS {window.ctcss:5.1f}{marker}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show today\'s and the next transmission window (lightweight, no NumPy)')
+    parser.add_argument('user1_dob', help='First user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('user2_dob', help='Second user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', help='Frequency band (default: PMRS)')
+    parser.add_argument('--windows', metavar='JSON', help='JSON file with the daily windows (name, start, end, granularity, duration)')
+    parser.add_argument('--show', choices=['today', 'next', 'both'], default='both', help='What to show (default: both)')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+        windows = sgc.load_window_config(args.windows) if args.windows else None
+        schedule = generate_lite(args.user1_dob, args.user2_dob, args.days, start_date=start_date,
+                                 frequency_band=args.band, windows=windows)
+        now = datetime.datetime.now()
+        window, active = schedule.next_window(now)
+
+        if args.show in ('today', 'both'):
+            today = now.date()
+            windows = schedule.windows_on(today)
+            print(f"{today.strftime('%Y-%m-%d %A')} (day {windows[0].day} of {schedule.days})")
+            for today_window in windows:
+                print(_format_window(today_window, active and today_window.start == window.start))
+
+        if args.show in ('next', 'both') and window is not None:
+            minutes = int(((window.end if active else window.start) - now).total_seconds() // 60)
+            print(f"{'Now' if active else 'Next'}: {window.date.strftime('%a %Y-%m-%d')} "
+                  f"({'ends' if active else 'starts'} in {minutes // 60} h {minutes % 60:02d} min)")
+            print(_format_window(window, active))
+
+        for i, qc in enumerate(schedule.quick_connect_times, 1):
+            print(f"Quick Connect {i}: {qc['time']} on Channel {qc['channel']} ({qc['frequency']} MHz) with CTCSS {qc['ctcss']} Hz")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
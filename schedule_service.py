@@ -0,0 +1,321 @@
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import datetime
+import io
+import json
+import os
+from urllib.parse import urlsplit, parse_qsl
+import schedule_generator_chirp as sgc
+import schedule_timezone
+
+# Export formats: writer function and content type
+EXPORT_FORMATS = {
+    "txt": (sgc.write_text_schedule, "text/plain; charset=utf-8"),
+    "csv": (sgc.write_csv_schedule, "text/csv; charset=utf-8"),
+    "quick-connect-csv": (lambda f, schedule, meta: sgc.write_csv_quick_connect(f, meta), "text/csv; charset=utf-8"),
+    "chirp": (sgc.write_chirp_schedule, "application/xml; charset=utf-8"),
+    "ics": (sgc.write_ics_schedule, "text/calendar; charset=utf-8")
+}
+
+# Longest rotation one request may ask for (ten years), so a single request cannot tie up a worker
+MAX_DAYS = 3660
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _warm_worker():
+    """Process pool initializer; importing this module already loaded the generator and band tables"""
+    return len(sgc.FREQUENCY_BANDS)
+
+def generate_batch(keys):
+    """
+    Generate a batch of schedules inside a worker process.
+
+    Parameters:
+    - keys: List of (user1_dob, user2_dob, days, start_date, frequency_band, tone_mode)
+      tuples, with start_date as an ISO date string
+
+    Returns:
+    - List of ("ok", (schedule, meta)) or ("error", message) tuples, in the same order;
+      a key that fails never takes the rest of the batch down with it
+    """
+    results = []
+    for user1_dob, user2_dob, days, start_date, frequency_band, tone_mode in keys:
+        try:
+            results.append(("ok", sgc.generate_schedule(
+                user1_dob,
+                user2_dob,
+                days,
+                start_date=datetime.date.fromisoformat(start_date),
+                frequency_band=frequency_band,
+                tone_mode=tone_mode
+            )))
+        except ValueError as e:
+            results.append(("error", str(e)))
+        except Exception as e:
+            results.append(("error", f"Generation failed: {e}"))
+    return results
+
+def request_key(params):
+    """Validate request parameters and turn them into a hashable generation key"""
+    try:
+        user1_dob = params['user1_dob']
+        user2_dob = params['user2_dob']
+    except KeyError as e:
+        raise ValueError(f"Missing parameter: {e.args[0]}")
+    if not isinstance(user1_dob, str) or not isinstance(user2_dob, str):
+        raise ValueError("user1_dob and user2_dob must be YYYY-MM-DD strings")
+
+    try:
+        days = int(params.get('days', 14))
+    except (TypeError, ValueError):
+        raise ValueError(f"days must be a whole number: {params['days']!r}")
+    if not 1 <= days <= MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_DAYS}")
+
+    start_date = params.get('start_date') or datetime.date.today().isoformat()
+    if not isinstance(start_date, str):
+        raise ValueError("start_date must be a YYYY-MM-DD string")
+    datetime.date.fromisoformat(start_date)
+
+    frequency_band = params.get('frequency_band', 'PMRS')
+    if not isinstance(frequency_band, str) or frequency_band not in sgc.FREQUENCY_BANDS:
+        raise ValueError(f"Unsupported frequency band: {frequency_band}")
+
+    tone_mode = params.get('tone_mode', 'ctcss')
+    if tone_mode not in sgc.TONE_MODES:
+        raise ValueError(f"Unsupported tone mode: {tone_mode}")
+
+    return (user1_dob, user2_dob, days, start_date, frequency_band, tone_mode)
+
+def parse_now(now, tz=None):
+    """
+    Parse the reference time of a /next-window request.
+
+    Schedule windows are wall-clock times, so a time with a UTC offset is converted to
+    the pair's time zone (the tz parameter) and compared as local time there.
+
+    Returns:
+    - Naive datetime.datetime object, or None for the current time
+    """
+    if not now:
+        return None
+    if not isinstance(now, str):
+        raise ValueError("now must be an ISO date and time string")
+    now = datetime.datetime.fromisoformat(now)
+    if now.tzinfo is None:
+        return now
+    if not tz:
+        raise ValueError("now has a UTC offset; pass tz as well, or a local time without an offset")
+    return now.astimezone(schedule_timezone.resolve_zone(tz)).replace(tzinfo=None)
+
+class ScheduleService:
+    """
+    Long-running schedule service speaking HTTP/JSON.
+
+    Generation requests are collected for a few milliseconds and sent to a process
+    pool in batches; finished schedules are kept in an LRU cache so repeated lookups
+    and exports for the same pair never reach the pool.
+    """
+
+    def __init__(self, jobs=None, batch_size=32, batch_delay=0.005, cache_size=1024):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.cache_size = cache_size
+        self.cache = collections.OrderedDict()
+        self.pending = {}
+        # Running batch tasks; the event loop only keeps weak references to tasks
+        self.batches = set()
+        self.pool = None
+        self.queue = None
+        self.batcher = None
+
+    async def start(self, host, port):
+        loop = asyncio.get_running_loop()
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs, initializer=_warm_worker)
+        self.queue = asyncio.Queue()
+        self.batcher = asyncio.create_task(self._run_batcher())
+
+        # Start every worker now so the first request does not pay for it
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_worker) for _ in range(self.jobs)))
+
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def generate(self, key):
+        """Return (schedule, meta) for a generation key, from the cache when possible"""
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        # Identical requests already in flight share one generation
+        if key not in self.pending:
+            self.pending[key] = asyncio.get_running_loop().create_future()
+            await self.queue.put(key)
+
+        return await asyncio.shield(self.pending[key])
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            task = loop.create_task(self._run_batch(batch))
+            self.batches.add(task)
+            task.add_done_callback(self.batches.discard)
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.pool, generate_batch, batch)
+        except Exception as e:
+            results = [("error", f"Generation failed: {e}")] * len(batch)
+
+        for key, (status, value) in zip(batch, results):
+            future = self.pending.pop(key)
+            if status == "ok":
+                self.cache[key] = value
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+                future.set_result(value)
+            else:
+                future.set_exception(ValueError(value))
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        if body:
+            data = json.loads(body)
+            if not isinstance(data, dict):
+                raise ValueError("Request body must be a JSON object")
+            params.update(data)
+
+        if url.path == "/health":
+            return 200, "application/json", {"status": "ok", "cached": len(self.cache)}
+
+        if url.path not in ("/generate", "/next-window", "/export"):
+            return 404, "application/json", {"error": f"Unknown endpoint: {url.path}"}
+        if method not in ("GET", "POST"):
+            return 405, "application/json", {"error": f"Method not allowed: {method}"}
+
+        key = request_key(params)
+        schedule, meta = await self.generate(key)
+
+        if url.path == "/generate":
+            return 200, "application/json", sgc.schedule_to_json(schedule, meta)
+
+        if url.path == "/next-window":
+            now = parse_now(params.get('now'), params.get('tz'))
+            found = sgc.find_next_window(schedule, datetime.date.fromisoformat(meta['start_date']), now)
+            return 200, "application/json", {
+                "day": found["day"],
+                "period": found["period"],
+                "date": found["date"].isoformat(),
+                "start": found["start"].isoformat(timespec="minutes"),
+                "end": found["end"].isoformat(timespec="minutes"),
+                "active": found["active"],
+                "window": found["window"],
+                "quick_connect_times": meta["quick_connect_times"]
+            }
+
+        export_format = params.get('format', 'txt')
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        writer, content_type = EXPORT_FORMATS[export_format]
+        output = io.StringIO(newline='')
+        if export_format == "ics" and params.get('tz'):
+            sgc.write_ics_schedule(output, schedule, meta, tz=params['tz'])
+        else:
+            writer(output, schedule, meta)
+        return 200, content_type, output.getvalue()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, content_type, payload = await self._dispatch(method, target, body)
+                except (ValueError, KeyError) as e:
+                    status, content_type, payload = 400, "application/json", {"error": str(e)}
+                except Exception as e:
+                    status, content_type, payload = 500, "application/json", {"error": str(e)}
+
+                if content_type == "application/json":
+                    payload = json.dumps(payload)
+                data = payload.encode('utf-8')
+
+                keep_alive = version == "HTTP/1.1" and headers.get('connection', '').lower() != "close"
+                writer.write(
+                    f"{version} {status} {HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host, port, jobs=None, batch_size=32, batch_delay=0.005, cache_size=1024):
+    """Run the schedule service until cancelled"""
+    service = ScheduleService(jobs=jobs, batch_size=batch_size, batch_delay=batch_delay, cache_size=cache_size)
+    server = await service.start(host, port)
+    print(f"Schedule service listening on http://{host}:{port} with {service.jobs} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve emergency schedules over HTTP/JSON')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--jobs', type=int, default=None, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=32, help='Maximum schedules per worker batch (default: 32)')
+    parser.add_argument('--batch-delay', type=float, default=5.0, help='Milliseconds to wait while filling a batch (default: 5)')
+    parser.add_argument('--cache-size', type=int, default=1024, help='Number of generated schedules kept warm (default: 1024)')
+
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, jobs=args.jobs, batch_size=args.batch_size,
+                          batch_delay=args.batch_delay / 1000, cache_size=args.cache_size))
+    except KeyboardInterrupt:
+        pass
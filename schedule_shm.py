@@ -0,0 +1,274 @@
+import argparse
+import concurrent.futures
+import datetime
+import json
+import math
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import schedule_generator_chirp as sgc
+
+# Block layout:
+#   header   64 bytes: magic, pair count, window count, meta byte count
+#   pairs    PAIR_DTYPE row per schedule: its first window row, days, windows per day, meta slice
+#   windows  WINDOW_DTYPE row per window, by pair, day and window order
+#   meta     per-pair JSON documents ({"pair_id", "meta"}) back to back
+MAGIC = b"PMRSSHM1"
+HEADER = struct.Struct("<8sQQQ")
+HEADER_SIZE = 64
+
+PAIR_DTYPE = np.dtype([
+    ("first", "<i8"), ("days", "<i4"), ("periods", "<i4"), ("meta_offset", "<i8"), ("meta_length", "<i8")
+])
+WINDOW_DTYPE = np.dtype([
+    ("start", "<i2"), ("end", "<i2"), ("channel", "<i2"), ("dcs", "<i2"), ("ctcss", "<f8"), ("frequency", "S16")
+])
+
+# Schedules generated per worker task by generate_blocks
+PAIRS_PER_BLOCK = 64
+
+
+def _block_size(pairs, windows, meta_bytes):
+    return HEADER_SIZE + pairs * PAIR_DTYPE.itemsize + windows * WINDOW_DTYPE.itemsize + meta_bytes
+
+def _views(buf, pairs, windows):
+    """numpy views of the pair and window tables of a block (no copies)"""
+    pair_table = np.ndarray((pairs,), dtype=PAIR_DTYPE, buffer=buf, offset=HEADER_SIZE)
+    window_table = np.ndarray((windows,), dtype=WINDOW_DTYPE, buffer=buf,
+                              offset=HEADER_SIZE + pairs * PAIR_DTYPE.itemsize)
+    return pair_table, window_table
+
+def pack_schedules(items):
+    """
+    Write schedules into a new shared memory block.
+
+    The caller (typically a worker process) hands the returned name to a consumer,
+    which takes over the block: see ScheduleBlock. The producer's own handle is
+    closed before returning, and the block stays alive until the consumer
+    releases it. Only the consumer registers the block with the resource tracker,
+    so a block handed over between processes is neither reported as leaked nor
+    unlinked twice.
+
+    Parameters:
+    - items: List of (pair_id, schedule, meta) tuples
+
+    Returns:
+    - Name of the shared memory block
+    """
+    rows = []
+    pairs = []
+    blobs = []
+    meta_offset = 0
+    for pair_id, schedule, meta in items:
+        periods = sgc._day_periods(schedule)
+        pairs.append((len(rows), len(schedule), len(periods), meta_offset, 0))
+        for day in range(1, len(schedule) + 1):
+            for period in periods:
+                window = schedule[day][period]
+                start, end = sgc.window_minutes(window['time'])
+                frequency = window['frequency'].encode("ascii")
+                if len(frequency) > WINDOW_DTYPE["frequency"].itemsize:
+                    raise ValueError(f"Frequency too long for a shared memory block: {window['frequency']}")
+                rows.append((start, end, window['channel'],
+                             -1 if window.get('dcs') is None else window['dcs'],
+                             math.nan if window['ctcss'] is None else window['ctcss'],
+                             frequency))
+        blob = json.dumps({"pair_id": pair_id, "meta": meta}, separators=(",", ":")).encode("utf-8")
+        pairs[-1] = pairs[-1][:4] + (len(blob),)
+        blobs.append(blob)
+        meta_offset += len(blob)
+
+    meta_bytes = b"".join(blobs)
+    shm = shared_memory.SharedMemory(create=True, size=_block_size(len(pairs), len(rows), len(meta_bytes)))
+    if os.name == "posix":
+        # The consumer registers the block again when it attaches and unregisters it on release()
+        resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        shm.buf[:HEADER.size] = HEADER.pack(MAGIC, len(pairs), len(rows), len(meta_bytes))
+        pair_table, window_table = _views(shm.buf, len(pairs), len(rows))
+        pair_table[:] = pairs
+        window_table[:] = rows
+        meta_start = HEADER_SIZE + len(pairs) * PAIR_DTYPE.itemsize + len(rows) * WINDOW_DTYPE.itemsize
+        shm.buf[meta_start:meta_start + len(meta_bytes)] = meta_bytes
+        del pair_table, window_table
+    except BaseException:
+        shm.close()
+        if os.name == "posix":
+            resource_tracker.register(shm._name, "shared_memory")
+        shm.unlink()
+        raise
+    shm.close()
+    return shm.name
+
+class ScheduleBlock:
+    """
+    Consumer side of a shared memory block written by pack_schedules.
+
+    'pairs' and 'windows' are numpy views straight into shared memory, so
+    attaching costs the same for one schedule or thousands. schedule(i) builds
+    the usual nested dictionaries of one pair on demand.
+
+    Lifetime: the consumer that attaches owns the block and must call release()
+    (or use the block as a context manager) once done; that detaches and frees
+    it. close() only detaches, for a block another consumer will release. Views
+    taken from 'pairs' or 'windows' must not be used after either call.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.shm = shared_memory.SharedMemory(name=name)
+        magic, pairs, windows, self.meta_bytes = HEADER.unpack(bytes(self.shm.buf[:HEADER.size]))
+        if magic != MAGIC:
+            self.shm.close()
+            raise ValueError(f"Not a schedule block: {name}")
+        self.pairs, self.windows = _views(self.shm.buf, pairs, windows)
+        self.meta_start = HEADER_SIZE + pairs * PAIR_DTYPE.itemsize + windows * WINDOW_DTYPE.itemsize
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def close(self):
+        """Detach from the block without freeing it"""
+        if self.shm is None:
+            return
+        # The views hold the buffer; shared memory cannot be closed while they exist
+        self.pairs = self.windows = None
+        self.shm.close()
+
+    def release(self):
+        """Detach from the block and free it"""
+        if self.shm is None:
+            return
+        self.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def pair_windows(self, i):
+        """Window rows of pair i as a (days, windows per day) view"""
+        first, days, periods = int(self.pairs[i]["first"]), int(self.pairs[i]["days"]), int(self.pairs[i]["periods"])
+        return self.windows[first:first + days * periods].reshape(days, periods)
+
+    def record(self, i):
+        """Return (pair_id, meta) of pair i"""
+        offset = self.meta_start + int(self.pairs[i]["meta_offset"])
+        data = json.loads(bytes(self.shm.buf[offset:offset + int(self.pairs[i]["meta_length"])]))
+        meta = data["meta"]
+        meta["channel_frequencies"] = {int(channel): frequency for channel, frequency in meta["channel_frequencies"].items()}
+        return data["pair_id"], meta
+
+    def schedule(self, i):
+        """Return (pair_id, schedule, meta) of pair i as generate_schedule would"""
+        pair_id, meta = self.record(i)
+        periods = [window["name"] for window in meta["windows"]]
+        with_dcs = meta.get("tone_mode", "ctcss") != "ctcss"
+
+        schedule = {}
+        for day, rows in enumerate(self.pair_windows(i).tolist(), 1):
+            schedule[day] = {}
+            for period, (start, end, channel, dcs, ctcss, frequency) in zip(periods, rows):
+                window = {
+                    "time": f"{start // 60:02d}:{start % 60:02d} - {end // 60:02d}:{end % 60:02d}",
+                    "channel": channel,
+                    "frequency": frequency.decode("ascii"),
+                    "ctcss": None if math.isnan(ctcss) else ctcss
+                }
+                if with_dcs:
+                    window["dcs"] = None if dcs < 0 else dcs
+                schedule[day][period] = window
+        return pair_id, schedule, meta
+
+    def schedules(self):
+        """Yield (pair_id, schedule, meta) for every pair in the block"""
+        for i in range(len(self.pairs)):
+            yield self.schedule(i)
+
+def _generate_block(keys):
+    """Worker task: generate a chunk of schedules and return the name of their block"""
+    items = []
+    for pair_id, user1_dob, user2_dob, days, start_date, frequency_band, tone_mode in keys:
+        items.append((pair_id,) + sgc.generate_schedule(
+            user1_dob, user2_dob, days, start_date=datetime.date.fromisoformat(start_date),
+            frequency_band=frequency_band, tone_mode=tone_mode))
+    return pack_schedules(items)
+
+def generate_blocks(keys, jobs=None, pairs_per_block=PAIRS_PER_BLOCK):
+    """
+    Generate schedules in a process pool and hand them back through shared memory.
+
+    Workers return only the block names; nothing but those names is pickled.
+    Blocks are yielded in input order and belong to the caller, who must
+    release() each one.
+
+    Parameters:
+    - keys: List of (pair_id, user1_dob, user2_dob, days, start_date, frequency_band,
+      tone_mode) tuples, with start_date as an ISO date string
+    - jobs: Number of worker processes (default: number of CPUs)
+    - pairs_per_block: Schedules per worker task and block
+    """
+    chunks = [keys[i:i + pairs_per_block] for i in range(0, len(keys), pairs_per_block)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(_generate_block, chunk) for chunk in chunks]
+        handed_over = 0
+        try:
+            for future in futures:
+                block = ScheduleBlock(future.result())
+                handed_over += 1
+                yield block
+        finally:
+            # Free the blocks the caller never received when it stops early
+            for future in futures[handed_over:]:
+                if not future.cancel() and future.exception() is None:
+                    ScheduleBlock(future.result()).release()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare returning schedules from worker processes by pickling and by shared memory')
+    parser.add_argument('pairs_csv', help='CSV with user1_dob, user2_dob and optional pair_id columns')
+    parser.add_argument('--days', type=int, default=90, help='Number of days in the rotation cycle (default: 90)')
+    parser.add_argument('--jobs', type=int, help='Number of worker processes (default: number of CPUs)')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.date.today().isoformat()
+        with open(args.pairs_csv, "r", newline='') as f:
+            keys = [(pair['pair_id'], pair['user1_dob'], pair['user2_dob'], args.days, start_date, "PMRS", "ctcss")
+                    for pair in sgc.read_pairs(f)]
+
+        schedules = [(key[0],) + sgc.generate_schedule(key[1], key[2], args.days,
+                                                       start_date=datetime.date.fromisoformat(start_date))
+                     for key in keys[:PAIRS_PER_BLOCK]]
+
+        # What the receiving process pays per batch: unpickling the nested
+        # dictionaries, or attaching to the block
+        import pickle
+        pickled = pickle.dumps(schedules, protocol=pickle.HIGHEST_PROTOCOL)
+        started = time.perf_counter()
+        pickle.loads(pickled)
+        unpickle_time = time.perf_counter() - started
+
+        name = pack_schedules(schedules)
+        started = time.perf_counter()
+        block = ScheduleBlock(name)
+        attach_time = time.perf_counter() - started
+        block.release()
+        print(f"Receiving {len(schedules)} {args.days}-day schedules: unpickle {unpickle_time * 1000:.2f} ms "
+              f"({len(pickled) // 1024} KB), shared memory attach {attach_time * 1000:.2f} ms")
+
+        started = time.perf_counter()
+        count = 0
+        for block in generate_blocks(keys, args.jobs):
+            with block:
+                count += len(block)
+        print(f"Generated {count} schedules through shared memory in {time.perf_counter() - started:.2f} s")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
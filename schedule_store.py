@@ -0,0 +1,227 @@
+import argparse
+import datetime
+import json
+import sqlite3
+import schedule_generator_chirp as sgc
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pairs (
+    pair_id TEXT PRIMARY KEY,
+    frequency_band TEXT,
+    start_date TEXT,
+    cycle_days INTEGER,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS windows (
+    pair_id TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    end_datetime TEXT NOT NULL,
+    channel INTEGER NOT NULL,
+    frequency TEXT NOT NULL,
+    ctcss REAL,
+    dcs INTEGER
+);
+CREATE INDEX IF NOT EXISTS windows_datetime_channel ON windows (datetime, channel);
+CREATE INDEX IF NOT EXISTS windows_pair_day ON windows (pair_id, day);
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Datetimes are stored as sortable 'YYYY-MM-DD HH:MM' text
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+WINDOW_COLUMNS = ["pair_id", "day", "period", "datetime", "end_datetime", "channel", "frequency", "ctcss", "dcs"]
+
+
+def open_store(path):
+    """Open (and create if needed) a schedule store"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+
+    # Stores created before DCS support have no dcs column
+    if "dcs" not in [row["name"] for row in conn.execute("PRAGMA table_info(windows)")]:
+        conn.execute("ALTER TABLE windows ADD COLUMN dcs INTEGER")
+    return conn
+
+def _window_rows(pair_id, schedule, start_date, cycles, longest):
+    cycle_days = len(schedule)
+
+    # Parse each window's times once; only the dates change between cycles
+    days = []
+    for day in range(1, cycle_days + 1):
+        windows = []
+        for period, window in schedule[day].items():
+            start_minute, end_minute = sgc.window_minutes(window['time'])
+            if end_minute <= start_minute:
+                # The window runs past midnight and ends on the next day
+                end_minute += 1440
+            longest[0] = max(longest[0], end_minute - start_minute)
+            windows.append((
+                period,
+                f" {start_minute // 60:02d}:{start_minute % 60:02d}",
+                f" {end_minute % 1440 // 60:02d}:{end_minute % 60:02d}",
+                end_minute >= 1440,
+                window['channel'],
+                window['frequency'],
+                window['ctcss'],
+                window.get('dcs')
+            ))
+        days.append(windows)
+
+    current_date = start_date
+    for cycle in range(cycles):
+        for day, windows in enumerate(days, 1):
+            date_str = current_date.isoformat()
+            current_date += datetime.timedelta(days=1)
+            for period, start, end, next_day, channel, frequency, ctcss, dcs in windows:
+                end_date_str = current_date.isoformat() if next_day else date_str
+                yield (pair_id, day, period, date_str + start, end_date_str + end, channel, frequency, ctcss, dcs)
+
+def store_schedules(conn, items, cycles=1):
+    """
+    Bulk-insert schedules, replacing any earlier copy of the same pairs.
+
+    Everything is written in one transaction with executemany, so thousands of
+    pairs go in with a single commit.
+
+    Parameters:
+    - conn: Connection returned by open_store
+    - items: Iterable of (pair_id, schedule, meta) tuples; meta needs 'start_date'
+    - cycles: Number of consecutive rotations to materialize for each pair
+
+    Returns:
+    - Number of pairs stored
+    """
+    items = list(items)
+    pair_ids = [(pair_id,) for pair_id, _, _ in items]
+    longest = [int(_store_info(conn, "max_window_minutes", 0))]
+
+    with conn:
+        conn.executemany("DELETE FROM windows WHERE pair_id = ?", pair_ids)
+        conn.executemany(
+            "INSERT OR REPLACE INTO pairs (pair_id, frequency_band, start_date, cycle_days, meta) VALUES (?, ?, ?, ?, ?)",
+            [
+                (pair_id, meta.get('frequency_band'), meta['start_date'], meta['cycle_days'], json.dumps(meta))
+                for pair_id, _, meta in items
+            ]
+        )
+        conn.executemany(
+            f"INSERT INTO windows ({', '.join(WINDOW_COLUMNS)}) VALUES ({', '.join('?' * len(WINDOW_COLUMNS))})",
+            (
+                row
+                for pair_id, schedule, meta in items
+                for row in _window_rows(pair_id, schedule, datetime.date.fromisoformat(meta['start_date']), cycles, longest)
+            )
+        )
+        conn.execute("INSERT OR REPLACE INTO store_info (key, value) VALUES ('max_window_minutes', ?)", (str(longest[0]),))
+
+    return len(items)
+
+def _store_info(conn, key, default=None):
+    row = conn.execute("SELECT value FROM store_info WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else default
+
+def windows_at(conn, at, channel=None):
+    """
+    Find the windows on the air at a given time.
+
+    Parameters:
+    - conn: Connection returned by open_store
+    - at: Time to look up (datetime.datetime object)
+    - channel: Only return windows on this channel
+
+    Returns:
+    - List of sqlite3.Row objects with the window columns
+    """
+    # Only windows starting within the longest window duration before 'at' can
+    # still be open, which keeps the lookup a short range scan of the index
+    lookback = datetime.timedelta(minutes=int(_store_info(conn, "max_window_minutes", 0)))
+    query = f"SELECT {', '.join(WINDOW_COLUMNS)} FROM windows WHERE datetime > ? AND datetime <= ? AND end_datetime > ?"
+    params = [(at - lookback).strftime(DATETIME_FORMAT), at.strftime(DATETIME_FORMAT), at.strftime(DATETIME_FORMAT)]
+    if channel is not None:
+        query += " AND channel = ?"
+        params.append(channel)
+
+    return conn.execute(query + " ORDER BY datetime, channel, pair_id", params).fetchall()
+
+def channel_windows(conn, channel, start, end):
+    """Return every window on a channel starting between start and end (datetime.datetime objects)"""
+    return conn.execute(
+        f"SELECT {', '.join(WINDOW_COLUMNS)} FROM windows WHERE datetime >= ? AND datetime < ? AND channel = ? "
+        "ORDER BY datetime, pair_id",
+        (start.strftime(DATETIME_FORMAT), end.strftime(DATETIME_FORMAT), channel)
+    ).fetchall()
+
+def pair_windows(conn, pair_id, day=None):
+    """Return a pair's stored windows, optionally for one day of the rotation"""
+    query = f"SELECT {', '.join(WINDOW_COLUMNS)} FROM windows WHERE pair_id = ?"
+    params = [pair_id]
+    if day is not None:
+        query += " AND day = ?"
+        params.append(day)
+    return conn.execute(query + " ORDER BY day, datetime", params).fetchall()
+
+def _print_rows(rows):
+    for row in rows:
+        print(f"{row['datetime']} - {row['end_datetime'][11:]} | Ch {row['channel']:2d} | {row['frequency']:8s} | "
+              f"{sgc.format_tone(dict(row)):>5s} | Day {row['day']} {row['period']} | {row['pair_id']}")
+    print(f"{len(rows)} window(s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Store schedules in SQLite and query them')
+    parser.add_argument('database', help='SQLite database file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='Generate and store schedules for a pairs CSV')
+    import_parser.add_argument('pairs_csv', help='CSV file with user1_dob, user2_dob and optional pair_id columns')
+    import_parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+    import_parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    import_parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+    import_parser.add_argument('--cycles', type=int, default=1, help='Number of rotations to store (default: 1)')
+
+    at_parser = subparsers.add_parser('at', help='Show who is on the air at a time')
+    at_parser.add_argument('when', help='Time in format "YYYY-MM-DD HH:MM"')
+    at_parser.add_argument('--channel', type=int, help='Only show this channel')
+
+    channel_parser = subparsers.add_parser('channel', help='Show every window on a channel between two dates')
+    channel_parser.add_argument('channel', type=int, help='Channel number')
+    channel_parser.add_argument('start', help='First date in format YYYY-MM-DD')
+    channel_parser.add_argument('end', help='Last date in format YYYY-MM-DD')
+
+    pair_parser = subparsers.add_parser('pair', help='Show the stored windows of one pair')
+    pair_parser.add_argument('pair_id', help='Pair id')
+    pair_parser.add_argument('--day', type=int, help='Only show this day of the rotation')
+
+    args = parser.parse_args()
+
+    try:
+        conn = open_store(args.database)
+
+        if args.command == 'import':
+            start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+            with open(args.pairs_csv, "r", newline='') as f:
+                items = [
+                    (pair['pair_id'],) + sgc.generate_schedule(pair['user1_dob'], pair['user2_dob'], args.days,
+                                                              start_date=start_date, frequency_band=args.band)
+                    for pair in sgc.read_pairs(f)
+                ]
+            print(f"Stored {store_schedules(conn, items, cycles=args.cycles)} pairs in {args.database}")
+        elif args.command == 'at':
+            _print_rows(windows_at(conn, datetime.datetime.strptime(args.when, DATETIME_FORMAT), args.channel))
+        elif args.command == 'channel':
+            start = datetime.datetime.strptime(args.start, "%Y-%m-%d")
+            end = datetime.datetime.strptime(args.end, "%Y-%m-%d") + datetime.timedelta(days=1)
+            _print_rows(channel_windows(conn, args.channel, start, end))
+        else:
+            _print_rows(pair_windows(conn, args.pair_id, args.day))
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
@@ -0,0 +1,236 @@
+import argparse
+import datetime
+import functools
+import zoneinfo
+import numpy as np
+import schedule_generator_chirp as sgc
+
+# Windows are materialized as int64 seconds since the Unix epoch (UTC)
+EPOCH = datetime.datetime(1970, 1, 1)
+EPOCH_DATE = EPOCH.date()
+DAY_SECONDS = 86400
+
+
+def resolve_zone(tz):
+    """Return a tzinfo for an IANA zone name (tzinfo objects are passed through)"""
+    if isinstance(tz, datetime.tzinfo):
+        return tz
+    try:
+        return zoneinfo.ZoneInfo(tz)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {tz}")
+
+# Offsets are cached per zone and second; pairs sharing a zone and start date
+# then share nearly every lookup
+@functools.lru_cache(maxsize=65536)
+def _local_offset(zone, local_seconds):
+    # Wall-clock times in a DST gap or overlap use fold=0: times in a gap move
+    # forward by the size of the gap, repeated times resolve to the first pass
+    local = EPOCH + datetime.timedelta(seconds=int(local_seconds))
+    return int(local.replace(tzinfo=zone).utcoffset().total_seconds())
+
+@functools.lru_cache(maxsize=65536)
+def _utc_offset(zone, utc_seconds):
+    utc = datetime.datetime.fromtimestamp(int(utc_seconds), datetime.timezone.utc)
+    return int(utc.astimezone(zone).utcoffset().total_seconds())
+
+def _shift_by_day(seconds, offset_at, sign):
+    """
+    Add (sign=1) or subtract (sign=-1) the zone offset of each timestamp.
+
+    Offsets are looked up twice per distinct day, at its first and last second.
+    Only the rare days where the two differ (a DST transition) are converted
+    one timestamp at a time.
+    """
+    seconds = np.asarray(seconds, dtype=np.int64)
+    if seconds.size == 0:
+        return seconds.copy()
+
+    days, inverse = np.unique(seconds // DAY_SECONDS, return_inverse=True)
+    first = np.array([offset_at(day * DAY_SECONDS) for day in days.tolist()], dtype=np.int64)
+    last = np.array([offset_at(day * DAY_SECONDS + DAY_SECONDS - 1) for day in days.tolist()], dtype=np.int64)
+
+    offsets = first[inverse]
+    for i in np.nonzero(first[inverse] != last[inverse])[0].tolist():
+        offsets[i] = offset_at(int(seconds[i]))
+
+    return seconds + sign * offsets
+
+def local_to_utc(local_seconds, tz):
+    """Convert naive wall-clock seconds since the epoch in a zone to UTC seconds"""
+    zone = resolve_zone(tz)
+    return _shift_by_day(local_seconds, lambda s: _local_offset(zone, s), -1)
+
+def utc_to_local(utc_seconds, tz):
+    """Convert UTC seconds since the epoch to naive wall-clock seconds in a zone"""
+    zone = resolve_zone(tz)
+    return _shift_by_day(utc_seconds, lambda s: _utc_offset(zone, s), 1)
+
+def local_display(utc_seconds, tz, unit='m'):
+    """Format UTC seconds as 'YYYY-MM-DD HH:MM' wall-clock strings in a zone (array of str)"""
+    local = utc_to_local(utc_seconds, tz).astype('datetime64[s]')
+    return np.char.replace(np.datetime_as_string(local, unit=unit), 'T', ' ')
+
+def materialize_utc(schedule, start_date, tz, cycles=1):
+    """
+    Materialize every window of a schedule as absolute UTC timestamps.
+
+    The 'HH:MM - HH:MM' strings are parsed once per rotation day; consumers then
+    work on the arrays and never parse them again.
+
+    Parameters:
+    - schedule: Dictionary containing the schedule
+    - start_date: Date of day 1 of the schedule (datetime.date object)
+    - tz: IANA zone name (or tzinfo) the window times are local to
+    - cycles: Number of consecutive rotations to materialize
+
+    Returns:
+    - Dictionary of equally long arrays sorted by start time: 'start' and 'end'
+      (int64 UTC seconds), 'day', 'period' (index into 'periods'), 'channel' and
+      'cycle', plus the 'periods' list, the 'zone' name and the longest window
+      duration in seconds under 'max_duration'
+    """
+    zone = resolve_zone(tz)
+    cycle_days = len(schedule)
+    periods = list(schedule[1])
+    period_index = {period: i for i, period in enumerate(periods)}
+
+    rows = []
+    for day in range(1, cycle_days + 1):
+        for period, window in schedule[day].items():
+            start_minute, end_minute = sgc.window_minutes(window['time'])
+            rows.append((day, period_index[period], start_minute, end_minute, window['channel']))
+    table = np.array(rows, dtype=np.int64).reshape(-1, 5)
+
+    windows = len(table)
+    cycle = np.repeat(np.arange(cycles, dtype=np.int64), windows)
+    day = np.tile(table[:, 0], cycles)
+    date_offset = (start_date - EPOCH_DATE).days + cycle * cycle_days + day - 1
+
+    # Starts and ends are converted in one pass so each day's offsets are looked up once
+    local = np.concatenate([
+        date_offset * DAY_SECONDS + np.tile(table[:, 2], cycles) * 60,
+        date_offset * DAY_SECONDS + np.tile(table[:, 3], cycles) * 60
+    ])
+    utc = local_to_utc(local, zone)
+
+    start = utc[:len(cycle)]
+    order = np.argsort(start, kind='stable')
+    timeline = {
+        "start": start,
+        "end": utc[len(cycle):],
+        "day": day,
+        "period": np.tile(table[:, 1], cycles),
+        "channel": np.tile(table[:, 4], cycles),
+        "cycle": cycle
+    }
+    timeline = {key: values[order] for key, values in timeline.items()}
+
+    timeline["periods"] = periods
+    timeline["zone"] = str(zone)
+    timeline["max_duration"] = int((timeline["end"] - timeline["start"]).max()) if len(order) else 0
+    return timeline
+
+def fleet_timeline(items, cycles=1):
+    """
+    Merge the UTC windows of pairs living in different zones into one timeline.
+
+    Parameters:
+    - items: Iterable of (pair_id, schedule, meta, tz) tuples; meta needs 'start_date'
+    - cycles: Number of rotations to materialize for each pair
+
+    Returns:
+    - Dictionary like materialize_utc, sorted by 'start', with a 'pair' index into
+      the 'pair_ids' list and the longest window duration under 'max_duration'
+    """
+    pair_ids = []
+    parts = []
+    for pair_id, schedule, meta, tz in items:
+        timeline = materialize_utc(schedule, datetime.date.fromisoformat(meta['start_date']), tz, cycles)
+        timeline["pair"] = np.full(len(timeline["start"]), len(pair_ids), dtype=np.int64)
+        pair_ids.append(pair_id)
+        parts.append(timeline)
+
+    merged = {
+        key: np.concatenate([part[key] for part in parts]) if parts else np.empty(0, dtype=np.int64)
+        for key in ("start", "end", "day", "period", "channel", "cycle", "pair")
+    }
+    order = np.argsort(merged["start"], kind='stable')
+    merged = {key: values[order] for key, values in merged.items()}
+
+    merged["pair_ids"] = pair_ids
+    merged["periods"] = parts[0]["periods"] if parts else list(sgc.WINDOW_BLOCKS)
+    merged["max_duration"] = int((merged["end"] - merged["start"]).max()) if len(order) else 0
+    return merged
+
+def _to_seconds(at):
+    if isinstance(at, datetime.datetime):
+        if at.tzinfo is None:
+            raise ValueError("Lookup times must be time zone aware")
+        return int(at.timestamp())
+    return int(at)
+
+def windows_at(timeline, at):
+    """Return the indexes of the windows on the air at 'at' (aware datetime or UTC seconds)"""
+    at = _to_seconds(at)
+    starts = timeline["start"]
+
+    # Only windows starting within the longest duration before 'at' can still be open
+    lo = np.searchsorted(starts, at - timeline["max_duration"], side='right')
+    hi = np.searchsorted(starts, at, side='right')
+    candidates = np.arange(lo, hi)
+    return candidates[timeline["end"][lo:hi] > at]
+
+def next_window(timeline, at):
+    """Return (index, active) of the window on the air at 'at' or the next one, or (None, False)"""
+    active = windows_at(timeline, at)
+    if len(active):
+        return int(active[0]), True
+
+    upcoming = np.searchsorted(timeline["start"], _to_seconds(at), side='right')
+    if upcoming < len(timeline["start"]):
+        return int(upcoming), False
+    return None, False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show a schedule as absolute times in its own and another time zone')
+    parser.add_argument('user1_dob', help='First user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('user2_dob', help='Second user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+    parser.add_argument('--tz', required=True, help='Time zone the schedule times are local to, e.g. Europe/Berlin')
+    parser.add_argument('--display-tz', help='Also show every window in this time zone, e.g. America/New_York')
+    parser.add_argument('--cycles', type=int, default=1, help='Number of rotations to show (default: 1)')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+        schedule, meta = sgc.generate_schedule(args.user1_dob, args.user2_dob, args.days,
+                                               start_date=start_date, frequency_band=args.band)
+        timeline = materialize_utc(schedule, datetime.date.fromisoformat(meta['start_date']), args.tz, args.cycles)
+
+        utc_text = local_display(timeline["start"], datetime.timezone.utc)
+        local_text = local_display(timeline["start"], args.tz)
+        display_text = local_display(timeline["start"], args.display_tz) if args.display_tz else None
+
+        header = f"DAY | PERIOD    | UTC              | {args.tz:16s} | CH"
+        if display_text is not None:
+            header += f" | {args.display_tz}"
+        print(header)
+        print("-" * len(header))
+        for i in range(len(timeline["start"])):
+            line = (f"{timeline['day'][i]:3d} | {timeline['periods'][timeline['period'][i]]:9s} | "
+                    f"{utc_text[i]} | {local_text[i]:16s} | {timeline['channel'][i]:2d}")
+            if display_text is not None:
+                line += f" | {display_text[i]}"
+            print(line)
+
+        index, active = next_window(timeline, datetime.datetime.now(datetime.timezone.utc))
+        if index is not None:
+            print(f"{'Now' if active else 'Next'}: {local_text[index]} {args.tz} (UTC {utc_text[index]})")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
@@ -0,0 +1,126 @@
+import argparse
+import datetime
+import functools
+import hashlib
+import time
+import schedule_generator_chirp as sgc
+
+# PBKDF2-HMAC-SHA256 rounds of the keyed derivation: deliberately slow, which
+# is affordable because every person is derived once per registry
+KDF_ITERATIONS = 600000
+
+
+def _normalize(dob):
+    """The date of a YYYY-MM-DD date of birth, whatever its zero padding"""
+    return sgc.parse_dob(dob).date()
+
+@functools.lru_cache(maxsize=None)
+def _shared_registry(passphrase, salt, iterations):
+    """The registry for these settings in this process; unpickled registries resolve to it"""
+    return SeedRegistry(passphrase, salt, iterations)
+
+class SeedRegistry:
+    """
+    Per-person seed cache for batch and group workloads.
+
+    seed(dob) derives a person's sgc.PersonSeed the first time the DOB is seen
+    and returns the cached one afterwards, so a person who appears in many pairs
+    costs one derivation. Pass the seeds straight to sgc.generate_schedule.
+
+    Without a passphrase the seeds are the usual SHA-256 DOB hashes and the
+    schedules match those generated from the DOBs. With a passphrase and salt
+    each seed comes from PBKDF2-HMAC-SHA256 over the DOB instead, so schedules
+    cannot be reproduced (or DOBs guessed from them) without the passphrase;
+    everyone who shares a schedule must use the same passphrase and salt.
+
+    Pickling a registry (e.g. in bulk mode options sent to workers) sends only
+    its settings: each process keeps one registry per setting and its cache.
+    """
+
+    def __init__(self, passphrase=None, salt=None, iterations=KDF_ITERATIONS):
+        if passphrase is not None and not salt:
+            raise ValueError("A seed passphrase needs a salt")
+        if iterations < 1:
+            raise ValueError("KDF iterations must be at least 1")
+        self.passphrase = passphrase
+        self.salt = salt
+        self.iterations = iterations
+        self.seeds = {}
+
+    def __reduce__(self):
+        return _shared_registry, (self.passphrase, self.salt, self.iterations)
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def __contains__(self, dob):
+        try:
+            return _normalize(dob) in self.seeds
+        except ValueError:
+            return False
+
+    def _derive(self, dob):
+        if self.passphrase is None:
+            return sgc.person_seed(dob.isoformat())
+        key = hashlib.pbkdf2_hmac("sha256", self.passphrase.encode("utf-8"),
+                                  self.salt.encode("utf-8") + b"|" + dob.strftime("%Y%m%d").encode(),
+                                  self.iterations)
+        return sgc.PersonSeed(int.from_bytes(key, "big"), dob.year, dob.month, dob.day)
+
+    def seed(self, dob):
+        """Return the PersonSeed of a YYYY-MM-DD date of birth, deriving it on first use"""
+        # Keyed on the parsed date, so 1990-1-1 and 1990-01-01 are one person
+        dob = _normalize(dob)
+        if dob not in self.seeds:
+            self.seeds[dob] = self._derive(dob)
+        return self.seeds[dob]
+
+    def generate(self, user1_dob, user2_dob, days, **kwargs):
+        """sgc.generate_schedule for two DOBs, with their seeds from this registry"""
+        return sgc.generate_schedule(self.seed(user1_dob), self.seed(user2_dob), days, **kwargs)
+
+def read_passphrase(path):
+    """Read a passphrase from the first line of a file (keeps it off the command line)"""
+    with open(path, "r") as f:
+        passphrase = f.readline().rstrip("\r\n")
+    if not passphrase:
+        raise ValueError(f"No passphrase in {path}")
+    return passphrase
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate a roster with one seed derivation per person and report the timings')
+    parser.add_argument('pairs_csv', help='CSV with user1_dob, user2_dob and optional pair_id columns')
+    parser.add_argument('--days', type=int, default=14, help='Number of days in the rotation cycle (default: 14)')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--passphrase-file', help='File whose first line is the passphrase for keyed seeds')
+    parser.add_argument('--salt', help='Salt for keyed seeds (required with --passphrase-file)')
+    parser.add_argument('--iterations', type=int, default=KDF_ITERATIONS,
+                        help=f'PBKDF2 iterations for keyed seeds (default: {KDF_ITERATIONS})')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+        passphrase = read_passphrase(args.passphrase_file) if args.passphrase_file else None
+        registry = SeedRegistry(passphrase, args.salt, args.iterations)
+        with open(args.pairs_csv, "r", newline='') as f:
+            pairs = list(sgc.read_pairs(f))
+
+        started = time.perf_counter()
+        for pair in pairs:
+            registry.seed(pair['user1_dob'])
+            registry.seed(pair['user2_dob'])
+        derive_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for pair in pairs:
+            registry.generate(pair['user1_dob'], pair['user2_dob'], args.days, start_date=start_date)
+        generate_time = time.perf_counter() - started
+
+        kind = f"keyed (PBKDF2, {args.iterations} iterations)" if passphrase else "plain SHA-256"
+        print(f"{len(pairs)} pairs, {len(registry)} people: {kind} seeds derived in {derive_time:.2f} s "
+              f"({2 * len(pairs) - len(registry)} derivations saved), schedules generated in {generate_time:.2f} s")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")
@@ -0,0 +1,115 @@
+import builtins
+import json
+import sys
+import time
+
+# Startup profiling for --startup-report: start() installs an import hook that
+# times every import which loads new modules, and report() turns the timings
+# into a JSON-ready dictionary. Only the standard library is imported here, so
+# the hook is in place before anything heavy loads.
+
+_original_import = builtins.__import__
+_started = None
+_imports = []
+_stack = []
+_marks = {}
+
+
+def _absolute_name(name, globals_, level):
+    if level == 0 or not globals_:
+        return name
+    package = globals_.get("__package__") or globals_.get("__name__", "")
+    base = package.rsplit(".", level - 1)[0] if level > 1 else package
+    return f"{base}.{name}" if name else base
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Imports of loaded modules take the fast path and are not recorded; a
+    # "from package import submodule" may still load something
+    if level == 0 and not fromlist and name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    absolute = _absolute_name(name, globals, level)
+    pending = [item for item in fromlist or () if f"{absolute}.{item}" not in sys.modules]
+    parent_loaded = absolute in sys.modules
+    loaded = len(sys.modules)
+    _stack.append(0.0)
+    started = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - started
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        if len(sys.modules) > loaded:
+            # Name the submodules a "from package import ..." of a loaded package brought in
+            submodules = [item for item in pending if f"{absolute}.{item}" in sys.modules]
+            label = f"{absolute}.{{{', '.join(submodules)}}}" if parent_loaded and submodules else absolute
+            _imports.append({
+                "module": label,
+                "package": absolute.split(".")[0],
+                "cumulative_ms": round(elapsed * 1000, 3),
+                "self_ms": round((elapsed - children) * 1000, 3),
+                "nested": len(_stack) > 0
+            })
+
+def start():
+    """Start the clock and time imports from here on; later calls do nothing"""
+    global _started
+    if _started is not None:
+        return
+    _started = time.perf_counter()
+    builtins.__import__ = _timed_import
+
+def stop():
+    """Remove the import hook"""
+    builtins.__import__ = _original_import
+
+def elapsed_ms():
+    """Milliseconds since start()"""
+    return round((time.perf_counter() - _started) * 1000, 3)
+
+def mark(name):
+    """Record a named point in time (milliseconds since start())"""
+    _marks[name] = elapsed_ms()
+
+def report(program, phases=None, top=25):
+    """
+    Collect the startup timings.
+
+    Parameters:
+    - program: Name of the program being measured
+    - phases: Dictionary of extra durations in milliseconds
+    - top: Number of modules listed by their own (self) import time
+
+    Returns:
+    - Dictionary with 'program', 'python', 'frozen' (running from a Nuitka or
+      similar build), 'total_ms', 'marks' (ms since start), 'phases', 'packages'
+      (top-level imports with their cumulative ms) and 'modules' (slowest 'top'
+      modules by self time)
+    """
+    packages = {}
+    for entry in _imports:
+        if not entry["nested"]:
+            package = entry["package"]
+            packages[package] = round(packages.get(package, 0) + entry["cumulative_ms"], 3)
+
+    main = sys.modules.get("__main__")
+    return {
+        "program": program,
+        "python": sys.version.split()[0],
+        "frozen": bool(getattr(sys, "frozen", False) or (main is not None and hasattr(main, "__compiled__"))),
+        "total_ms": elapsed_ms(),
+        "marks": dict(_marks),
+        "phases": phases or {},
+        "import_ms": round(sum(entry["cumulative_ms"] for entry in _imports if not entry["nested"]), 3),
+        "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        "modules": [{"module": entry["module"], "self_ms": entry["self_ms"], "cumulative_ms": entry["cumulative_ms"]}
+                    for entry in sorted(_imports, key=lambda entry: -entry["self_ms"])[:top]]
+    }
+
+def print_report(program, phases=None, top=25, f=None):
+    """Print the report as JSON (to standard output by default)"""
+    stop()
+    json.dump(report(program, phases, top), f or sys.stdout, indent=2)
+    (f or sys.stdout).write("\n")
@@ -0,0 +1,109 @@
+import datetime
+import math
+import numpy as np
+import pytest
+import contact_simulator
+import schedule_generator_chirp as sgc
+
+START = datetime.date(2025, 1, 1)
+
+
+def brute_force_first_success(rng, times, probs, earliest, limit=None):
+    """Draw every attempt at or after 'earliest' until one succeeds"""
+    contact = np.full(len(earliest), -1, dtype=np.int64)
+    for trial, begin in enumerate(earliest):
+        attempts = [i for i, time in enumerate(times) if time >= begin]
+        for i in attempts[:limit]:
+            if rng.random() < probs[i]:
+                contact[trial] = times[i]
+                break
+    return contact
+
+def distribution(contact, times):
+    return np.array([np.mean(contact == time) for time in times] + [np.mean(contact == -1)])
+
+@pytest.mark.parametrize("limit", [None, 4])
+def test_first_success_matches_bernoulli_trials(limit):
+    rng = np.random.default_rng(1234)
+    times = np.sort(rng.choice(np.arange(200), size=25, replace=False)).astype(np.int64)
+    probs = rng.uniform(0.02, 0.3, size=len(times))
+    probs[5] = 1.0
+    earliest = rng.integers(0, 220, size=20000)
+
+    fast = contact_simulator._first_success(np.random.default_rng(1), times, contact_simulator._log_survival(probs),
+                                            earliest, limit)
+    brute = brute_force_first_success(np.random.default_rng(2), times, probs, earliest, limit)
+
+    assert set(np.unique(fast)) <= set(times) | {-1}
+    # The contact minute distributions agree within sampling noise (20000 trials: sd below 0.0036)
+    assert np.max(np.abs(distribution(fast, times) - distribution(brute, times))) < 0.015
+    if limit is None:
+        # A certain attempt is never passed over
+        reached = earliest <= times[5]
+        assert np.all((fast[reached] >= 0) & (fast[reached] <= times[5]))
+    assert np.all((fast == -1) | (fast >= earliest))
+
+def test_first_success_is_exact_for_one_trial_start():
+    # Against the geometric-style closed form: P(first success at attempt k)
+    times = np.arange(0, 60, 10, dtype=np.int64)
+    probs = np.array([0.1, 0.2, 0.3, 0.1, 0.5, 0.4])
+    earliest = np.full(100000, 15, dtype=np.int64)
+    contact = contact_simulator._first_success(np.random.default_rng(7), times, contact_simulator._log_survival(probs),
+                                               earliest)
+    survive = 1.0
+    for time, p in zip(times[2:], probs[2:]):
+        assert np.mean(contact == time) == pytest.approx(survive * p, abs=0.006)
+        survive *= 1 - p
+    assert np.mean(contact == -1) == pytest.approx(survive, abs=0.006)
+
+def synthetic_result(delays_by_mechanism, none, delay_limit=3 * 1440):
+    counts = {}
+    for mechanism, delays in delays_by_mechanism.items():
+        counts[mechanism] = np.bincount(np.array(delays, dtype=np.int64), minlength=delay_limit)
+    counts["none"] = np.array([none])
+    trials = sum(len(delays) for delays in delays_by_mechanism.values()) + none
+    return {"trials": trials, "counts": counts, "delay_limit": delay_limit}
+
+def test_summarize_matches_sorted_delays():
+    rng = np.random.default_rng(3)
+    delays = {"window": rng.integers(0, 2000, 700), "quick_connect": rng.integers(0, 300, 200),
+              "backup": rng.integers(3000, 3 * 1440, 60)}
+    stats = contact_simulator.summarize(synthetic_result(delays, none=40), cycle_days=2)
+
+    everything = np.sort(np.concatenate(list(delays.values())))
+    contacted = len(everything)
+    assert stats["within_horizon"] == contacted / 1000
+    assert stats["within_day"] == np.sum(everything < 1440) / 1000
+    assert stats["within_cycle"] == np.sum(everything < 2 * 1440) / 1000
+    assert stats["mean_hours"] == pytest.approx(everything.mean() / 60)
+    for key, q in (("median_hours", 0.5), ("p90_hours", 0.9), ("p99_hours", 0.99)):
+        assert stats[key] == everything[math.ceil(q * contacted) - 1] / 60
+    assert stats["mechanisms"] == {"window": 0.7, "quick_connect": 0.2, "backup": 0.06, "none": 0.04}
+
+def test_summarize_without_contact():
+    stats = contact_simulator.summarize(synthetic_result({"window": [], "quick_connect": [], "backup": []}, none=5), 1)
+    assert stats["within_horizon"] == stats["within_day"] == 0
+    assert stats["mean_hours"] is stats["median_hours"] is stats["p99_hours"] is None
+    assert stats["mechanisms"]["none"] == 1.0
+
+def test_simulate_counts_every_trial_and_ignores_the_worker_count(monkeypatch):
+    monkeypatch.setattr(contact_simulator, "TRIALS_PER_TASK", 3000)
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START)
+
+    one = contact_simulator.simulate(schedule, meta, trials=10000, seed=5, jobs=1)
+    two = contact_simulator.simulate(schedule, meta, trials=10000, seed=5, jobs=2)
+    assert sum(int(counts.sum()) for counts in one["counts"].values()) == 10000
+    for mechanism in contact_simulator.MECHANISMS:
+        assert np.array_equal(one["counts"][mechanism], two["counts"][mechanism])
+    assert one["delay_limit"] == 5 * 7 * 1440
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"busy": 1.5}, "between 0 and 1"),
+    ({"busy": {1: -0.1}}, "between 0 and 1"),
+    ({"hops": -1}, "hops"),
+    ({"cycles": 4}, "cycles must be at least 5"),
+])
+def test_build_model_rejects_bad_parameters(kwargs, message):
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START)
+    with pytest.raises(ValueError, match=message):
+        contact_simulator.build_model(schedule, meta, **kwargs)
@@ -0,0 +1,183 @@
+import copy
+import datetime
+import pytest
+import fleet_scheduler
+import schedule_generator_chirp as sgc
+
+START = datetime.date(2025, 1, 1)
+
+
+def window(time, frequency, channel=1, ctcss=67.0, dcs=None):
+    entry = {"time": time, "channel": channel, "frequency": frequency, "ctcss": ctcss}
+    if dcs is not None:
+        entry["dcs"] = dcs
+    return entry
+
+def brute_force_collisions(schedules):
+    # Every window against every earlier one, without the interval index
+    placed = []
+    colliding = 0
+    for schedule, meta in schedules.values():
+        tone_mode = meta.get('tone_mode', "ctcss")
+        for day, periods in schedule.items():
+            for entry in periods.values():
+                start, end = fleet_scheduler.window_minutes(entry)
+                key = (day, entry['frequency'], fleet_scheduler.window_tone(entry, tone_mode))
+                if any(other_key == key and other_start < end and start < other_end
+                       for other_key, other_start, other_end in placed):
+                    colliding += 1
+                placed.append((key, start, end))
+    return colliding
+
+def assert_recent_rules(schedule, tone_mode):
+    """No window repeats a channel of the 3 windows or a tone of the 5 windows before it"""
+    sequence = [entry for periods in schedule.values() for entry in periods.values()]
+    for position, entry in enumerate(sequence):
+        before = sequence[max(position - sgc.RECENT_CHANNELS_EXCLUDED, 0):position]
+        assert entry['channel'] not in [other['channel'] for other in before]
+        before = sequence[max(position - sgc.RECENT_TONES_EXCLUDED, 0):position]
+        assert fleet_scheduler.window_tone(entry, tone_mode) not in \
+               [fleet_scheduler.window_tone(other, tone_mode) for other in before]
+
+def test_overlapping_windows_with_different_starts_collide():
+    schedules = {
+        "a": ({1: {"morning": window("08:00 - 08:30", "462.5625")}}, {}),
+        "b": ({1: {"morning": window("08:20 - 08:50", "462.5625")}}, {}),
+        "c": ({1: {"morning": window("07:50 - 08:05", "462.5625")}}, {})
+    }
+    assert fleet_scheduler.collision_report(schedules)["colliding_windows"] == 2
+
+def test_collisions_compare_frequencies_not_channel_numbers():
+    # Pairs shuffle their channel maps, so one channel number is a different frequency for each
+    same_frequency = {
+        "a": ({1: {"morning": window("08:00 - 08:30", "462.5625", channel=3)}}, {}),
+        "b": ({1: {"morning": window("08:10 - 08:20", "462.5625", channel=17)}}, {})
+    }
+    same_channel = {
+        "a": ({1: {"morning": window("08:00 - 08:30", "462.5625", channel=3)}}, {}),
+        "b": ({1: {"morning": window("08:10 - 08:20", "467.5625", channel=3)}}, {})
+    }
+    assert fleet_scheduler.collision_report(same_frequency)["colliding_windows"] == 1
+    assert fleet_scheduler.collision_report(same_channel)["colliding_windows"] == 0
+
+@pytest.mark.parametrize("other", [
+    window("08:30 - 09:00", "462.5625"),              # adjacent
+    window("08:10 - 08:20", "462.5625", ctcss=71.9),  # other tone
+    window("08:10 - 08:20", "462.5875"),              # other frequency
+])
+def test_windows_that_do_not_collide(other):
+    schedules = {
+        "a": ({1: {"morning": window("08:00 - 08:30", "462.5625")}}, {}),
+        "b": ({1: {"morning": other}}, {})
+    }
+    assert fleet_scheduler.collision_report(schedules)["colliding_windows"] == 0
+
+def test_windows_past_midnight_overlap_the_late_evening():
+    schedules = {
+        "a": ({1: {"night": window("23:50 - 00:10", "462.5625")}}, {}),
+        "b": ({1: {"night": window("23:55 - 00:05", "462.5625")}}, {})
+    }
+    assert fleet_scheduler.window_minutes(schedules["a"][0][1]["night"]) == (1430, 1450)
+    assert fleet_scheduler.collision_report(schedules)["colliding_windows"] == 1
+
+@pytest.mark.parametrize("tone_mode", ["dcs", "split"])
+def test_tone_mode_is_read_from_meta(tone_mode):
+    # Same DCS code, different CTCSS: only the DCS-based modes see a collision
+    a = window("08:00 - 08:30", "462.5625", ctcss=67.0, dcs=23)
+    b = window("08:10 - 08:20", "462.5625", ctcss=67.0 if tone_mode == "split" else 71.9, dcs=23)
+    schedules = {"a": ({1: {"morning": a}}, {"tone_mode": tone_mode}),
+                 "b": ({1: {"morning": b}}, {"tone_mode": tone_mode})}
+    assert fleet_scheduler.collision_report(schedules)["colliding_windows"] == 1
+
+    b["dcs"] = 25
+    assert fleet_scheduler.collision_report(schedules)["colliding_windows"] == 0
+
+# Long windows in narrow ranges on a small band, so windows overlap at many different starts
+CROWDED_WINDOWS = [
+    {"name": "morning", "start": "08:00", "end": "09:00", "granularity": 5, "duration": 40},
+    {"name": "evening", "start": "20:00", "end": "21:00", "granularity": 5, "duration": 15}
+]
+
+def crowded_pairs(count):
+    return [{"pair_id": f"{i:02d}",
+             "user1_dob": (datetime.date(1950, 1, 1) + datetime.timedelta(days=97 * i)).isoformat(),
+             "user2_dob": (datetime.date(1960, 6, 1) + datetime.timedelta(days=53 * i)).isoformat()}
+            for i in range(count)]
+
+def test_occupancy_index_matches_brute_force():
+    schedules = {
+        pair["pair_id"]: sgc.generate_schedule(pair["user1_dob"], pair["user2_dob"], 14, start_date=START,
+                                               frequency_band="VLF", windows=CROWDED_WINDOWS)
+        for pair in crowded_pairs(40)
+    }
+    report = fleet_scheduler.collision_report(schedules)
+    assert report["colliding_windows"] > 0
+    assert report["colliding_windows"] == brute_force_collisions(schedules)
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_plan_fleet_clears_a_crowded_band(tone_mode):
+    schedules, report = fleet_scheduler.plan_fleet(crowded_pairs(40), 14, start_date=START, frequency_band="VLF",
+                                                   tone_mode=tone_mode, windows=CROWDED_WINDOWS)
+    assert report["before"]["colliding_windows"] > 0
+    assert report["after"]["colliding_windows"] == brute_force_collisions(schedules) == 0
+    assert report["unresolved_windows"] == 0
+    for schedule, _ in schedules.values():
+        assert_recent_rules(schedule, tone_mode)
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_plan_fleet_resolves_identical_pairs(tone_mode):
+    # The same DOBs under several pair ids produce identical, fully colliding schedules
+    pairs = [{"pair_id": f"p{i}", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05"} for i in range(4)]
+    pairs.append({"pair_id": "q", "user1_dob": "1970-12-31", "user2_dob": "2001-02-28"})
+
+    original, _ = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START, tone_mode=tone_mode)
+    schedules, report = fleet_scheduler.plan_fleet(pairs, 14, start_date=START, tone_mode=tone_mode)
+
+    assert report["before"]["colliding_windows"] >= 3 * 14 * 3
+    assert report["after"]["colliding_windows"] == 0
+    assert report["unresolved_windows"] == 0
+    assert report["reassigned_windows"] >= 3 * 14 * 3
+    assert brute_force_collisions(schedules) == 0
+
+    tones, _ = sgc.tone_space("PMRS", tone_mode)
+    channels = sgc.FREQUENCY_BANDS["PMRS"]["channels"]
+    for schedule, meta in schedules.values():
+        assert meta["tone_mode"] == tone_mode
+        assert_recent_rules(schedule, tone_mode)
+        for day, periods in schedule.items():
+            for period, entry in periods.items():
+                assert fleet_scheduler.window_tone(entry, tone_mode) in tones
+                assert entry['frequency'] == meta['channel_frequencies'][entry['channel']]
+                assert entry['channel'] in channels
+    # Windows move frequency or tone, never time; the first pair keeps its schedule
+    for pair_id in ("p0", "p1", "p2", "p3"):
+        schedule = schedules[pair_id][0]
+        assert {day: {p: e['time'] for p, e in periods.items()} for day, periods in schedule.items()} == \
+               {day: {p: e['time'] for p, e in periods.items()} for day, periods in original.items()}
+    assert schedules["p0"][0] == original
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_planned_schedules_extend_from_the_planned_windows(tone_mode):
+    pairs = [{"pair_id": f"p{i}", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05"} for i in range(3)]
+    schedules, _ = fleet_scheduler.plan_fleet(pairs, 14, start_date=START, tone_mode=tone_mode)
+
+    for schedule, meta in schedules.values():
+        last = [entry for periods in schedule.values() for entry in periods.values()][-sgc.RECENT_HISTORY:]
+        assert meta["checkpoint"]["recent_channels"] == [entry['channel'] for entry in last]
+
+        planned = copy.deepcopy(schedule)
+        sgc.extend_schedule(schedule, copy.deepcopy(meta), 14)
+        assert {day: schedule[day] for day in planned} == planned
+        assert_recent_rules(schedule, tone_mode)
+
+def test_plan_fleet_is_independent_of_input_order():
+    pairs = [{"pair_id": f"p{i}", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05"} for i in range(3)]
+    forward, _ = fleet_scheduler.plan_fleet(copy.deepcopy(pairs), 7, start_date=START)
+    backward, _ = fleet_scheduler.plan_fleet(list(reversed(pairs)), 7, start_date=START)
+    assert forward == backward
+
+def test_plan_fleet_rejects_duplicate_pair_ids():
+    pairs = [{"pair_id": "p", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05"},
+             {"pair_id": "p", "user1_dob": "1970-12-31", "user2_dob": "2001-02-28"}]
+    with pytest.raises(ValueError, match="Duplicate pair_id"):
+        fleet_scheduler.plan_fleet(pairs, 7, start_date=START)
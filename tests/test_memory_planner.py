@@ -0,0 +1,89 @@
+import datetime
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+import pytest
+import memory_planner
+import schedule_generator_chirp as sgc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+START = datetime.date(2025, 1, 1)
+
+
+def windows_of(schedule, meta):
+    """Every window, quick-connect slot and the backup channel, in planning order"""
+    entries = [window for day in range(1, len(schedule) + 1) for window in schedule[day].values()]
+    entries += meta['quick_connect_times']
+    entries.append({"frequency": memory_planner.BACKUP_FREQUENCY, "ctcss": memory_planner.BACKUP_CTCSS})
+    return entries
+
+def slots_of(plan):
+    slots = [slot for day in sorted(plan['day_slots']) for slot in plan['day_slots'][day].values()]
+    return slots + plan['quick_connect_slots'] + [plan['backup_slot']]
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_one_memory_per_frequency_by_default(tone_mode):
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 30, start_date=START, tone_mode=tone_mode)
+    plan = memory_planner.plan_memories(schedule, meta)
+    entries = windows_of(schedule, meta)
+
+    assert plan['group_by'] == "frequency"
+    assert len(plan['memories']) == len({entry['frequency'] for entry in entries})
+    assert [memory['number'] for memory in plan['memories']] == list(range(1, len(plan['memories']) + 1))
+    for entry, slot in zip(entries, slots_of(plan)):
+        memory = plan['memories'][slot - 1]
+        assert memory['frequency'] == entry['frequency']
+        assert memory['ctcss'] is None and memory['dcs'] is None
+    assert sum(memory['uses'] for memory in plan['memories']) == len(entries)
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_one_memory_per_frequency_and_tone(tone_mode):
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 30, start_date=START, tone_mode=tone_mode)
+    plan = memory_planner.plan_memories(schedule, meta, "tone")
+    entries = windows_of(schedule, meta)
+
+    keys = {(entry['frequency'], entry['ctcss'], entry.get('dcs')) for entry in entries}
+    assert len(plan['memories']) == len(keys) > len(memory_planner.plan_memories(schedule, meta)['memories'])
+    for entry, slot in zip(entries, slots_of(plan)):
+        memory = plan['memories'][slot - 1]
+        assert (memory['frequency'], memory['ctcss'], memory['dcs']) == (entry['frequency'], entry['ctcss'], entry.get('dcs'))
+    assert sum(memory['uses'] for memory in plan['memories']) == len(entries)
+
+def test_unknown_grouping():
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START)
+    with pytest.raises(ValueError, match="Unsupported memory grouping"):
+        memory_planner.plan_memories(schedule, meta, "channel")
+
+@pytest.mark.parametrize("group_by", ["frequency", "tone"])
+def test_packed_files(tmp_path, capsys, group_by):
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START, tone_mode="split")
+    path = str(tmp_path / "packed.chirp.gz")
+    plan = memory_planner.output_packed_files(schedule, meta, path, group_by=group_by, start_date=START)
+    assert f"slot table saved to {tmp_path / 'packed_slots.txt.gz'}" in capsys.readouterr().out
+
+    with sgc.open_input(path) as f:
+        memories = ET.fromstring(f.read()).findall("memory")
+    assert [int(memory.findtext("number")) for memory in memories] == [memory['number'] for memory in plan['memories']]
+    assert [memory.findtext("frequency") for memory in memories] == \
+           [memory['frequency'] for memory in plan['memories']]
+    if group_by == "frequency":
+        assert all(not memory.findtext("tmode") for memory in memories)
+
+    with sgc.open_input(str(tmp_path / "packed_slots.txt.gz")) as f:
+        table = f.read()
+    assert f"{len(plan['memories'])} memories for a 14-Day Rotation" in table
+    assert "2025-01-14" in table
+    assert ("tone per window" in table) == (group_by == "frequency")
+    assert (" | TONE " in table) == (group_by == "frequency")
+
+def test_command_line_defaults_to_frequency(tmp_path):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "memory_planner.py"), "1990-01-01", "1985-05-05",
+                             "--start-date", "2025-01-01", "--output", str(tmp_path / "packed.chirp"), "--capacity", "1"],
+                            capture_output=True, text=True, cwd=tmp_path, check=True)
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START)
+    count = len(memory_planner.plan_memories(schedule, meta, "frequency")['memories'])
+
+    assert f"Memories needed: {count} " in result.stdout
+    assert "try fewer days" in result.stdout and "--by frequency" not in result.stdout
+    assert "tone per window" in (tmp_path / "packed_slots.txt").read_text()
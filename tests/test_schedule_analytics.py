@@ -0,0 +1,131 @@
+import collections
+import datetime
+import pytest
+import fleet_scheduler
+import schedule_analytics
+import schedule_generator_chirp as sgc
+
+START = datetime.date(2025, 1, 1)
+PAIRS = [("1990-01-01", "1985-05-05"), ("1970-12-31", "2001-02-28"), ("1988-07-15", "1955-03-09")]
+# Long windows in narrow ranges on a small band, so windows overlap at many different starts
+CROWDED_WINDOWS = [
+    {"name": "morning", "start": "08:00", "end": "09:00", "granularity": 5, "duration": 40},
+    {"name": "evening", "start": "20:00", "end": "21:00", "granularity": 5, "duration": 15}
+]
+
+
+def generate(tone_mode):
+    return [sgc.generate_schedule(user1_dob, user2_dob, 14, start_date=START, tone_mode=tone_mode)[0]
+            for user1_dob, user2_dob in PAIRS]
+
+def crowded(tone_mode, count=30):
+    return [sgc.generate_schedule((datetime.date(1950, 1, 1) + datetime.timedelta(days=97 * i)).isoformat(),
+                                  (datetime.date(1960, 6, 1) + datetime.timedelta(days=53 * i)).isoformat(),
+                                  14, start_date=START, frequency_band="VLF", tone_mode=tone_mode,
+                                  windows=CROWDED_WINDOWS)[0]
+            for i in range(count)]
+
+def sequence(schedule):
+    return [window for day in range(1, len(schedule) + 1) for window in schedule[day].values()]
+
+def brute_force_collisions(schedules, with_tone=True):
+    """Every window against every other one: (later windows overlapping an earlier one, overlapping pairs)"""
+    rows = []
+    for index, schedule in enumerate(schedules):
+        for day, periods in schedule.items():
+            for window in periods.values():
+                start, end = fleet_scheduler.window_minutes(window)
+                key = (day, window['frequency'], sgc.format_tone(window) if with_tone else None)
+                rows.append((index, key, start, end))
+    later = set()
+    pairs = []
+    for j, (schedule_j, key_j, start_j, end_j) in enumerate(rows):
+        for i, (schedule_i, key_i, start_i, end_i) in enumerate(rows[:j]):
+            if key_i == key_j and start_i < end_j and start_j < end_i:
+                later.add(j)
+                pairs.append((schedule_i, schedule_j))
+    return len(later), pairs
+
+def longest_run(values):
+    longest = run = 0
+    for i, value in enumerate(values):
+        run = run + 1 if i and value == values[i - 1] else 1
+        longest = max(longest, run)
+    return longest
+
+def test_tone_histogram_counts_every_tone_mode():
+    for tone_mode in sgc.TONE_MODES:
+        schedules = generate(tone_mode)
+        report = schedule_analytics.analyze_schedules(schedules)
+
+        # Brute force: count each window's tone text
+        expected = {}
+        for schedule in schedules:
+            for periods in schedule.values():
+                for window in periods.values():
+                    expected[sgc.format_tone(window)] = expected.get(sgc.format_tone(window), 0) + 1
+
+        assert report["tone_histogram"] == expected
+        assert report["tones_used"] == len(expected)
+        assert sum(report["tone_histogram"].values()) == report["windows"] == len(PAIRS) * 14 * 3
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_collisions_match_brute_force(tone_mode):
+    schedules = crowded(tone_mode)
+    collisions = schedule_analytics.analyze_schedules(schedules)["collisions"]
+
+    colliding, pairs = brute_force_collisions(schedules)
+    co_frequency, _ = brute_force_collisions(schedules, with_tone=False)
+    between = [pair for pair in pairs if pair[0] != pair[1]]
+    assert collisions["colliding_windows"] == colliding > 0
+    assert collisions["co_frequency_windows"] == co_frequency
+    assert collisions["pair_collision_events"] == len(between)
+    assert collisions["colliding_schedule_pairs"] == len(set(between))
+    assert collisions["pairwise_collision_rate"] == len(set(between)) / (30 * 29 // 2)
+
+    # The same count as the fleet planner's report
+    report = fleet_scheduler.collision_report({i: (schedule, {"tone_mode": tone_mode})
+                                               for i, schedule in enumerate(schedules)})
+    assert collisions["colliding_windows"] == report["colliding_windows"]
+
+def test_same_channel_number_on_other_frequencies_is_no_collision():
+    # Identical pairs collide; the planner moves them apart on the frequency and tone
+    pairs = [{"pair_id": f"p{i}", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05"} for i in range(3)]
+    schedules = [schedule for schedule, _ in fleet_scheduler.plan_fleet(pairs, 14, start_date=START)[0].values()]
+    before = schedule_analytics.analyze_schedules([schedules[0]] * 3)["collisions"]
+    after = schedule_analytics.analyze_schedules(schedules)["collisions"]
+
+    assert before["colliding_windows"] == 2 * 14 * 3
+    assert before["colliding_schedule_pairs"] == 3
+    assert after["colliding_windows"] == after["pair_collision_events"] == 0
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_reuse_and_time_slots_match_brute_force(tone_mode):
+    schedules = generate(tone_mode) + crowded(tone_mode, 5)
+    report = schedule_analytics.analyze_schedules(schedules)
+
+    assert report["max_consecutive_channel_reuse"] == max(
+        longest_run([window['channel'] for window in sequence(schedule)]) for schedule in schedules)
+    assert report["max_consecutive_tone_reuse"] == max(
+        longest_run([sgc.format_tone(window) for window in sequence(schedule)]) for schedule in schedules)
+
+    time_slots = collections.defaultdict(collections.Counter)
+    frequencies = collections.Counter()
+    for schedule in schedules:
+        for periods in schedule.values():
+            for period, window in periods.items():
+                time_slots[period][window['time'][:5]] += 1
+                frequencies[window['frequency']] += 1
+    assert report["time_slots"] == {period: dict(sorted(slots.items())) for period, slots in time_slots.items()}
+    assert report["frequency_histogram"] == dict(frequencies)
+
+def test_consecutive_reuse_within_one_schedule_only():
+    window = {"time": "08:00 - 08:05", "channel": 4, "frequency": "462.5625", "ctcss": 67.0}
+    schedule = {day: {"morning": dict(window)} for day in range(1, 4)}
+    other = {day: {"morning": dict(window, channel=5, ctcss=71.9)} for day in range(1, 4)}
+    other[2]["morning"]["channel"] = 4
+
+    report = schedule_analytics.analyze_schedules([schedule, other])
+    assert report["max_consecutive_channel_reuse"] == 3
+    assert report["max_consecutive_tone_reuse"] == 3
+    assert schedule_analytics.analyze_schedules([other])["max_consecutive_channel_reuse"] == 1
@@ -0,0 +1,88 @@
+import datetime
+import pytest
+import schedule_archive
+import schedule_generator_chirp as sgc
+
+START = datetime.date(2025, 1, 1)
+# The last pair is the first one with the DOBs swapped, which gives the same archive key
+PAIRS = [("1990-01-01", "1985-05-05"), ("1970-12-31", "2001-02-28"), ("1988-07-15", "1955-03-09"),
+         ("2000-02-29", "1999-12-31"), ("1985-05-05", "1990-01-01")]
+
+
+def item(pair_id, user1_dob, user2_dob, days=14, band="PMRS"):
+    return (pair_id, user1_dob, user2_dob) + sgc.generate_schedule(user1_dob, user2_dob, days, start_date=START,
+                                                                   frequency_band=band)
+
+def items(days=14, band="PMRS"):
+    return [item(f"pair-{i}", user1_dob, user2_dob, days, band) for i, (user1_dob, user2_dob) in enumerate(PAIRS)]
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "fleet.pmrsa"
+    written = items()
+    assert schedule_archive.write_archive(path, iter(written)) == len(PAIRS)
+
+    with schedule_archive.ScheduleArchive(path) as archive:
+        assert len(archive) == len(PAIRS)
+        for pair_id, user1_dob, user2_dob, schedule, meta in written:
+            assert (user1_dob, user2_dob) in archive
+            assert archive.get(user1_dob, user2_dob) == (pair_id, schedule, meta)
+        assert [record["pair_id"] for record in archive.records()] == [entry[0] for entry in written]
+
+def test_missing_pair(tmp_path):
+    path = tmp_path / "fleet.pmrsa"
+    schedule_archive.write_archive(path, items()[:1])
+
+    with schedule_archive.ScheduleArchive(path) as archive:
+        assert archive.get("1985-05-05", "1990-01-01") is None
+        assert archive.get_record("1960-06-06", "1961-07-07") is None
+        assert ("1960-06-06", "1961-07-07") not in archive
+
+def test_append_replaces_archived_pairs(tmp_path):
+    path = tmp_path / "fleet.pmrsa"
+    schedule_archive.write_archive(path, items())
+
+    # Two pairs regenerated on another band, one new pair
+    replaced = [item("pair-1b", *PAIRS[1], band="VHF"), item("pair-4b", *PAIRS[4], band="VHF")]
+    added = item("pair-5", "1950-01-01", "1951-01-01")
+    assert schedule_archive.append_archive(path, replaced + [added]) == len(PAIRS) + 1
+
+    expected = {entry[1:3]: entry for entry in items()}
+    expected.update({entry[1:3]: entry for entry in replaced + [added]})
+    with schedule_archive.ScheduleArchive(path) as archive:
+        assert len(archive) == len(expected)
+        for pair_id, user1_dob, user2_dob, schedule, meta in expected.values():
+            assert archive.get(user1_dob, user2_dob) == (pair_id, schedule, meta)
+        assert sorted(record["pair_id"] for record in archive.records()) == sorted(e[0] for e in expected.values())
+
+def test_a_pair_written_twice_keeps_the_last_record(tmp_path):
+    path = tmp_path / "fleet.pmrsa"
+    first = item("first", *PAIRS[0])
+    last = item("last", *PAIRS[0], days=7)
+    assert schedule_archive.write_archive(path, [first, item("other", *PAIRS[1]), last]) == 2
+
+    with schedule_archive.ScheduleArchive(path) as archive:
+        assert archive.get(*PAIRS[0]) == ("last",) + last[3:]
+
+def test_append_creates_a_missing_archive(tmp_path):
+    path = tmp_path / "fleet.pmrsa"
+    assert schedule_archive.append_archive(path, items()[:2]) == 2
+    with schedule_archive.ScheduleArchive(path) as archive:
+        assert archive.get(*PAIRS[1])[0] == "pair-1"
+
+def test_index_grows_past_its_minimum_capacity(tmp_path):
+    path = tmp_path / "fleet.pmrsa"
+    pairs = [(f"19{60 + i % 40}-0{1 + i % 9}-1{i % 10}", f"19{50 + i % 30}-1{i % 3}-2{i % 9}") for i in range(120)]
+    pairs = list(dict.fromkeys(pairs))
+    schedule_archive.write_archive(path, (item(str(i), *pair, days=1) for i, pair in enumerate(pairs)))
+
+    with schedule_archive.ScheduleArchive(path) as archive:
+        assert len(archive) == len(pairs)
+        assert archive.capacity >= len(pairs) / schedule_archive.MAX_LOAD
+        for i, pair in enumerate(pairs):
+            assert archive.get(*pair)[0] == str(i)
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "schedule.txt"
+    path.write_text("not an archive")
+    with pytest.raises(ValueError):
+        schedule_archive.ScheduleArchive(path)
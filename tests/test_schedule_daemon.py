@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import pytest
+import schedule_daemon
+import schedule_generator_chirp as sgc
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARGS = ["1990-01-01", "1985-05-05", "--output", "text", "--start-date", "2025-01-01"]
+
+
+def wait_for(path):
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+
+@pytest.fixture
+def socket_dir():
+    # Socket paths are limited to about 100 bytes, so not under pytest's tmp_path
+    path = tempfile.mkdtemp(prefix="sd", dir="/tmp")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+@pytest.fixture
+def daemon(socket_dir):
+    """A daemon with a short request timeout, stopped after the test"""
+    path = os.path.join(socket_dir, "d.sock")
+    process = subprocess.Popen([sys.executable, "-c",
+                                "import schedule_daemon as d, sys; d.REQUEST_TIMEOUT = 0.5; d.serve(sys.argv[1], 30)",
+                                path], cwd=ROOT)
+    wait_for(path)
+    yield path
+    schedule_daemon.stop_daemon(path)
+    process.wait(10)
+
+def test_first_call_spawns_the_daemon(socket_dir, tmp_path, monkeypatch, capsys):
+    path = os.path.join(socket_dir, "d.sock")
+    monkeypatch.chdir(tmp_path)
+    try:
+        assert schedule_daemon.run_client(ARGS, path) == 0
+        assert os.path.exists(path)
+        assert schedule_daemon.run_client(ARGS + ["--days", "7"], path) == 0
+    finally:
+        assert schedule_daemon.stop_daemon(path)
+    assert "successfully generated with 7 days" in capsys.readouterr().out
+    deadline = time.monotonic() + 10
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert not schedule_daemon.stop_daemon(path)
+
+def test_round_trip_writes_in_the_callers_directory(daemon, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert schedule_daemon.run_client(ARGS, daemon) == 0
+    out = capsys.readouterr().out
+    assert "Text schedule saved to emergency_schedule.txt" in out
+    forwarded = (tmp_path / "emergency_schedule.txt").read_text()
+
+    local_dir = tmp_path / "local"
+    local_dir.mkdir()
+    monkeypatch.chdir(local_dir)
+    assert sgc.main(ARGS, forward=False) == 0
+    assert (local_dir / "emergency_schedule.txt").read_text() == forwarded
+
+def test_usage_errors_come_back_with_their_exit_code(daemon, capsys):
+    assert schedule_daemon.run_client(["--no-such-option"], daemon) == 2
+    assert "unrecognized arguments" in capsys.readouterr().err
+
+def test_bulk_output_is_streamed_in_order(daemon, tmp_path, monkeypatch, capsys):
+    pairs = tmp_path / "pairs.csv"
+    pairs.write_text("user1_dob,user2_dob\n" + "".join(f"19{50 + i}-01-0{1 + i % 9},1985-05-05\n" for i in range(40)))
+    monkeypatch.chdir(tmp_path)
+    command = ["--bulk", str(pairs), "--days", "30", "--start-date", "2025-01-01"]
+
+    assert schedule_daemon.run_client(command, daemon) == 0
+    forwarded = capsys.readouterr()
+    assert sgc.main(command, forward=False) == 0
+    local = capsys.readouterr()
+    assert forwarded.out == local.out
+    assert len(forwarded.out) > 4 * schedule_daemon.REPLY_CHUNK
+    assert forwarded.err == local.err == "40 of 40 schedules generated\n"
+
+def test_a_silent_client_does_not_block_the_daemon(daemon, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+        idle.connect(daemon)
+        started = time.monotonic()
+        assert schedule_daemon.run_client(ARGS, daemon) == 0
+        assert time.monotonic() - started < 5
+
+def test_main_forwards_with_the_daemon_flag(daemon, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("PMRS_DAEMON_SOCKET", daemon)
+    monkeypatch.chdir(tmp_path)
+    assert sgc.main(ARGS + ["--daemon"]) == 0
+    monkeypatch.setenv("PMRS_DAEMON", "1")
+    assert sgc.main(ARGS + ["--days", "9"]) == 0
+    out = capsys.readouterr().out
+    assert "with 14 days" in out and "with 9 days" in out
+
+def test_standard_input_runs_locally(tmp_path, monkeypatch, capsys):
+    # The daemon cannot read this process's standard input; no daemon is contacted
+    monkeypatch.setenv("PMRS_DAEMON_SOCKET", str(tmp_path / "none.sock"))
+    monkeypatch.setenv("PMRS_DAEMON", "1")
+    monkeypatch.setattr(sys, "stdin", io.StringIO("user1_dob,user2_dob\n1990-01-01,1985-05-05\n"))
+    assert schedule_daemon.forward(["--bulk", "-", "--daemon", "--start-date", "2025-01-01"]) == 0
+    assert json.loads(capsys.readouterr().out)["pair_id"] == "1990-01-01_1985-05-05"
+    assert not os.path.exists(tmp_path / "none.sock")
+
+def test_reply_is_sent_in_bounded_chunks_in_write_order():
+    server, client = socket.socketpair()
+    with server, client:
+        reply = schedule_daemon._Reply(server)
+        stdout = schedule_daemon._ReplyStream(reply, "stdout")
+        stderr = schedule_daemon._ReplyStream(reply, "stderr")
+        for _ in range(50):
+            print("x" * 999, file=stdout)
+        print("done", file=stderr)
+        print("after", file=stdout)
+        reply.flush()
+        server.shutdown(socket.SHUT_WR)
+        messages = [json.loads(line) for line in client.makefile("rb")]
+
+    assert [list(message) for message in messages[-2:]] == [["stderr"], ["stdout"]]
+    stdout_text = "".join(message.get("stdout", "") for message in messages)
+    assert stdout_text == ("x" * 999 + "\n") * 50 + "after\n"
+    assert all(len(message.get("stdout", "")) < schedule_daemon.REPLY_CHUNK + 1000 for message in messages)
+    assert len(messages) > 2
@@ -0,0 +1,99 @@
+import datetime
+import pytest
+import schedule_diff
+import schedule_generator_chirp as sgc
+
+START = datetime.date(2025, 1, 1)
+NIGHT_WINDOWS = [
+    {"name": "morning", "start": "06:00", "end": "10:00", "granularity": 15, "duration": 5},
+    {"name": "night", "start": "22:00", "end": "23:30", "granularity": 5, "duration": 10}
+]
+
+
+def dated_windows(schedule, meta, first, days):
+    """Brute force: the window of every (date, period), walking the calendar one date at a time"""
+    start = datetime.date.fromisoformat(meta['start_date'])
+    windows = {}
+    for offset in range(days):
+        date = first + datetime.timedelta(days=offset)
+        if date < start:
+            continue
+        day = (date - start).days % len(schedule) + 1
+        for period, window in schedule[day].items():
+            windows[(date, period)] = window
+    return windows
+
+def displayed(window):
+    return {"time": window['time'], "channel": str(window['channel']), "frequency": window['frequency'],
+            "tone": sgc.format_tone(window)}
+
+def brute_force_diff(periods, schedule_a, meta_a, schedule_b, meta_b, days=None):
+    start_a = datetime.date.fromisoformat(meta_a['start_date'])
+    start_b = datetime.date.fromisoformat(meta_b['start_date'])
+    first = min(start_a, start_b)
+    if days is None:
+        days = (max(start_a + datetime.timedelta(days=len(schedule_a)),
+                    start_b + datetime.timedelta(days=len(schedule_b))) - first).days
+    a = dated_windows(schedule_a, meta_a, first, days)
+    b = dated_windows(schedule_b, meta_b, first, days)
+
+    # Rows come in date order; windows of a date in the order the diff lists them
+    rows = []
+    for key in sorted(set(a) & set(b), key=lambda key: (key[0], periods.index(key[1]))):
+        values_a, values_b = displayed(a[key]), displayed(b[key])
+        rows.append((key[0], key[1], values_a, values_b,
+                     [(field, values_a[field], values_b[field]) for field in schedule_diff.FIELDS
+                      if values_a[field] != values_b[field]]))
+    return rows, len(set(a) - set(b)), len(set(b) - set(a))
+
+CASES = {
+    "identical": ({}, {}, None),
+    "band": ({}, {"frequency_band": "VHF"}, None),
+    "tone mode": ({"tone_mode": "dcs"}, {"tone_mode": "split"}, None),
+    "days": ({}, {"days": 9}, None),
+    "start date": ({}, {"start_date": datetime.date(2025, 1, 6)}, None),
+    "later start, longer range": ({"start_date": datetime.date(2025, 2, 1), "days": 5},
+                                  {"start_date": datetime.date(2025, 1, 20), "days": 7}, 40),
+    "windows": ({}, {"windows": NIGHT_WINDOWS}, None),
+}
+
+def generate(settings):
+    settings = {"days": 14, "start_date": START, **settings}
+    return sgc.generate_schedule("1990-01-01", "1985-05-05", settings.pop("days"), **settings)
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_diff_matches_brute_force(case):
+    settings_a, settings_b, days = CASES[case]
+    schedule_a, meta_a = generate(settings_a)
+    schedule_b, meta_b = generate(settings_b)
+
+    result = schedule_diff.diff_schedules(schedule_a, meta_a, schedule_b, meta_b, days)
+    rows, only_a, only_b = brute_force_diff(result["periods"], schedule_a, meta_a, schedule_b, meta_b, days)
+
+    actual = [(row["date"], row["period"], row["a"], row["b"], row["changes"])
+              for row in schedule_diff.diff_rows(result, changed_only=False)]
+    assert actual == rows
+    assert [row["changes"] for row in schedule_diff.diff_rows(result)] == [row[4] for row in rows if row[4]]
+
+    summary = schedule_diff.summarize(result)
+    assert summary["compared"] == len(rows)
+    assert summary["changed"] == sum(1 for row in rows if row[4])
+    assert (summary["only_a"], summary["only_b"]) == (only_a, only_b)
+    if case == "identical":
+        assert summary["changed"] == 0
+
+def test_diff_fleets_pairs_by_id():
+    pairs = {"x": ("1990-01-01", "1985-05-05"), "y": ("1970-12-31", "2001-02-28"), "z": ("1988-07-15", "1955-03-09")}
+    fleet_a = {pair_id: sgc.generate_schedule(*dobs, 14, start_date=START) for pair_id, dobs in pairs.items()
+               if pair_id != "z"}
+    fleet_b = {pair_id: sgc.generate_schedule(*dobs, 10, start_date=START, frequency_band="UHF")
+               for pair_id, dobs in pairs.items() if pair_id != "x"}
+
+    result = schedule_diff.diff_fleets(fleet_a, fleet_b)
+    assert result["pair_ids"] == ["y"]
+    assert (result["missing_a"], result["missing_b"]) == (["z"], ["x"])
+
+    rows, _, _ = brute_force_diff(result["periods"], *fleet_a["y"], *fleet_b["y"])
+    assert [(row["date"], row["period"], row["changes"]) for row in schedule_diff.diff_rows(result, changed_only=False)] == \
+           [(row[0], row[1], row[4]) for row in rows]
+    assert all(row["pair_id"] == "y" for row in schedule_diff.diff_rows(result))
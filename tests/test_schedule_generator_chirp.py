@@ -0,0 +1,366 @@
+import copy
+import datetime
+import json
+import os
+import pytest
+import schedule_generator_chirp as sgc
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+START = datetime.date(2025, 1, 1)
+
+# Schedules and exports written by the original generator; default output must not change
+with open(os.path.join(DATA_DIR, "baseline_schedules.json"), "r") as f:
+    BASELINE = json.load(f)
+
+
+def as_json(schedule):
+    return json.loads(json.dumps({str(day): periods for day, periods in schedule.items()}))
+
+@pytest.mark.parametrize("case", sorted(BASELINE))
+def test_default_output_matches_baseline(case):
+    band, days, user1_dob, user2_dob = case.split("|")
+    schedule, meta = sgc.generate_schedule(user1_dob, user2_dob, int(days), start_date=START, frequency_band=band)
+
+    expected = BASELINE[case]
+    assert as_json(schedule) == expected["schedule"]
+    # Newer metadata keys are additions; the original ones keep their values
+    assert {key: json.loads(json.dumps(meta[key])) for key in expected["meta"]} == expected["meta"]
+
+def test_default_exports_match_baseline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sgc.generate_schedule("1990-01-01", "1985-05-05", 20, start_date=START, output_format="all", frequency_band="VHF")
+
+    expected_dir = os.path.join(DATA_DIR, "baseline_vhf_20")
+    for name in sorted(os.listdir(expected_dir)):
+        with open(os.path.join(expected_dir, name), "rb") as expected, open(tmp_path / name, "rb") as written:
+            assert written.read() == expected.read(), name
+
+def test_extend_keeps_existing_days():
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START)
+    original = copy.deepcopy(schedule)
+
+    sgc.extend_schedule(schedule, meta, 30)
+
+    assert len(schedule) == 44
+    assert meta["cycle_days"] == 44
+    assert {day: schedule[day] for day in original} == original
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_extend_in_steps_matches_one_extension(tone_mode):
+    schedule, meta = sgc.generate_schedule("1970-12-31", "2001-02-28", 14, start_date=START,
+                                           frequency_band="VHF", tone_mode=tone_mode)
+    one = copy.deepcopy(schedule), copy.deepcopy(meta)
+    sgc.extend_schedule(*one, 30)
+
+    steps = copy.deepcopy(schedule), copy.deepcopy(meta)
+    for extra_days in (1, 9, 20):
+        sgc.extend_schedule(*steps, extra_days)
+
+    assert steps[0] == one[0]
+    assert steps[1]["checkpoint"] == one[1]["checkpoint"]
+
+def test_extend_from_stored_metadata():
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START, tone_mode="split")
+    expected, _ = sgc.extend_schedule(copy.deepcopy(schedule), copy.deepcopy(meta), 21)
+
+    # Metadata read back from JSON, as from a store, archive or bulk output
+    stored_meta = json.loads(json.dumps(meta))
+    extended, _ = sgc.extend_schedule(copy.deepcopy(schedule), stored_meta, 21)
+
+    assert extended == expected
+
+def test_checkpoint_does_not_grow_with_the_schedule():
+    _, short_meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START)
+    _, long_meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 3650, start_date=START)
+    assert long_meta["checkpoint"]["version"] == sgc.CHECKPOINT_VERSION
+    assert len(long_meta["checkpoint"]["rng_state"]) == len(short_meta["checkpoint"]["rng_state"])
+    assert len(json.dumps(long_meta["checkpoint"])) < 4096
+
+def test_unsupported_checkpoint_version():
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START)
+    meta["checkpoint"]["version"] = 1
+    with pytest.raises(ValueError, match="checkpoint version"):
+        sgc.extend_schedule(schedule, meta, 1)
+
+def window_tone(window):
+    return {"ctcss": window['ctcss'], "dcs": window.get('dcs')}
+
+@pytest.mark.parametrize("tone_mode", ["dcs", "split"])
+def test_dcs_windows_use_the_tone_space(tone_mode):
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 30, start_date=START, tone_mode=tone_mode)
+    tones, _ = sgc.tone_space("PMRS", tone_mode)
+
+    assert meta["tone_mode"] == tone_mode
+    for periods in schedule.values():
+        for window in periods.values():
+            assert window['dcs'] in sgc.DCS_CODES
+            assert (window['ctcss'] is None) == (tone_mode == "dcs")
+            tone = window['dcs'] if tone_mode == "dcs" else (window['ctcss'], window['dcs'])
+            assert tone in tones
+
+@pytest.mark.parametrize("tone_mode, tmode", [("ctcss", "TSQL"), ("dcs", "DTCS"), ("split", "Cross")])
+def test_chirp_export_tone_modes(tone_mode, tmode):
+    import io
+    import xml.etree.ElementTree as ET
+
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START, tone_mode=tone_mode)
+    output = io.StringIO()
+    sgc.write_chirp_schedule(output, schedule, meta)
+    memories = ET.fromstring(output.getvalue()).findall("memory")
+
+    windows = [schedule[day][period] for day in range(1, 8) for period in sgc._day_periods(schedule)]
+    assert len(memories) >= len(windows)
+    for memory, window in zip(memories, windows):
+        assert memory.findtext("frequency") == window['frequency']
+        assert memory.findtext("tmode") == tmode
+        if tone_mode == "ctcss":
+            assert float(memory.findtext("rtone")) == window['ctcss']
+            assert float(memory.findtext("ctone")) == window['ctcss']
+        if tone_mode == "dcs":
+            assert int(memory.findtext("dtcs")) == window['dcs']
+        if tone_mode == "split":
+            assert memory.findtext("cross_mode") == "Tone->DTCS"
+            assert float(memory.findtext("rtone")) == window['ctcss']
+        if tone_mode != "ctcss":
+            assert int(memory.findtext("rx_dtcs")) == window['dcs']
+            assert memory.findtext("dtcs_polarity") == "NN"
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_csv_and_text_exports_round_trip_tones(tone_mode):
+    import csv
+    import io
+
+    schedule, meta = sgc.generate_schedule("1970-12-31", "2001-02-28", 7, start_date=START, tone_mode=tone_mode)
+    periods = sgc._day_periods(schedule)
+
+    output = io.StringIO(newline='')
+    sgc.write_csv_schedule(output, schedule, meta)
+    rows = list(csv.DictReader(io.StringIO(output.getvalue(), newline='')))
+    assert len(rows) == 7
+    for row in rows:
+        for period in periods:
+            window = schedule[int(row['Day'])][period]
+            assert window_tone(sgc.parse_tone(row[f"{sgc.period_label(period)} CTCSS"])) == window_tone(window)
+
+    output = io.StringIO()
+    sgc.write_csv_quick_connect(output, meta)
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    for row, qc in zip(rows, meta['quick_connect_times']):
+        assert window_tone(sgc.parse_tone(row['CTCSS'])) == window_tone(qc)
+
+    output = io.StringIO()
+    sgc.write_text_schedule(output, schedule, meta)
+    text = output.getvalue()
+    for periods_of_day in schedule.values():
+        for window in periods_of_day.values():
+            assert sgc.format_tone(window) in text
+
+BULK_OPTIONS = {"days": 7, "start_date": "2025-01-01", "frequency_band": "PMRS", "tone_mode": "ctcss",
+                "windows": None, "output_dir": None, "output": "text", "tz": None}
+
+def bulk_records(count):
+    return [{"pair_id": f"p{i:03d}",
+             "user1_dob": (datetime.date(1950, 1, 1) + datetime.timedelta(days=97 * i)).isoformat(),
+             "user2_dob": (datetime.date(1960, 6, 1) + datetime.timedelta(days=53 * i)).isoformat()}
+            for i in range(count)]
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_bulk_results_keep_the_input_order(jobs):
+    records = bulk_records(40)
+    results = list(sgc.iter_bulk_results(iter(records), BULK_OPTIONS, jobs=jobs, chunk_size=3))
+
+    assert all(ok for ok, _ in results)
+    lines = [json.loads(line) for _, line in results]
+    assert [line["pair_id"] for line in lines] == [record["pair_id"] for record in records]
+    for record, line in zip(records[:5], lines):
+        schedule, meta = sgc.generate_schedule(record["user1_dob"], record["user2_dob"], 7, start_date=START)
+        assert line == {"pair_id": record["pair_id"], **json.loads(json.dumps(sgc.schedule_to_json(schedule, meta)))}
+
+def test_bulk_bad_rows_fail_on_their_own(tmp_path, monkeypatch, capsys):
+    lines = [
+        '{"pair_id": "a", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05"}',
+        '{"pair_id": "broken", ',
+        '{"pair_id": "missing", "user1_dob": "1990-01-01"}',
+        '{"pair_id": "date", "user1_dob": "1990-02-30", "user2_dob": "1985-05-05"}',
+        '{"pair_id": "band", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05", "frequency_band": "XYZ"}',
+        '{"pair_id": "days", "user1_dob": "1990-01-01", "user2_dob": "1985-05-05", "days": "many"}',
+        '{"pair_id": "b", "user1_dob": "1970-12-31", "user2_dob": "2001-02-28", "days": 3}'
+    ]
+    pairs = tmp_path / "pairs.jsonl"
+    pairs.write_text("\n".join(lines) + "\n")
+
+    assert sgc.main(["--bulk", str(pairs), "--days", "7", "--start-date", "2025-01-01"], forward=False) == 1
+    out, err = capsys.readouterr()
+    results = [json.loads(line) for line in out.splitlines()]
+
+    assert [result["pair_id"] for result in results] == ["a", "line 2", "missing", "date", "band", "days", "b"]
+    assert [("error" in result) for result in results] == [False, True, True, True, True, True, False]
+    assert "Invalid JSON" in results[1]["error"]
+    assert "Missing user1_dob" in results[2]["error"]
+    assert "Unsupported frequency band" in results[4]["error"]
+    assert len(results[6]["days"]) == 3
+    assert "2 of 7 schedules generated" in err
+
+def test_bulk_keeps_a_bounded_number_of_tasks_in_flight():
+    jobs, chunk_size = 2, 2
+    limit = jobs * sgc.BULK_TASKS_PER_JOB * chunk_size
+    pulled = []
+
+    def records():
+        for record in bulk_records(100):
+            pulled.append(record["pair_id"])
+            yield record
+
+    ahead = []
+    for position, (ok, _) in enumerate(sgc.iter_bulk_results(records(), BULK_OPTIONS, jobs=jobs, chunk_size=chunk_size)):
+        assert ok
+        ahead.append(len(pulled) - position)
+
+    # Input is read lazily: never more than the in-flight chunks ahead of the output
+    assert len(ahead) == len(pulled) == 100
+    assert max(ahead) <= limit
+    assert ahead[0] == limit
+
+@pytest.mark.parametrize("suffix, magic", [(".gz", b"\x1f\x8b"), (".xz", b"\xfd7zXZ\x00")])
+def test_compressed_files_round_trip(tmp_path, suffix, magic):
+    import io
+
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START)
+    expected = io.StringIO(newline='')
+    sgc.write_csv_schedule(expected, schedule, meta)
+
+    path = str(tmp_path / f"schedule.csv{suffix.upper() if suffix == '.xz' else suffix}")
+    assert sgc.split_compression(path) == (str(tmp_path / "schedule.csv"), path[-len(suffix):])
+    with sgc.open_output(path, newline='') as f:
+        sgc.write_csv_schedule(f, schedule, meta)
+    with open(path, "rb") as f:
+        assert f.read(len(magic)) == magic
+    # CSV line endings survive the compressor untranslated
+    with sgc.open_input(path, newline='') as f:
+        assert f.read() == expected.getvalue()
+
+@pytest.mark.parametrize("compress", ["gz", "xz"])
+def test_bulk_reads_and_writes_compressed_files(tmp_path, capsys, compress):
+    pairs = str(tmp_path / f"pairs.csv.{compress}")
+    with sgc.open_output(pairs, newline='') as f:
+        f.write("pair_id,user1_dob,user2_dob\r\na,1990-01-01,1985-05-05\r\nb,1970-12-31,2001-02-28\r\n")
+    out_dir = tmp_path / "out"
+
+    assert sgc.main(["--bulk", pairs, "--days", "7", "--start-date", "2025-01-01", "--output", "csv",
+                     "--output-dir", str(out_dir), "--compress", compress], forward=False) == 0
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert results[0]["files"] == [str(out_dir / f"a{suffix}.{compress}") for suffix in (".csv", "_quick_connect.csv")]
+
+    import io
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START)
+    expected = io.StringIO(newline='')
+    sgc.write_csv_schedule(expected, schedule, meta)
+    with sgc.open_input(results[0]["files"][0], newline='') as f:
+        assert f.read() == expected.getvalue()
+
+def test_zstd_without_zstandard(tmp_path, monkeypatch, capsys):
+    import sys
+    # A None entry makes "import zstandard" fail whether or not it is installed
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    for open_file in (sgc.open_output, sgc.open_input):
+        with pytest.raises(ValueError, match="needs the zstandard package"):
+            open_file(str(tmp_path / "schedule.csv.zst"))
+
+    pairs = tmp_path / "pairs.csv"
+    pairs.write_text("user1_dob,user2_dob\n1990-01-01,1985-05-05\n")
+    out_dir = tmp_path / "out"
+    assert sgc.main(["--bulk", str(pairs), "--output-dir", str(out_dir), "--compress", "zst"], forward=False) == 1
+    out, err = capsys.readouterr()
+    assert out == "" and "zstd compression needs the zstandard package" in err
+    assert not out_dir.exists()
+
+def ics_events(schedule, meta, **kwargs):
+    """VEVENTs of write_ics_schedule as {property: value} dicts, with folded lines joined"""
+    import io
+
+    output = io.StringIO(newline='')
+    sgc.write_ics_schedule(output, schedule, meta, **kwargs)
+    text = output.getvalue()
+    assert text.endswith("END:VCALENDAR\r\n") and "\n" not in text.replace("\r\n", "")
+    lines = text.replace("\r\n ", "").split("\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in text.split("\r\n"))
+
+    events = []
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            events.append({})
+        elif events and line != "END:VEVENT" and ":" in line:
+            name, _, value = line.partition(":")
+            events[-1].setdefault(name, value)
+    return events
+
+def split_ics_events(events):
+    windows = [event for event in events if "-qc" not in event["UID"]]
+    quick_connect = [event for event in events if "-qc" in event["UID"]]
+    return windows, quick_connect
+
+@pytest.mark.parametrize("cycles", [1, 3])
+def test_ics_windows_repeat_daily_per_rotation(cycles):
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START)
+    windows, _ = split_ics_events(ics_events(schedule, meta, cycles=cycles))
+
+    expected = []
+    for day, periods in schedule.items():
+        midnight = datetime.datetime.combine(START + datetime.timedelta(days=day - 1), datetime.time())
+        for period, window in periods.items():
+            start, end = sgc.window_minutes(window['time'])
+            expected.append((midnight + datetime.timedelta(minutes=start), midnight + datetime.timedelta(minutes=end)))
+    assert [(event["DTSTART"], event["DTEND"]) for event in windows] == \
+           [(start.strftime("%Y%m%dT%H%M%S"), end.strftime("%Y%m%dT%H%M%S")) for start, end in expected]
+    assert len({event["UID"] for event in windows}) == len(windows)
+    for event in windows:
+        assert event.get("RRULE") == (f"FREQ=DAILY;INTERVAL=7;COUNT={cycles}" if cycles > 1 else None)
+
+@pytest.mark.parametrize("cycles", [1, 2])
+def test_ics_quick_connect_repeats_hourly(cycles):
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=START)
+    _, quick_connect = split_ics_events(ics_events(schedule, meta, cycles=cycles))
+
+    until = (START + datetime.timedelta(days=7 * cycles - 1)).strftime("%Y%m%d") + "T235959"
+    assert len(quick_connect) == len(meta['quick_connect_times'])
+    for event, qc in zip(quick_connect, meta['quick_connect_times']):
+        minute = int(qc['time'].split(':')[1])
+        assert event["DTSTART"] == f"20250101T00{minute:02d}00"
+        assert event["DTEND"] == f"20250101T00{minute + 5:02d}00"
+        assert event["RRULE"] == f"FREQ=HOURLY;UNTIL={until}"
+
+def test_ics_in_a_time_zone_uses_utc_across_dst():
+    import zoneinfo
+
+    # Berlin moves from UTC+1 to UTC+2 on 2025-03-30
+    start_date = datetime.date(2025, 3, 27)
+    zone = zoneinfo.ZoneInfo("Europe/Berlin")
+    schedule, meta = sgc.generate_schedule("1990-01-01", "1985-05-05", 7, start_date=start_date)
+    windows, quick_connect = split_ics_events(ics_events(schedule, meta, cycles=2, tz="Europe/Berlin"))
+
+    def utc(date, minute):
+        local = datetime.datetime.combine(date, datetime.time()) + datetime.timedelta(minutes=minute)
+        return local.replace(tzinfo=zone).astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    uid_prefix = f"{meta['seed']}-20250327"
+    expected = {}
+    for cycle in range(2):
+        for day, periods in schedule.items():
+            date = start_date + datetime.timedelta(days=cycle * 7 + day - 1)
+            for period, window in periods.items():
+                start, end = sgc.window_minutes(window['time'])
+                expected[f"{uid_prefix}-d{day}-{period}-c{cycle + 1}@emergency-scheduler"] = (utc(date, start), utc(date, end))
+
+    # One event per window and rotation, no recurrence; local times keep their
+    # UTC offset of the day (08:00 is 07:00Z before the change, 06:00Z after)
+    assert {event["UID"]: (event["DTSTART"], event["DTEND"]) for event in windows} == expected
+    assert len(windows) == len(expected)
+    assert all("RRULE" not in event for event in windows)
+    assert utc(start_date, 8 * 60).endswith("T070000Z") and utc(datetime.date(2025, 3, 31), 8 * 60).endswith("T060000Z")
+
+    assert len(quick_connect) == len(meta['quick_connect_times'])
+    for event, qc in zip(quick_connect, meta['quick_connect_times']):
+        minute = int(qc['time'].split(':')[1])
+        assert event["DTSTART"] == utc(start_date, minute)
+        assert event["RRULE"] == "FREQ=HOURLY;UNTIL=" + utc(datetime.date(2025, 4, 9), 23 * 60 + 59)[:-3] + "59Z"
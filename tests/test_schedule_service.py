@@ -0,0 +1,230 @@
+import asyncio
+import concurrent.futures
+import datetime
+import http.client
+import io
+import json
+import threading
+import pytest
+import schedule_generator_chirp as sgc
+import schedule_service
+
+START = "2025-01-01"
+PARAMS = {"user1_dob": "1990-01-01", "user2_dob": "1985-05-05", "start_date": START}
+KEY = ("1990-01-01", "1985-05-05", 14, START, "PMRS", "ctcss")
+
+
+def test_request_key_defaults():
+    key = schedule_service.request_key({"user1_dob": "1990-01-01", "user2_dob": "1985-05-05"})
+    assert key == ("1990-01-01", "1985-05-05", 14, datetime.date.today().isoformat(), "PMRS", "ctcss")
+    assert schedule_service.request_key({**PARAMS, "days": "30", "frequency_band": "VLF", "tone_mode": "dcs"}) == \
+           ("1990-01-01", "1985-05-05", 30, START, "VLF", "dcs")
+
+@pytest.mark.parametrize("params, message", [
+    ({"user1_dob": "1990-01-01"}, "Missing parameter: user2_dob"),
+    ({**PARAMS, "user1_dob": 19900101}, "must be YYYY-MM-DD strings"),
+    ({**PARAMS, "days": "two"}, "days must be a whole number"),
+    ({**PARAMS, "days": None}, "days must be a whole number"),
+    ({**PARAMS, "days": 0}, "days must be between"),
+    ({**PARAMS, "days": schedule_service.MAX_DAYS + 1}, "days must be between"),
+    ({**PARAMS, "start_date": 20250101}, "start_date must be"),
+    ({**PARAMS, "start_date": "2025-13-01"}, "month"),
+    ({**PARAMS, "frequency_band": "XYZ"}, "Unsupported frequency band"),
+    ({**PARAMS, "frequency_band": ["PMRS"]}, "Unsupported frequency band"),
+    ({**PARAMS, "tone_mode": "none"}, "Unsupported tone mode"),
+])
+def test_request_key_rejects_bad_parameters(params, message):
+    with pytest.raises(ValueError, match=message):
+        schedule_service.request_key(params)
+
+def test_generate_batch_keeps_going_after_a_failing_key(monkeypatch):
+    generate_schedule = sgc.generate_schedule
+
+    def flaky(user1_dob, user2_dob, days, **kwargs):
+        if days == 3:
+            raise RuntimeError("worker trouble")
+        return generate_schedule(user1_dob, user2_dob, days, **kwargs)
+
+    monkeypatch.setattr(sgc, "generate_schedule", flaky)
+    bad_dob = ("1990-02-30",) + KEY[1:]
+    unexpected = KEY[:2] + (3,) + KEY[3:]
+    results = schedule_service.generate_batch([KEY, bad_dob, unexpected, KEY])
+
+    assert [status for status, _ in results] == ["ok", "error", "error", "ok"]
+    assert results[0][1] == generate_schedule("1990-01-01", "1985-05-05", 14,
+                                              start_date=datetime.date(2025, 1, 1))
+    assert results[2][1] == "Generation failed: worker trouble"
+
+def test_parse_now():
+    assert schedule_service.parse_now(None) is None
+    assert schedule_service.parse_now("2025-01-01T10:00") == datetime.datetime(2025, 1, 1, 10, 0)
+    # 10:00 at UTC+2 is 09:00 in Berlin in winter
+    assert schedule_service.parse_now("2025-01-01T10:00+02:00", "Europe/Berlin") == datetime.datetime(2025, 1, 1, 9, 0)
+    with pytest.raises(ValueError, match="UTC offset"):
+        schedule_service.parse_now("2025-01-01T10:00+02:00")
+    with pytest.raises(ValueError, match="Unknown time zone"):
+        schedule_service.parse_now("2025-01-01T10:00+02:00", "Mars/Olympus")
+
+def run_with_thread_pool(service, coroutine):
+    """Run a coroutine against the service's batcher, with a thread pool standing in for the process pool"""
+    async def main():
+        service.pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        service.queue = asyncio.Queue()
+        service.batcher = asyncio.create_task(service._run_batcher())
+        try:
+            return await coroutine
+        finally:
+            service.close()
+    return asyncio.run(main())
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Record every batch handed to the pool"""
+    seen = []
+    generate_batch = schedule_service.generate_batch
+
+    def recording(keys):
+        seen.append(list(keys))
+        return generate_batch(keys)
+
+    monkeypatch.setattr(schedule_service, "generate_batch", recording)
+    return seen
+
+def test_identical_requests_share_one_generation(batches):
+    service = schedule_service.ScheduleService(batch_delay=0.05)
+    other = KEY[:2] + (7,) + KEY[3:]
+
+    async def requests():
+        results = await asyncio.gather(*(service.generate(key) for key in [KEY] * 5 + [other]))
+        assert service.pending == {}
+        return results
+
+    results = run_with_thread_pool(service, requests())
+    assert all(result is results[0] for result in results[:5])
+    assert len(results[5][0]) == 7
+    assert sorted(key for batch in batches for key in batch) == sorted([KEY, other])
+
+def test_cache_serves_repeats_and_evicts_the_oldest(batches):
+    service = schedule_service.ScheduleService(batch_delay=0, cache_size=2)
+    keys = [KEY[:2] + (days,) + KEY[3:] for days in (1, 2, 3)]
+
+    async def requests():
+        first = await service.generate(keys[0])
+        assert await service.generate(keys[0]) is first
+        await service.generate(keys[1])
+        await service.generate(keys[0])     # now the most recent
+        await service.generate(keys[2])     # evicts keys[1]
+        assert list(service.cache) == [keys[0], keys[2]]
+        await service.generate(keys[1])
+
+    run_with_thread_pool(service, requests())
+    assert [batch for batch in batches] == [[keys[0]], [keys[1]], [keys[2]], [keys[1]]]
+
+def test_a_failing_key_does_not_fail_its_batch(batches):
+    service = schedule_service.ScheduleService(batch_delay=0.05)
+    bad = ("1990-02-30",) + KEY[1:]
+
+    async def requests():
+        return await asyncio.gather(service.generate(KEY), service.generate(bad), return_exceptions=True)
+
+    good, error = run_with_thread_pool(service, requests())
+    assert len(batches) == 1
+    assert good[1]["start_date"] == START
+    assert isinstance(error, ValueError)
+    assert KEY in service.cache and bad not in service.cache
+
+@pytest.fixture(scope="module")
+def server():
+    """A real service on an ephemeral port, running its event loop in a background thread"""
+    loop = asyncio.new_event_loop()
+    service = schedule_service.ScheduleService(jobs=1)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    http_server = asyncio.run_coroutine_threadsafe(service.start("127.0.0.1", 0), loop).result(60)
+    yield http_server.sockets[0].getsockname()[1]
+
+    async def stop():
+        http_server.close()
+        await http_server.wait_closed()
+        service.close()
+
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(60)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        connection.request(method, path, body=None if body is None else json.dumps(body))
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read().decode("utf-8")
+    finally:
+        connection.close()
+
+def local(days=14, **kwargs):
+    return sgc.generate_schedule("1990-01-01", "1985-05-05", days, start_date=datetime.date(2025, 1, 1), **kwargs)
+
+def test_health(server):
+    status, content_type, body = request(server, "GET", "/health")
+    assert (status, content_type) == (200, "application/json")
+    assert json.loads(body)["status"] == "ok"
+
+def test_generate_matches_the_generator(server):
+    status, _, body = request(server, "GET", "/generate?user1_dob=1990-01-01&user2_dob=1985-05-05&start_date=2025-01-01&days=7")
+    assert status == 200
+    assert json.loads(body) == json.loads(json.dumps(sgc.schedule_to_json(*local(7))))
+
+    # Parameters in a POST body work the same way
+    status, _, posted = request(server, "POST", "/generate", {**PARAMS, "days": 7})
+    assert (status, posted) == (200, body)
+
+def test_next_window(server):
+    schedule, meta = local()
+    status, _, body = request(server, "POST", "/next-window", {**PARAMS, "now": "2025-01-03T12:00"})
+    found = sgc.find_next_window(schedule, datetime.date(2025, 1, 1), datetime.datetime(2025, 1, 3, 12, 0))
+    assert status == 200
+    data = json.loads(body)
+    assert (data["day"], data["period"], data["start"]) == \
+           (found["day"], found["period"], found["start"].isoformat(timespec="minutes"))
+    assert data["quick_connect_times"] == meta["quick_connect_times"]
+
+    # A time with an offset is read in the pair's zone: 11:00Z is 12:00 in Berlin
+    status, _, converted = request(server, "POST", "/next-window",
+                                   {**PARAMS, "now": "2025-01-03T11:00+00:00", "tz": "Europe/Berlin"})
+    assert (status, converted) == (200, body)
+
+def test_next_window_rejects_an_offset_without_a_zone(server):
+    status, _, body = request(server, "POST", "/next-window", {**PARAMS, "now": "2025-01-01T10:00+02:00"})
+    assert status == 400
+    assert "UTC offset" in json.loads(body)["error"]
+
+@pytest.mark.parametrize("export_format", sorted(schedule_service.EXPORT_FORMATS))
+def test_export_matches_the_writers(server, export_format):
+    schedule, meta = local()
+    writer, content_type = schedule_service.EXPORT_FORMATS[export_format]
+    expected = io.StringIO(newline='')
+    writer(expected, schedule, meta)
+
+    status, response_type, body = request(server, "POST", "/export", {**PARAMS, "format": export_format})
+    assert (status, response_type, body) == (200, content_type, expected.getvalue())
+
+def test_export_ics_in_a_time_zone(server):
+    schedule, meta = local()
+    expected = io.StringIO(newline='')
+    sgc.write_ics_schedule(expected, schedule, meta, tz="Europe/Berlin")
+    status, _, body = request(server, "POST", "/export", {**PARAMS, "format": "ics", "tz": "Europe/Berlin"})
+    assert (status, body) == (200, expected.getvalue())
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("GET", "/nowhere", None, 404),
+    ("DELETE", "/generate", None, 405),
+    ("POST", "/generate", {"user1_dob": "1990-01-01"}, 400),
+    ("POST", "/generate", [1, 2], 400),
+    ("POST", "/generate", {**PARAMS, "user1_dob": "1990-02-30"}, 400),
+    ("POST", "/export", {**PARAMS, "format": "pdf"}, 400),
+])
+def test_errors(server, method, path, body, status):
+    response_status, content_type, response = request(server, method, path, body)
+    assert (response_status, content_type) == (status, "application/json")
+    assert json.loads(response)["error"]
@@ -0,0 +1,82 @@
+import datetime
+import json
+import os
+from multiprocessing import shared_memory
+import pytest
+import schedule_generator_chirp as sgc
+import schedule_shm
+
+START = "2025-01-01"
+
+
+def keys(count, tone_mode="ctcss", days=5):
+    return [(f"p{i}", (datetime.date(1950, 1, 1) + datetime.timedelta(days=97 * i)).isoformat(),
+             (datetime.date(1960, 6, 1) + datetime.timedelta(days=53 * i)).isoformat(),
+             days, START, "PMRS", tone_mode)
+            for i in range(count)]
+
+def generated(key):
+    pair_id, user1_dob, user2_dob, days, start_date, frequency_band, tone_mode = key
+    return (pair_id,) + sgc.generate_schedule(user1_dob, user2_dob, days, start_date=datetime.date.fromisoformat(start_date),
+                                              frequency_band=frequency_band, tone_mode=tone_mode)
+
+def exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+def shm_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+@pytest.mark.parametrize("tone_mode", sgc.TONE_MODES)
+def test_pack_and_attach_round_trip(tone_mode):
+    items = [generated(key) for key in keys(3, tone_mode)]
+    with schedule_shm.ScheduleBlock(schedule_shm.pack_schedules(items)) as block:
+        assert len(block) == 3
+        for i, (pair_id, schedule, meta) in enumerate(items):
+            read_id, read_schedule, read_meta = block.schedule(i)
+            assert (read_id, read_schedule) == (pair_id, schedule)
+            assert json.dumps(read_meta, sort_keys=True) == json.dumps(meta, sort_keys=True)
+            assert read_meta["channel_frequencies"] == meta["channel_frequencies"]
+            assert block.pair_windows(i).shape == (5, len(meta["windows"]))
+
+def test_release_frees_the_block_and_close_does_not():
+    name = schedule_shm.pack_schedules([generated(key) for key in keys(1)])
+    block = schedule_shm.ScheduleBlock(name)
+    block.close()
+    assert exists(name)
+
+    block = schedule_shm.ScheduleBlock(name)
+    block.release()
+    block.release()
+    assert block.pairs is None and not exists(name)
+
+def test_attach_rejects_other_blocks():
+    shm = shared_memory.SharedMemory(create=True, size=schedule_shm.HEADER_SIZE)
+    try:
+        with pytest.raises(ValueError, match="Not a schedule block"):
+            schedule_shm.ScheduleBlock(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+def test_generate_blocks_yields_every_pair_in_order():
+    all_keys = keys(7)
+    pair_ids = []
+    for block in schedule_shm.generate_blocks(all_keys, jobs=2, pairs_per_block=3):
+        with block:
+            assert len(block) <= 3
+            pair_ids += [pair_id for pair_id, _, _ in block.schedules()]
+            assert block.schedule(0)[1] == generated(all_keys[len(pair_ids) - len(block)])[1]
+    assert pair_ids == [key[0] for key in all_keys]
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs /dev/shm to list shared memory blocks")
+def test_stopping_generate_blocks_early_frees_the_rest():
+    before = shm_blocks()
+    blocks = schedule_shm.generate_blocks(keys(12, days=2), jobs=2, pairs_per_block=2)
+    first = next(blocks)
+    first.release()
+    blocks.close()
+    assert shm_blocks() == before
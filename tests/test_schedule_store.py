@@ -0,0 +1,122 @@
+import datetime
+import json
+import sqlite3
+import pytest
+import schedule_generator_chirp as sgc
+import schedule_store
+
+START = datetime.date(2025, 1, 1)
+
+
+@pytest.fixture
+def conn():
+    conn = schedule_store.open_store(":memory:")
+    yield conn
+    conn.close()
+
+def pair(pair_id, user1_dob, user2_dob, days=7, **kwargs):
+    return (pair_id,) + sgc.generate_schedule(user1_dob, user2_dob, days, start_date=START, **kwargs)
+
+def expected_windows(items, cycles):
+    """Every stored window computed straight from the schedules"""
+    rows = []
+    for pair_id, schedule, meta in items:
+        for cycle in range(cycles):
+            for day, periods in schedule.items():
+                date = START + datetime.timedelta(days=cycle * len(schedule) + day - 1)
+                for period, window in periods.items():
+                    start, end = sgc.window_minutes(window['time'])
+                    midnight = datetime.datetime.combine(date, datetime.time())
+                    rows.append((pair_id, day, period, midnight + datetime.timedelta(minutes=start),
+                                 midnight + datetime.timedelta(minutes=end), window))
+    return rows
+
+def as_tuple(row):
+    return tuple(row[column] for column in schedule_store.WINDOW_COLUMNS)
+
+def test_pair_windows_round_trip(conn):
+    items = [pair("a", "1990-01-01", "1985-05-05"), pair("b", "1970-12-31", "2001-02-28", tone_mode="dcs")]
+    assert schedule_store.store_schedules(conn, items, cycles=2) == 2
+
+    for pair_id, schedule, meta in items:
+        rows = schedule_store.pair_windows(conn, pair_id)
+        expected = [row for row in expected_windows(items, 2) if row[0] == pair_id]
+        assert len(rows) == len(expected) == 2 * 7 * len(meta['windows'])
+        for row, (_, day, period, start, end, window) in zip(rows, sorted(expected, key=lambda row: (row[1], row[3]))):
+            assert as_tuple(row) == (pair_id, day, period, start.strftime(schedule_store.DATETIME_FORMAT),
+                                     end.strftime(schedule_store.DATETIME_FORMAT), window['channel'],
+                                     window['frequency'], window['ctcss'], window.get('dcs'))
+        assert [row['day'] for row in schedule_store.pair_windows(conn, pair_id, day=3)] == [3] * 2 * len(meta['windows'])
+
+        stored = conn.execute("SELECT * FROM pairs WHERE pair_id = ?", (pair_id,)).fetchone()
+        assert (stored['start_date'], stored['cycle_days']) == (meta['start_date'], 7)
+        assert json.loads(stored['meta']) == json.loads(json.dumps(meta))
+
+def test_reinserting_a_pair_replaces_it(conn):
+    schedule_store.store_schedules(conn, [pair("a", "1990-01-01", "1985-05-05"), pair("b", "1970-12-31", "2001-02-28")])
+    replacement = pair("a", "1960-06-01", "1965-07-02", days=3)
+    schedule_store.store_schedules(conn, [replacement])
+    schedule_store.store_schedules(conn, [replacement])
+
+    assert conn.execute("SELECT COUNT(*) FROM pairs").fetchone()[0] == 2
+    rows = schedule_store.pair_windows(conn, "a")
+    assert len(rows) == 3 * len(replacement[2]['windows'])
+    assert [row['channel'] for row in rows] == \
+           [window['channel'] for periods in replacement[1].values() for window in periods.values()]
+    assert len(schedule_store.pair_windows(conn, "b")) == 7 * 3
+
+def test_windows_at_and_channel_windows_match_brute_force(conn):
+    items = [pair(f"p{i}", (datetime.date(1950, 1, 1) + datetime.timedelta(days=97 * i)).isoformat(),
+                  (datetime.date(1960, 6, 1) + datetime.timedelta(days=53 * i)).isoformat(), frequency_band="VLF")
+             for i in range(20)]
+    schedule_store.store_schedules(conn, items)
+    expected = expected_windows(items, 1)
+
+    found = 0
+    for minutes in range(0, 7 * 1440, 7):
+        at = datetime.datetime.combine(START, datetime.time()) + datetime.timedelta(minutes=minutes)
+        rows = [(row['pair_id'], row['day'], row['period']) for row in schedule_store.windows_at(conn, at)]
+        brute = [(pair_id, day, period) for pair_id, day, period, start, end, _ in expected if start <= at < end]
+        assert sorted(rows) == sorted(brute)
+        found += len(rows)
+
+        channel_rows = schedule_store.windows_at(conn, at, channel=3)
+        assert all(row['channel'] == 3 for row in channel_rows)
+    assert found > 0
+
+    start = datetime.datetime(2025, 1, 2)
+    end = datetime.datetime(2025, 1, 4)
+    rows = schedule_store.channel_windows(conn, 3, start, end)
+    assert sorted((row['pair_id'], row['day'], row['period']) for row in rows) == \
+           sorted((pair_id, day, period) for pair_id, day, period, window_start, _, window in expected
+                  if window['channel'] == 3 and start <= window_start < end)
+
+def test_windows_past_midnight(conn):
+    schedule = {1: {"night": {"time": "23:50 - 00:10", "channel": 1, "frequency": "462.5625", "ctcss": 67.0}}}
+    schedule_store.store_schedules(conn, [("n", schedule, {"start_date": "2025-01-01", "cycle_days": 1})], cycles=2)
+
+    row = schedule_store.pair_windows(conn, "n")[0]
+    assert (row['datetime'], row['end_datetime']) == ("2025-01-01 23:50", "2025-01-02 00:10")
+    assert [row['datetime'] for row in schedule_store.windows_at(conn, datetime.datetime(2025, 1, 2, 0, 5))] == \
+           ["2025-01-01 23:50"]
+    assert schedule_store.windows_at(conn, datetime.datetime(2025, 1, 2, 0, 10)) == []
+
+def test_file_store_is_reopened_and_migrated(tmp_path):
+    path = str(tmp_path / "store.db")
+    # A store from before DCS support
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE windows (pair_id TEXT NOT NULL, day INTEGER NOT NULL, period TEXT NOT NULL, "
+                "datetime TEXT NOT NULL, end_datetime TEXT NOT NULL, channel INTEGER NOT NULL, "
+                "frequency TEXT NOT NULL, ctcss REAL)")
+    old.close()
+
+    conn = schedule_store.open_store(path)
+    schedule_store.store_schedules(conn, [pair("a", "1990-01-01", "1985-05-05", tone_mode="split")])
+    conn.close()
+
+    conn = schedule_store.open_store(path)
+    try:
+        rows = schedule_store.pair_windows(conn, "a")
+        assert rows and all(row['dcs'] is not None for row in rows)
+    finally:
+        conn.close()
@@ -0,0 +1,81 @@
+import datetime
+import zoneinfo
+import numpy as np
+import pytest
+import schedule_generator_chirp as sgc
+import schedule_timezone as stz
+
+BERLIN = "Europe/Berlin"
+
+
+def local_seconds(text):
+    return int((datetime.datetime.fromisoformat(text) - stz.EPOCH).total_seconds())
+
+def utc_seconds(text):
+    return int(datetime.datetime.fromisoformat(text).replace(tzinfo=datetime.timezone.utc).timestamp())
+
+def brute_force_utc(date, minute, tz):
+    # One datetime at a time, fold=0 as in schedule_timezone
+    local = datetime.datetime.combine(date, datetime.time()) + datetime.timedelta(minutes=int(minute))
+    return int(local.replace(tzinfo=zoneinfo.ZoneInfo(tz)).timestamp())
+
+@pytest.mark.parametrize("local, utc", [
+    ("2025-03-30 01:30", "2025-03-30 00:30"),  # before the spring-forward gap (+1)
+    ("2025-03-30 02:30", "2025-03-30 01:30"),  # in the gap: moved forward to 03:30 (+2)
+    ("2025-03-30 03:30", "2025-03-30 01:30"),  # after the gap (+2)
+    ("2025-10-26 02:30", "2025-10-26 00:30"),  # repeated hour: first pass (+2)
+    ("2025-10-26 03:30", "2025-10-26 02:30"),  # after the fall-back (+1)
+])
+def test_local_to_utc_across_dst(local, utc):
+    assert stz.local_to_utc([local_seconds(local)], BERLIN).tolist() == [utc_seconds(utc)]
+
+def test_utc_to_local_inverts_outside_the_gap():
+    times = [local_seconds(text) for text in ("2025-03-29 23:59", "2025-03-30 03:00", "2025-10-26 02:00",
+                                              "2025-10-26 03:00", "2025-12-31 12:00")]
+    assert stz.utc_to_local(stz.local_to_utc(times, BERLIN), BERLIN).tolist() == times
+
+def test_materialize_windows_on_dst_days():
+    # Windows starting in the gap and in the repeated hour
+    window = {"time": "02:15 - 03:45", "channel": 1, "frequency": "446.00625", "ctcss": 67.0}
+    schedule = {1: {"morning": dict(window)}, 2: {"morning": dict(window)}}
+
+    spring = stz.materialize_utc(schedule, datetime.date(2025, 3, 29), BERLIN)
+    assert spring["start"].tolist() == [utc_seconds("2025-03-29 01:15"), utc_seconds("2025-03-30 01:15")]
+    assert spring["end"].tolist() == [utc_seconds("2025-03-29 02:45"), utc_seconds("2025-03-30 01:45")]
+
+    autumn = stz.materialize_utc(schedule, datetime.date(2025, 10, 26), BERLIN)
+    assert autumn["start"].tolist() == [utc_seconds("2025-10-26 00:15"), utc_seconds("2025-10-27 01:15")]
+    assert autumn["end"].tolist() == [utc_seconds("2025-10-26 02:45"), utc_seconds("2025-10-27 02:45")]
+
+@pytest.mark.parametrize("tz, start_date", [
+    (BERLIN, datetime.date(2025, 3, 20)),
+    (BERLIN, datetime.date(2025, 10, 20)),
+    ("America/New_York", datetime.date(2025, 3, 1)),
+    ("Australia/Lord_Howe", datetime.date(2025, 3, 30)),
+])
+def test_materialize_matches_brute_force(tz, start_date):
+    schedule, _ = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=start_date)
+    timeline = stz.materialize_utc(schedule, start_date, tz, cycles=3)
+
+    expected = []
+    for cycle in range(3):
+        for day in range(1, 15):
+            date = start_date + datetime.timedelta(days=cycle * 14 + day - 1)
+            for window in schedule[day].values():
+                start_minute, end_minute = sgc.window_minutes(window['time'])
+                expected.append((brute_force_utc(date, start_minute, tz), brute_force_utc(date, end_minute, tz),
+                                 day, window['channel'], cycle))
+
+    actual = list(zip(timeline["start"].tolist(), timeline["end"].tolist(), timeline["day"].tolist(),
+                      timeline["channel"].tolist(), timeline["cycle"].tolist()))
+    assert sorted(actual) == sorted(expected)
+    assert np.all(np.diff(timeline["start"]) >= 0)
+
+def test_windows_at_matches_brute_force():
+    start_date = datetime.date(2025, 3, 28)
+    schedule, _ = sgc.generate_schedule("1970-12-31", "2001-02-28", 7, start_date=start_date)
+    timeline = stz.materialize_utc(schedule, start_date, BERLIN)
+
+    for at in range(utc_seconds("2025-03-28 00:00"), utc_seconds("2025-04-04 00:00"), 7 * 60):
+        expected = [i for i in range(len(timeline["start"])) if timeline["start"][i] <= at < timeline["end"][i]]
+        assert stz.windows_at(timeline, at).tolist() == expected
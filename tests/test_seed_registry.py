@@ -0,0 +1,93 @@
+import datetime
+import hashlib
+import pickle
+import pytest
+import schedule_generator_chirp as sgc
+import seed_registry
+
+START = datetime.date(2025, 1, 1)
+# Far below KDF_ITERATIONS; the tests only need the derivation, not its cost
+ITERATIONS = 10
+
+
+@pytest.fixture
+def derivations(monkeypatch):
+    """Count PBKDF2 runs"""
+    calls = []
+    pbkdf2_hmac = hashlib.pbkdf2_hmac
+
+    def counting(*args):
+        calls.append(args)
+        return pbkdf2_hmac(*args)
+
+    monkeypatch.setattr(hashlib, "pbkdf2_hmac", counting)
+    return calls
+
+def test_plain_seeds_match_dob_generation():
+    registry = seed_registry.SeedRegistry()
+    for user1_dob, user2_dob in [("1990-01-01", "1985-05-05"), ("1970-12-31", "2001-02-28")]:
+        assert registry.generate(user1_dob, user2_dob, 14, start_date=START) == \
+               sgc.generate_schedule(user1_dob, user2_dob, 14, start_date=START)
+
+def test_keyed_seeds_differ_and_are_stable():
+    plain = sgc.generate_schedule("1990-01-01", "1985-05-05", 14, start_date=START)
+    keyed = seed_registry.SeedRegistry("correct horse", "roster-1", ITERATIONS)
+    schedule, meta = keyed.generate("1990-01-01", "1985-05-05", 14, start_date=START)
+    assert schedule != plain[0]
+
+    # Same settings in a fresh registry give the same schedule; any other setting does not
+    assert seed_registry.SeedRegistry("correct horse", "roster-1", ITERATIONS).generate(
+        "1990-01-01", "1985-05-05", 14, start_date=START) == (schedule, meta)
+    for passphrase, salt, iterations in [("correct horse", "roster-2", ITERATIONS),
+                                         ("battery staple", "roster-1", ITERATIONS),
+                                         ("correct horse", "roster-1", ITERATIONS + 1)]:
+        other = seed_registry.SeedRegistry(passphrase, salt, iterations)
+        assert other.generate("1990-01-01", "1985-05-05", 14, start_date=START)[0] != schedule
+
+    # The date fields still come from the DOB
+    seed = keyed.seed("1990-01-01")
+    assert (seed.year, seed.month, seed.day) == (1990, 1, 1)
+    assert seed.hash != sgc.person_seed("1990-01-01").hash
+
+def test_each_person_is_derived_once(derivations):
+    registry = seed_registry.SeedRegistry("correct horse", "roster-1", ITERATIONS)
+    pairs = [("1990-01-01", "1985-05-05"), ("1990-01-01", "1970-12-31"), ("1985-05-05", "1970-12-31")]
+    for user1_dob, user2_dob in pairs:
+        registry.generate(user1_dob, user2_dob, 7, start_date=START)
+    assert len(derivations) == len(registry) == 3
+
+    # Zero padding does not make a new person
+    assert registry.seed("1990-1-1") is registry.seed("1990-01-01")
+    assert "1990-1-01" in registry and "1991-01-01" not in registry and "not a date" not in registry
+    assert len(derivations) == 3
+
+def test_invalid_dob():
+    with pytest.raises(ValueError, match="Invalid date format"):
+        seed_registry.SeedRegistry().seed("1990-02-30")
+
+@pytest.mark.parametrize("passphrase, salt", [(None, None), ("correct horse", "roster-1")])
+def test_pickled_registries_resolve_to_the_shared_one(passphrase, salt):
+    registry = seed_registry.SeedRegistry(passphrase, salt, ITERATIONS)
+    registry.seed("1990-01-01")
+
+    copy = pickle.loads(pickle.dumps(registry))
+    assert copy is seed_registry._shared_registry(passphrase, salt, ITERATIONS)
+    assert pickle.loads(pickle.dumps(registry)) is copy
+    assert copy is not registry
+    assert copy.seed("1990-01-01") == registry.seed("1990-01-01")
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"passphrase": "correct horse"}, "needs a salt"),
+    ({"iterations": 0}, "at least 1"),
+])
+def test_bad_settings(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        seed_registry.SeedRegistry(**kwargs)
+
+def test_read_passphrase(tmp_path):
+    path = tmp_path / "passphrase"
+    path.write_text("correct horse\r\nignored\n")
+    assert seed_registry.read_passphrase(str(path)) == "correct horse"
+    path.write_text("\n")
+    with pytest.raises(ValueError, match="No passphrase"):
+        seed_registry.read_passphrase(str(path))
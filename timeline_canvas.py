@@ -0,0 +1,308 @@
+import argparse
+import datetime
+import tkinter as tk
+from tkinter import ttk
+import schedule_generator_chirp as sgc
+
+# The timeline is drawn in tiles of TILE_DAYS days (whole 7-day blocks), and
+# only the tiles in view plus TILE_MARGIN on either side exist on the canvas
+TILE_DAYS = 28
+TILE_MARGIN = 1
+
+# Level of detail by pixels per day: below WEEK_LOD_WIDTH a heatmap of channel
+# use per 7 days, below LABEL_LOD_WIDTH bare window bars, above that labelled windows
+WEEK_LOD_WIDTH = 4
+LABEL_LOD_WIDTH = 40
+MIN_DAY_WIDTH = 0.25
+MAX_DAY_WIDTH = 240
+ZOOM_STEP = 1.25
+
+HEADER_HEIGHT = 20
+AXIS_WIDTH = 50
+MIN_BAR_HEIGHT = 6
+
+# Bar colours cycle through this palette by channel
+CHANNEL_COLOURS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+                   "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf")
+
+
+def timeline_days(schedule):
+    """
+    Flatten a schedule for drawing.
+
+    Returns:
+    - List with one entry per day (day 1 first) of (start, end, channel, period,
+      frequency, tone) tuples, start/end in minutes after midnight
+    """
+    days = []
+    for day in range(1, len(schedule) + 1):
+        windows = []
+        for period, window in schedule[day].items():
+            start, end = sgc.window_minutes(window['time'])
+            windows.append((start, end, window['channel'], period, window['frequency'], sgc.format_tone(window)))
+        days.append(windows)
+    return days
+
+def week_channel_counts(days, channels):
+    """
+    Count the windows on each channel per 7-day block from the first day.
+
+    Parameters:
+    - days: Output of timeline_days
+    - channels: Sorted list of the channels to count
+
+    Returns:
+    - Array of shape (number of 7-day blocks, len(channels))
+    """
+    # NumPy is only loaded once there is a schedule to count, so building an
+    # empty timeline (as the GUI does at startup) stays cheap
+    import numpy as np
+
+    column = {channel: i for i, channel in enumerate(channels)}
+    weeks = np.array([day // 7 for day, windows in enumerate(days) for _ in windows], dtype=np.int64)
+    columns = np.array([column[window[2]] for windows in days for window in windows], dtype=np.int64)
+    counts = np.zeros(((len(days) + 6) // 7, len(channels)), dtype=np.int32)
+    np.add.at(counts, (weeks, columns), 1)
+    return counts
+
+def _heat_colour(fraction):
+    """White (unused) to dark blue (used every window)"""
+    shade = 255 - int(round(fraction * 200))
+    return f"#{shade:02x}{shade:02x}ff" if fraction else "#ffffff"
+
+class ScheduleTimeline(ttk.Frame):
+    """
+    Zoomable timeline of a schedule: days run left to right, the time of day top
+    to bottom.
+
+    The mouse wheel zooms around the pointer, dragging pans. The canvas is
+    drawn in world coordinates (day * day width) and scrolled by Tk, so panning
+    moves no items; tiles coming into view are drawn and tiles far out of view
+    deleted, so the item count depends on the window size rather than the
+    length of the schedule. Zooming out far enough switches to a heatmap of
+    channel use per 7 days.
+    """
+
+    def __init__(self, parent, schedule=None, meta=None, start_date=None):
+        super().__init__(parent)
+        self.day_width = 24.0
+        self.days = []
+        self.tiles = {}
+
+        self.axis = tk.Canvas(self, width=AXIS_WIDTH, background="white", highlightthickness=0)
+        self.axis.grid(row=0, column=0, sticky="ns")
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        self.canvas.grid(row=0, column=1, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self._on_scroll)
+        self.scrollbar.grid(row=1, column=1, sticky="ew")
+        self.info_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.info_var, anchor=tk.W).grid(row=2, column=0, columnspan=2, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+
+        self.canvas.configure(xscrollcommand=self._on_xview)
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<ButtonPress-1>", lambda event: self.canvas.scan_mark(event.x, 0))
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom(ZOOM_STEP if event.delta > 0 else 1 / ZOOM_STEP, event.x))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(ZOOM_STEP, event.x))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(1 / ZOOM_STEP, event.x))
+        self.canvas.bind("<Motion>", self._on_motion)
+
+        if schedule:
+            self.set_schedule(schedule, meta, start_date)
+
+    def set_schedule(self, schedule, meta=None, start_date=None):
+        """Show a schedule; start_date defaults to the one in meta"""
+        if start_date is None:
+            start_date = datetime.date.fromisoformat(meta['start_date']) if meta and meta.get('start_date') else datetime.date.today()
+        self.start_date = start_date
+        self.days = timeline_days(schedule)
+        self.channels = sorted({window[2] for windows in self.days for window in windows})
+        self.week_counts = week_channel_counts(self.days, self.channels)
+        self.week_max = max(7 * max((len(windows) for windows in self.days), default=1), 1)
+
+        # Fit the whole schedule when it is short, otherwise start at a readable zoom
+        width = max(self.canvas.winfo_width(), 200)
+        self.day_width = min(max(width / max(len(self.days), 1), 24.0), MAX_DAY_WIDTH)
+        self.redraw(first_day=0)
+
+    def level(self):
+        """Current level of detail: 'weeks', 'days' or 'windows'"""
+        if self.day_width < WEEK_LOD_WIDTH:
+            return "weeks"
+        return "days" if self.day_width < LABEL_LOD_WIDTH else "windows"
+
+    def zoom(self, factor, x=None):
+        """Zoom by factor, keeping the day under canvas x (default: the centre) in place"""
+        if not self.days:
+            return
+        x = self.canvas.winfo_width() / 2 if x is None else x
+        day = self.canvas.canvasx(x) / self.day_width
+        self.day_width = min(max(self.day_width * factor, MIN_DAY_WIDTH), MAX_DAY_WIDTH)
+        self.redraw(first_day=day - x / self.day_width)
+
+    def redraw(self, first_day=None):
+        """Drop every tile and draw the visible ones at the current zoom"""
+        if first_day is None:
+            first_day = self.canvas.canvasx(0) / self.day_width if self.tiles else 0
+        self.canvas.delete("all")
+        self.tiles = {}
+        self._draw_axis()
+        if not self.days:
+            return
+
+        total = len(self.days) * self.day_width
+        self.canvas.configure(scrollregion=(0, 0, total, self.canvas.winfo_height()))
+        self.canvas.xview_moveto(max(first_day, 0) * self.day_width / total)
+        self.update_tiles()
+
+    def update_tiles(self):
+        """Draw the tiles coming into view and delete those well outside it"""
+        if not self.days:
+            return
+        tile_width = TILE_DAYS * self.day_width
+        left = self.canvas.canvasx(0)
+        right = left + self.canvas.winfo_width()
+        last_tile = (len(self.days) - 1) // TILE_DAYS
+        first = max(int(left // tile_width) - TILE_MARGIN, 0)
+        last = min(int(right // tile_width) + TILE_MARGIN, last_tile)
+
+        for tile in [tile for tile in self.tiles if not first <= tile <= last]:
+            self.canvas.delete(f"tile{tile}")
+            del self.tiles[tile]
+        for tile in range(first, last + 1):
+            if tile not in self.tiles:
+                self._draw_tile(tile)
+                self.tiles[tile] = True
+
+    def _on_scroll(self, *args):
+        self.canvas.xview(*args)
+        self.update_tiles()
+
+    def _on_xview(self, first, last):
+        self.scrollbar.set(first, last)
+
+    def _on_drag(self, event):
+        self.canvas.scan_dragto(event.x, 0, gain=1)
+        self.update_tiles()
+
+    def _body_height(self):
+        return max(self.canvas.winfo_height() - HEADER_HEIGHT, 1)
+
+    def _draw_axis(self):
+        self.axis.delete("all")
+        height = self._body_height()
+        if self.level() == "weeks":
+            rows = len(self.channels) or 1
+            step = max(1, int(rows / (height / 14)))
+            for i in range(0, len(self.channels), step):
+                y = HEADER_HEIGHT + (i + 0.5) * height / rows
+                self.axis.create_text(AXIS_WIDTH - 4, y, text=f"Ch {self.channels[i]}", anchor=tk.E, font=("Arial", 8))
+        else:
+            for hour in range(0, 25, 3):
+                y = HEADER_HEIGHT + hour * height / 24
+                self.axis.create_text(AXIS_WIDTH - 4, y, text=f"{hour:02d}:00", anchor=tk.E, font=("Arial", 8))
+
+    def _draw_tile(self, tile):
+        tag = f"tile{tile}"
+        first_day = tile * TILE_DAYS
+        last_day = min(first_day + TILE_DAYS, len(self.days))
+        height = self._body_height()
+        create_rectangle = self.canvas.create_rectangle
+        create_text = self.canvas.create_text
+
+        if self.level() == "weeks":
+            rows = len(self.channels) or 1
+            row_height = height / rows
+            for week in range(first_day // 7, (last_day + 6) // 7):
+                x0 = week * 7 * self.day_width
+                x1 = min((week + 1) * 7, len(self.days)) * self.day_width
+                for i, count in enumerate(self.week_counts[week].tolist()):
+                    if count:
+                        y0 = HEADER_HEIGHT + i * row_height
+                        create_rectangle(x0, y0, x1, y0 + row_height, fill=_heat_colour(count / self.week_max),
+                                         outline="", tags=tag)
+                # Month labels on the first block of each month
+                date = self.start_date + datetime.timedelta(days=week * 7)
+                if date.day <= 7:
+                    create_text(x0 + 2, HEADER_HEIGHT / 2, text=date.strftime("%b %Y" if date.month == 1 else "%b"),
+                                anchor=tk.W, font=("Arial", 8), tags=tag)
+            return
+
+        labelled = self.level() == "windows"
+        for day in range(first_day, last_day):
+            x0 = day * self.day_width
+            x1 = x0 + self.day_width
+            date = self.start_date + datetime.timedelta(days=day)
+            if labelled or date.weekday() == 0:
+                create_text(x0 + 2, HEADER_HEIGHT / 2, text=date.strftime("%d %b" if labelled else "%d/%m"),
+                            anchor=tk.W, font=("Arial", 8), tags=tag)
+                create_rectangle(x0, HEADER_HEIGHT, x0, HEADER_HEIGHT + height, outline="#e0e0e0", tags=tag)
+            for start, end, channel, period, frequency, tone in self.days[day]:
+                y0 = HEADER_HEIGHT + start * height / 1440
+                y1 = max(HEADER_HEIGHT + end * height / 1440, y0 + MIN_BAR_HEIGHT)
+                create_rectangle(x0 + 1, y0, x1 - 1, y1, fill=CHANNEL_COLOURS[channel % len(CHANNEL_COLOURS)],
+                                 outline="", tags=tag)
+                if labelled:
+                    label = f"Ch {channel} {tone}" if self.day_width >= 90 else str(channel)
+                    create_text(x0 + self.day_width / 2, y1 + 1, text=label, anchor=tk.N, font=("Arial", 7), tags=tag)
+
+    def _on_motion(self, event):
+        if not self.days:
+            return
+        day = int(self.canvas.canvasx(event.x) // self.day_width)
+        if not 0 <= day < len(self.days):
+            return
+        height = self._body_height()
+
+        if self.level() == "weeks":
+            row = int((event.y - HEADER_HEIGHT) * (len(self.channels) or 1) // height)
+            if 0 <= row < len(self.channels):
+                week = day // 7
+                date = self.start_date + datetime.timedelta(days=week * 7)
+                self.info_var.set(f"Week from {date.isoformat()}: channel {self.channels[row]} "
+                                  f"in {self.week_counts[week, row]} window(s)")
+            return
+
+        minute = (event.y - HEADER_HEIGHT) * 1440 / height
+        date = self.start_date + datetime.timedelta(days=day)
+        text = f"{date.isoformat()} (day {day + 1})"
+        for start, end, channel, period, frequency, tone in self.days[day]:
+            y1_minute = max(end, start + MIN_BAR_HEIGHT * 1440 / height)
+            if start <= minute <= y1_minute:
+                text += (f" - {sgc.period_label(period)} {start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+                         f" on channel {channel} ({frequency}, {tone})")
+                break
+        self.info_var.set(text)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Show a schedule as a zoomable timeline')
+    parser.add_argument('user1_dob', help='First user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('user2_dob', help='Second user\'s date of birth in format YYYY-MM-DD')
+    parser.add_argument('--days', type=int, default=365, help='Number of days in the rotation cycle (default: 365)')
+    parser.add_argument('--start-date', help='Schedule start date in format YYYY-MM-DD (default: today)')
+    parser.add_argument('--band', default='PMRS', choices=list(sgc.FREQUENCY_BANDS), help='Frequency band (default: PMRS)')
+    parser.add_argument('--tone-mode', choices=list(sgc.TONE_MODES), default='ctcss', help='Squelch tones (default: ctcss)')
+    parser.add_argument('--windows', metavar='JSON', help='JSON file with the daily windows (name, start, end, granularity, duration)')
+
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+        schedule, meta = sgc.generate_schedule(args.user1_dob, args.user2_dob, args.days,
+                                               start_date=start_date, frequency_band=args.band, tone_mode=args.tone_mode,
+                                               windows=sgc.load_window_config(args.windows) if args.windows else None)
+
+        root = tk.Tk()
+        root.title(f"Schedule Timeline - {args.days} days")
+        root.geometry("1200x500")
+        timeline = ScheduleTimeline(root)
+        timeline.pack(fill=tk.BOTH, expand=True)
+        root.update_idletasks()
+        timeline.set_schedule(schedule, meta)
+        root.mainloop()
+
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Please ensure dates are in the format YYYY-MM-DD")